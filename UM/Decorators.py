@@ -1,14 +1,14 @@
 # Copyright (c) 2024 UltiMaker
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+from collections import defaultdict, OrderedDict
 import copy
-from functools import lru_cache, partial
 import warnings
 import inspect
-from threading import Lock
+import weakref
 
 from UM.Logger import Logger
-from typing import Callable, Any
+from typing import Any, Callable, DefaultDict, Dict, Iterable, Set, Tuple
 import time
 
 
@@ -161,51 +161,156 @@ def timeit(method):
     return timed
 
 
+class _MemberFunctionCache:
+    """Least-recently-used cache of the results of one member function of one instance.
+
+    This behaves like `functools.lru_cache`, except that entries can also be evicted selectively by the first argument
+    they were called with (see `CachedMemberFunctions.clearInstanceCacheEntries`). No lock is taken: every single
+    operation on the underlying OrderedDict is atomic, and the few races between them are tolerated.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self._results = OrderedDict()  # type: OrderedDict[Tuple[Any, ...], Any]
+        self._maxsize = maxsize
+        self._generation = 0  # Bumped on every eviction, so results computed before an eviction are not stored.
+
+    def get(self, key: Tuple[Any, ...]) -> Tuple[bool, Any, int]:
+        generation = self._generation
+        try:
+            result = self._results[key]
+            self._results.move_to_end(key)
+        except KeyError:  # Not cached, or evicted by another thread in the meanwhile.
+            return False, None, generation
+        return True, result, generation
+
+    def put(self, key: Tuple[Any, ...], result: Any, generation: int) -> None:
+        if generation != self._generation:
+            return  # Something this result may depend on was changed while it was being computed.
+        self._results[key] = result
+        if len(self._results) > self._maxsize:
+            try:
+                self._results.popitem(last = False)
+            except KeyError:  # Emptied by another thread in the meanwhile.
+                pass
+
+    def evictByFirstArgument(self, first_arguments: Set[Any]) -> None:
+        self._generation += 1
+        for key in [key for key in list(self._results) if not key or key[0] is _KEYWORD_MARK or key[0] in first_arguments]:
+            self._results.pop(key, None)
+
+
+# Separates the positional from the keyword arguments in the keys of a _MemberFunctionCache.
+_KEYWORD_MARK = object()
+
+
 class CachedMemberFunctions:
-    """Helper class to handle instance-cache w.r.t. results of member-functions decorated with '@cache_per_instance'."""
+    """Helper class to handle instance-cache w.r.t. results of member-functions decorated with '@cache_per_instance'.
+
+    The caches are kept by the id of their instance, together with a weak reference to that instance that removes the
+    caches once the instance is garbage collected. (A WeakKeyDictionary would compare the instances with __eq__, which
+    some cached classes implement in terms of their cached functions.) Calls don't take any lock, and both positional
+    and keyword arguments can be cached, as long as they're hashable. Cache hits and misses are counted per function.
+    """
 
-    __cache = {}
-    __locks = {}
+    __cache = {}  # type: Dict[int, Dict[Callable, _MemberFunctionCache]]
+    __references = {}  # type: Dict[int, weakref.ref]
+    __hits = defaultdict(int)  # type: DefaultDict[Callable, int]
+    __misses = defaultdict(int)  # type: DefaultDict[Callable, int]
 
     @classmethod
-    def _getInstanceLock(cls, instance):
-        if instance not in cls.__locks:
-            cls.__locks[instance] = Lock()
-        return cls.__locks[instance]
+    def _getInstanceCache(cls, instance) -> Dict[Callable, _MemberFunctionCache]:
+        instance_id = id(instance)
+        instance_cache = cls.__cache.get(instance_id)
+        if instance_cache is None:
+            if instance_id not in cls.__references:
+                # Raises a TypeError if the instance can't be weakly referenced.
+                cls.__references[instance_id] = weakref.ref(instance, lambda _: cls._removeInstance(instance_id))
+            instance_cache = cls.__cache.setdefault(instance_id, {})
+        return instance_cache
+
+    @classmethod
+    def _removeInstance(cls, instance_id: int) -> None:
+        cls.__cache.pop(instance_id, None)
+        cls.__references.pop(instance_id, None)
 
     @classmethod
     def clearInstanceCache(cls, instance):
         """Clear all the cache-entries for the specified instance."""
-        with cls._getInstanceLock(instance):
-            cls.__cache[instance] = {}
+        if id(instance) in cls.__cache:
+            cls.__cache[id(instance)] = {}
+
+    @classmethod
+    def clearInstanceCacheEntries(cls, instance, first_arguments: Set[Any], keyed_functions: Iterable[Callable]) -> None:
+        """Clear only the cache-entries for the specified instance that may be affected by a change of some keys.
+
+        :param first_arguments: The keys that changed. Results of the keyed functions are only dropped if they were
+        called with one of these as their first argument.
+        :param keyed_functions: The (decorated) member functions of which the result only depends on their first
+        argument. The results of all other member functions of the instance are dropped completely.
+        """
+        instance_cache = cls.__cache.get(id(instance))
+        if instance_cache is None:
+            return
+        keyed_functions = {getattr(function, "_cached_function", function) for function in keyed_functions}
+        kept_caches = {function: function_cache for function, function_cache in list(instance_cache.items()) if function in keyed_functions}
+        for function_cache in kept_caches.values():
+            function_cache.evictByFirstArgument(first_arguments)
+        cls.__cache[id(instance)] = kept_caches
 
     @classmethod
     def deleteInstanceCache(cls, instance):
-        """Completely delete the entry of the specified instance."""
-        with cls._getInstanceLock(instance):
-            if instance in cls.__cache:
-                del cls.__cache[instance]
+        """Completely delete the entry of the specified instance.
+
+        This happens automatically when the instance is garbage collected, but can be done earlier with this.
+        """
+        cls._removeInstance(id(instance))
 
     @classmethod
     def callMemberFunction(cls, instance, function, *args, **kwargs):
         """Call the specified member function, make use of (results) cache if available, and create if not."""
-        if kwargs is not None and len(kwargs) > 0:
-            # NOTE The `lru_cache` can't handle keyword-arguments (because it's a dict).
-            # We could make a frozendict, but that's probably a lot more hassle than it's worth, so just call normally.
+        key = args
+        if kwargs:
+            key = args + (_KEYWORD_MARK,) + tuple(sorted(kwargs.items()))
+        try:
+            instance_cache = cls.__cache.get(id(instance))
+            if instance_cache is None:
+                instance_cache = cls._getInstanceCache(instance)
+            function_cache = instance_cache.get(function)
+            if function_cache is None:
+                function_cache = instance_cache.setdefault(function, _MemberFunctionCache())
+            found, result, generation = function_cache.get(key)
+        except TypeError:
+            # Either the instance can't be weakly referenced or one of the arguments isn't hashable.
             return function(instance, *args, **kwargs)
-        with cls._getInstanceLock(instance):
-            if instance not in cls.__cache:
-                cls.__cache[instance] = {}
-            if function not in cls.__cache[instance]:
-                cls.__cache[instance][function] = lru_cache()(partial(function, instance))
-            func = cls.__cache[instance][function]
-        # Need to call the function outside the locked part, as it may introduce a race-condition otherwise.
-        return func(*args)
+        if found:
+            cls.__hits[function] += 1
+            return result
+        cls.__misses[function] += 1
+        result = function(instance, *args, **kwargs)
+        function_cache.put(key, result, generation)
+        return result
+
+    @classmethod
+    def getStatistics(cls) -> Dict[str, Tuple[int, int]]:
+        """Get the number of cache hits and misses of every cached member function since the last reset.
+
+        The counters are updated without a lock, so with multiple threads they may be slightly off.
+
+        :return: A dictionary of the qualified names of the functions to a tuple of their hits and misses.
+        """
+        functions = set(cls.__hits) | set(cls.__misses)
+        return {function.__qualname__: (cls.__hits.get(function, 0), cls.__misses.get(function, 0)) for function in functions}
+
+    @classmethod
+    def resetStatistics(cls) -> None:
+        cls.__hits.clear()
+        cls.__misses.clear()
 
 
 def cache_per_instance(function):
     def wrapper(instance, *args, **kwargs):
         return CachedMemberFunctions.callMemberFunction(instance, function, *args, **kwargs)
+    wrapper._cached_function = function
     return wrapper
 
 
@@ -215,6 +320,7 @@ def cache_per_instance_copy_result(function):
         if hasattr(result, "copy"):
             return result.copy()
         return copy.copy(result)
+    wrapper._cached_function = function
     return wrapper
 
 def singleton(cls):
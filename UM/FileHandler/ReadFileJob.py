@@ -23,6 +23,11 @@ class ReadFileJob(Job):
         self._handler = handler
         self._loading_message = None  # type: Optional[Message]
         self._add_to_recent_files = add_to_recent_files
+        self.progress.connect(self._onProgress)
+
+    def _onProgress(self, job: Job, amount: float) -> None:
+        if self == job and self._loading_message:
+            self._loading_message.setProgress(amount)
 
     def getFileName(self):
         return self._filename
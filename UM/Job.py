@@ -1,6 +1,7 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import threading
 import time
 from typing import Any, Optional
 
@@ -121,6 +122,16 @@ class Job:
     :param amount: :type{int} The amount of progress made, from 0 to 100.
     """
 
+    @staticmethod
+    def getCurrentJob() -> Optional["Job"]:
+        """Get the job that is being processed on the current thread.
+
+        This allows code that is called by a job, such as a file reader, to report its progress through the job.
+        :return: The job, or None if the current thread is not a worker of the JobQueue.
+        """
+
+        return getattr(threading.current_thread(), "current_job", None)
+
     @staticmethod
     def yieldThread() -> None:
         """Utility function that allows us to yield thread processing.
@@ -117,6 +117,7 @@ class _Worker(threading.Thread):
         super().__init__(name = name)
         self._name = name
         self._queue = queue
+        self.current_job = None  # type: Optional[Job]  # The job that is being processed, see Job.getCurrentJob.
 
     def run(self) -> None:
         while True:
@@ -128,6 +129,7 @@ class _Worker(threading.Thread):
             # Process the job.
             self._queue.jobStarted.emit(job)
             job._running = True
+            self.current_job = job
 
             try:
                 job.run()
@@ -135,6 +137,7 @@ class _Worker(threading.Thread):
                 Logger.logException("e", "Job %s caused an exception on worker %s", str(job), self._name)
                 job.setError(e)
 
+            self.current_job = None
             job._running = False
             job._finished = True
             job.finished.emit(job)
@@ -49,7 +49,8 @@ class MeshData:
     """
 
     def __init__(self, vertices=None, normals=None, indices=None, colors=None, uvs=None, file_name=None,
-                 center_position=None, zero_position=None, type = MeshType.faces, attributes=None, mesh_id=None, face_connections=None) -> None:
+                 center_position=None, zero_position=None, type = MeshType.faces, attributes=None, mesh_id=None, face_connections=None,
+                 convex_hull=None) -> None:
         self._application = None  # Initialize this later otherwise unit tests break
 
         self._vertices = NumPyUtil.immutableNDArray(vertices)
@@ -71,7 +72,7 @@ class MeshData:
             self._zero_position = zero_position
         else:
             self._zero_position = Vector(0, 0, 0)
-        self._convex_hull = None    # type: Optional[scipy.spatial.ConvexHull]
+        self._convex_hull = convex_hull    # type: Optional[scipy.spatial.ConvexHull]
         self._convex_hull_vertices = None  # type: Optional[numpy.ndarray]
         self._convex_hull_lock = threading.Lock()
 
@@ -127,53 +128,12 @@ class MeshData:
 
         if self._vertices is None:
             return None
-
-        # Build index equivalence mapping (in case of triangle-soup meshes).
-        index_equivalences = numpy.arange(len(self._vertices), dtype=numpy.int32)
-        position_to_index = {}
-        for i_vertex, vertex in enumerate(self._vertices):
-            position = tuple(vertex)
-            if position in position_to_index:
-                index_equivalences[i_vertex] = position_to_index[position]
-            else:
-                position_to_index[position] = i_vertex
-
-        def get_edge_list(face_idx):
-            # An edge is represented by a tuple of two vertex indices (smaller index first).
-            if self._indices is None or len(self._indices) == 0:
-                base = face_idx * 3
-                face = [base, base + 1, base + 2]
-            else:
-                face = self._indices[face_idx]
-            a, b, c = [index_equivalences[int(idx)] for idx in face]
-            return [
-                (min(a, b), max(a, b)),
-                (min(b, c), max(b, c)),
-                (min(c, a), max(c, a))
-            ]
-
-        face_count = len(self._vertices) // 3 if self._indices is None or len(self._indices) == 0 else self._face_count
-        connections = numpy.full((face_count, 3), -1, dtype=numpy.int32)
-
-        edge_to_face = {}
-
-        for face_idx in range(face_count):
-            edges = get_edge_list(face_idx)
-
-            for edge_idx, edge in enumerate(edges):
-                if edge in edge_to_face:
-                    other_face = edge_to_face[edge]
-                    connections[face_idx, edge_idx] = other_face
-
-                    other_edges = get_edge_list(other_face)
-                    for i_edge, e in enumerate(other_edges):
-                        if e == edge:
-                            connections[other_face, i_edge] = face_idx
-                            break
-                else:
-                    edge_to_face[edge] = face_idx
-
-        return connections
+        if self._indices is None or len(self._indices) == 0:
+            face_count = len(self._vertices) // 3
+            faces = numpy.arange(face_count * 3).reshape(face_count, 3)
+        else:
+            faces = self._indices
+        return calculateFaceConnections(self._vertices, faces)
 
     def getHash(self):
         m = hashlib.sha256()
@@ -576,6 +536,55 @@ def uniqueVertices(vertices: numpy.ndarray) -> numpy.ndarray:
     return vertices[idx]  # Select the unique rows by index.
 
 
+def calculateFaceConnections(vertices: numpy.ndarray, faces: numpy.ndarray) -> numpy.ndarray:
+    """Find which faces of a mesh share their edges with which other faces.
+
+    Vertices at the same position are treated as the same vertex, so this works for triangle soups too. Each edge gets
+    a key from the two vertices it connects, and sorting the keys puts the faces that share an edge next to each other.
+    If more than two faces share an edge, the later faces are connected to the first face with that edge, and the first
+    face is connected to the last one.
+
+    :param vertices: :type{numpy.ndarray} the vertices of the mesh
+    :param faces: :type{numpy.ndarray} the three vertex indices of each face
+    :return: :type{numpy.ndarray} for each face, the index of the face on the other side of each of its three edges
+    (from the 1st to the 2nd vertex, the 2nd to the 3rd, and the 3rd to the 1st), or -1 if there is none
+    """
+
+    faces = numpy.asarray(faces, dtype = numpy.intp).reshape(-1, 3)
+    connections = numpy.full(faces.size, -1, dtype = numpy.int32)
+    if faces.size == 0:
+        return connections.reshape(-1, 3)
+
+    # Give the vertices at the same position the same index. Adding 0 turns -0.0 into 0.0, which is the same position.
+    vertices = numpy.ascontiguousarray(vertices + 0.0)
+    vertex_byte_view = vertices.view(numpy.dtype((numpy.void, vertices.dtype.itemsize * vertices.shape[1]))).ravel()
+    _, welded = numpy.unique(vertex_byte_view, return_inverse = True)
+    welded = welded.ravel()[faces]
+
+    # One key per edge of each face, in the same order as the faces and their edges.
+    first = welded.ravel()
+    second = welded[:, [1, 2, 0]].ravel()
+    low = numpy.minimum(first, second).astype(numpy.int64)
+    high = numpy.maximum(first, second).astype(numpy.int64)
+    keys = low * len(vertices) + high
+
+    # Edges with the same key end up next to each other. Sorting stably keeps them in order of the faces.
+    order = numpy.argsort(keys, kind = "stable")
+    sorted_keys = keys[order]
+    is_first = numpy.empty(len(sorted_keys), dtype = bool)
+    is_first[0] = True
+    numpy.not_equal(sorted_keys[1:], sorted_keys[:-1], out = is_first[1:])
+    group_starts = numpy.flatnonzero(is_first)
+    group_ends = numpy.append(group_starts[1:], len(sorted_keys)) - 1
+
+    first_edges = order[group_starts]
+    is_later = ~is_first
+    connections[order[is_later]] = first_edges[numpy.cumsum(is_first)[is_later] - 1] // 3
+    shared = group_ends > group_starts
+    connections[first_edges[shared]] = order[group_ends[shared]] // 3
+    return connections.reshape(-1, 3)
+
+
 def approximateConvexHull(vertex_data: numpy.ndarray, target_count: int) -> Optional[scipy.spatial.ConvexHull]:
     """Compute an approximation of the convex hull of an array of vertices
 
@@ -676,6 +685,20 @@ def calculateNormalsFromVertices(vertices: numpy.ndarray, vertex_count: int) ->
     return normals
 
 
+def calculateFaceNormals(faces: numpy.ndarray) -> numpy.ndarray:
+    """Calculate the normal of each triangle, following the right-hand rule
+
+    :param faces: :type{narray} the three corners of each triangle, with shape (face_count, 3, 3)
+    :return: :type{narray} the unit normal of each triangle, or a zero vector for triangles without an area
+    """
+
+    normals = numpy.cross(faces[:, 1] - faces[:, 0], faces[:, 2] - faces[:, 0])
+    lengths = numpy.linalg.norm(normals, axis = 1)
+    lengths[lengths == 0] = 1  # Prevent division by 0.
+    normals /= lengths[:, numpy.newaxis]
+    return normals
+
+
 def calculateNormalsFromIndexedVertices(vertices: numpy.ndarray, indices: numpy.ndarray, face_count: int) -> numpy.ndarray:
     """Calculate the normals of this mesh of triagles using indexes.
 
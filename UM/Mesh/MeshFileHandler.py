@@ -2,14 +2,18 @@
 # Uranium is released under the terms of the LGPLv3 or higher.
 
 import os
-from PyQt6.QtCore import QObject, QUrl  # For typing.
+import threading
+from concurrent.futures import Future
+from PyQt6.QtCore import QObject, QUrl, pyqtSlot
 
 from UM.Logger import Logger
 from UM.Math.Matrix import Matrix
 from UM.Math.Vector import Vector
-from UM.FileHandler.FileHandler import FileHandler
-from typing import TYPE_CHECKING
+from UM.FileHandler.FileHandler import FileHandler, resolveAnySymlink
+from UM.Mesh.MeshReadPool import MeshReadPool
+from typing import Dict, List, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
+    from UM.Mesh.MeshData import MeshData
     from UM.Qt.QtApplication import QtApplication
 
 
@@ -22,6 +26,54 @@ class MeshFileHandler(FileHandler):
     def __init__(self, application: "QtApplication", writer_type: str = "mesh_writer", reader_type: str = "mesh_reader", parent: QObject = None) -> None:
         super().__init__(application, writer_type, reader_type, parent)
 
+        self._read_pool = None  # type: Optional[MeshReadPool]
+        self._pending_reads = {}  # type: Dict[str, Future[Optional[MeshData]]]  # Files that are being read by the pool, by file name.
+        self._pending_reads_lock = threading.Lock()
+
+    def setReadInSubprocesses(self, enabled: bool) -> None:
+        """Set whether mesh files are read in other processes, so that several files are read in parallel.
+
+        This only applies to files whose reader supports it (see MeshReader.canReadInSubprocess). The processes are
+        started with the "spawn" method, which imports the main module of the application again. The code that starts
+        the application must therefore be guarded by ``if __name__ == "__main__":``, and a frozen application must call
+        multiprocessing.freeze_support() first. See MeshReadPool.
+        :param enabled: True to read files in other processes, or False to read them in job threads.
+        """
+
+        if enabled and self._read_pool is None:
+            self._read_pool = MeshReadPool()
+        elif not enabled and self._read_pool is not None:
+            self._read_pool.shutdown()
+            self._read_pool = None
+
+    def isReadInSubprocesses(self) -> bool:
+        return self._read_pool is not None
+
+    @pyqtSlot("QVariantList", bool)
+    @pyqtSlot("QVariantList")
+    def readLocalFiles(self, files: List[QUrl], add_to_recent_files_hint: bool = True) -> None:
+        """Read several files at once.
+
+        If mesh files are read in other processes, all files that can be are submitted to the processes right away,
+        instead of each when its job starts. The meshes are added to the scene as each file is read.
+        :param files: The files to read.
+        :param add_to_recent_files_hint: Whether to add the files to the recent files.
+        """
+
+        files = [QUrl(file) if not isinstance(file, QUrl) else file for file in files]
+        files = [file for file in files if file.isValid()]
+        if self._read_pool is not None:
+            for file in files:
+                file_name = file.toLocalFile()
+                reader = self.getReaderForFile(file_name)
+                if reader is not None and reader.canReadInSubprocess():
+                    with self._pending_reads_lock:
+                        if file_name not in self._pending_reads:
+                            self._pending_reads[file_name] = self._read_pool.submit(reader, resolveAnySymlink(file_name))
+
+        for file in files:
+            self.readLocalFile(file, add_to_recent_files_hint)
+
     def readerRead(self, reader, file_name, **kwargs):
         """Try to read the mesh_data from a file using a specified MeshReader.
         :param reader: the MeshReader to read the file with.
@@ -33,6 +85,9 @@ class MeshFileHandler(FileHandler):
         """
 
         try:
+            result = self._readInSubprocess(reader, file_name, kwargs.get("center", True))
+            if result is not None:
+                return [result]
             results = reader.read(file_name)
             if results is not None:
                 if type(results) is not list:
@@ -62,6 +117,31 @@ class MeshFileHandler(FileHandler):
         Logger.log("w", "Unable to read file %s", file_name)
         return None  # unable to read
 
+    def _readInSubprocess(self, reader, file_name: str, center: bool):
+        """Get the mesh of a file from the pool, if it was or can be read by the pool.
+
+        The mesh is already centered by the pool.
+        :return: The scene node with the mesh, or None if the file should be read by the reader itself.
+        """
+
+        with self._pending_reads_lock:
+            future = self._pending_reads.pop(file_name, None)
+        if future is None:
+            if self._read_pool is None or not reader.canReadInSubprocess():
+                return None
+            future = self._read_pool.submit(reader, resolveAnySymlink(file_name), center)
+        elif not center:  # It was submitted by readLocalFiles, which centers it.
+            return None
+
+        try:
+            mesh_data = future.result()
+        except Exception:
+            Logger.logException("w", "Unable to read file %s in another process. Reading it here instead.", file_name)
+            return None
+        if mesh_data is None:
+            return None
+        return reader.createSceneNode(resolveAnySymlink(file_name), mesh_data)
+
     def _readLocalFile(self, file: QUrl, add_to_recent_files_hint: bool = True):
         # We need to prevent circular dependency, so do some just in time importing.
         from UM.Mesh.ReadMeshJob import ReadMeshJob
@@ -71,6 +151,8 @@ class MeshFileHandler(FileHandler):
         job.start()
 
     def _readMeshFinished(self, job):
+        with self._pending_reads_lock:
+            self._pending_reads.pop(job.getFileName(), None)  # In case the job didn't read it, e.g. if it was cancelled.
         nodes = job.getResult()
         for node in nodes:
             node.setSelectable(True)
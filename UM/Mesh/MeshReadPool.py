@@ -0,0 +1,225 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import importlib
+import importlib.machinery
+import importlib.util
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+import numpy
+
+from UM.Logger import Logger
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshData import MeshData, calculateNormalsFromIndexedVertices, calculateNormalsFromVertices
+
+if TYPE_CHECKING:
+    from UM.Mesh.MeshReader import MeshReader
+
+# For each array, either the name of the shared memory block with its data, or the array itself. Then its shape and type.
+_SharedArray = Tuple[Any, Tuple[int, ...], str]
+
+_readers = {}  # type: Dict[Tuple[str, str], MeshReader]  # The readers that were created in a worker process.
+
+
+class MeshReadPool:
+    """Reads mesh files in other processes, so that several files are read in parallel.
+
+    Each file is read with a new instance of its reader in a worker process (see MeshReader.canReadInSubprocess). The
+    worker also centers the mesh, computes its normals if the file had none, and computes its convex hull, which
+    otherwise happens on the main thread when the mesh is first shown. The arrays of the mesh are sent back through
+    shared memory, so that they don't need to be pickled. On Windows, where a block of shared memory disappears when
+    the process that created it stops using it, they are pickled instead.
+
+    The processes are started with the "spawn" method, which imports the reader again in the new process. Since that
+    also imports the main module of the application, the code that starts the application must be guarded by
+    ``if __name__ == "__main__":``, and a frozen application must call multiprocessing.freeze_support() first.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """Create a pool. The processes are only started when the first file is submitted.
+
+        :param max_workers: The number of processes to read files with. By default one per processor.
+        """
+
+        self._max_workers = max_workers
+        self._executor = None  # type: Optional[ProcessPoolExecutor]
+        self._lock = threading.Lock()
+
+    def submit(self, reader: "MeshReader", file_name: str, center: bool = True) -> "Future[Optional[MeshData]]":
+        """Start reading a file in a worker process.
+
+        :param reader: The reader for the file. A new instance of the same class is used in the worker process.
+        :param file_name: The file to read.
+        :param center: Whether to center the mesh around (0, 0, 0), like MeshFileHandler.readerRead does.
+        :return: A future with the mesh from the file, or None if the reader didn't produce a single mesh. If the
+        file couldn't be read, the future has the exception.
+        """
+
+        reader_class = type(reader)
+        top_package = reader_class.__module__.split(".")[0]
+        top_module = sys.modules[top_package]
+        if hasattr(top_module, "__path__"):
+            location = os.path.dirname(list(top_module.__path__)[0])
+        else:
+            location = os.path.dirname(top_module.__file__)  # type: ignore
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers = self._max_workers, mp_context = multiprocessing.get_context("spawn"))
+            worker_future = self._executor.submit(_readInProcess, location, reader_class.__module__, reader_class.__name__, file_name, center, os.name != "nt")
+
+        result = Future()  # type: Future[Optional[MeshData]]
+        result.set_running_or_notify_cancel()
+        worker_future.add_done_callback(lambda done: self._onWorkerDone(done, result, file_name))
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, after they finish reading the files that were submitted."""
+
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait = True)
+
+    @staticmethod
+    def _onWorkerDone(worker_future: Future, result: Future, file_name: str) -> None:
+        try:
+            mesh = worker_future.result()
+        except Exception as e:
+            result.set_exception(e)
+            return
+        if mesh is None:
+            result.set_result(None)
+            return
+
+        arrays, center_position, zero_position, convex_hull = mesh
+        mesh_arrays = {}  # type: Dict[str, numpy.ndarray]
+        try:
+            for name, shared_array in arrays.items():
+                mesh_arrays[name] = _receiveArray(shared_array)
+        except Exception as e:
+            for name, shared_array in arrays.items():
+                if name not in mesh_arrays:  # Don't leave the remaining blocks behind.
+                    _releaseArray(shared_array)
+            result.set_exception(e)
+            return
+
+        center = Vector(*center_position) if center_position is not None else None
+        result.set_result(MeshData(file_name = file_name, center_position = center, zero_position = Vector(*zero_position), convex_hull = convex_hull, **mesh_arrays))
+
+
+def _readInProcess(location: str, module_name: str, class_name: str, file_name: str, center: bool, use_shared_memory: bool) -> Optional[Tuple[Dict[str, _SharedArray], Optional[Tuple[float, float, float]], Tuple[float, float, float], Any]]:
+    """Read a file in a worker process.
+
+    :return: The arrays of the mesh, its center and zero position, and its convex hull. None if the reader didn't
+    produce a single mesh.
+    """
+
+    reader = _getReader(location, module_name, class_name)
+    result = reader._read(file_name)
+    if result is None or isinstance(result, list) or len(result.getChildren()) != 0:
+        return None
+    mesh = result.getMeshData()
+    if mesh is None or mesh.getVertexCount() == 0:
+        return None
+
+    if center:
+        # The same as SceneNode.setCenterPosition.
+        extents = mesh.getExtents()
+        move_vector = Vector(extents.center.x, extents.center.y, extents.center.z)
+        m = Matrix()
+        m.setByTranslation(-move_vector)
+        mesh = mesh.getTransformed(m).set(center_position = move_vector)
+
+    if not mesh.hasNormals():
+        if mesh.hasIndices():
+            normals = calculateNormalsFromIndexedVertices(mesh.getVertices(), mesh.getIndices(), mesh.getFaceCount())
+        else:
+            normals = calculateNormalsFromVertices(mesh.getVertices(), mesh.getVertexCount())
+        mesh = mesh.set(normals = normals)
+
+    arrays = {}  # type: Dict[str, _SharedArray]
+    try:
+        for name, array in (("vertices", mesh.getVertices()), ("normals", mesh.getNormals()), ("indices", mesh.getIndices()), ("colors", mesh.getColors()), ("uvs", mesh.getUVCoordinates())):
+            if array is not None and array.size > 0:
+                arrays[name] = _sendArray(array, use_shared_memory)
+    except Exception:
+        for array in arrays.values():
+            _releaseArray(array)
+        raise
+    center_position = mesh.getCenterPosition()
+    zero_position = mesh.getZeroPosition()
+    return arrays, (center_position.x, center_position.y, center_position.z) if center_position is not None else None, (zero_position.x, zero_position.y, zero_position.z), mesh.getConvexHull()
+
+
+def _getReader(location: str, module_name: str, class_name: str) -> "MeshReader":
+    key = (module_name, class_name)
+    if key not in _readers:
+        # Plug-ins are not on the path, so their package is loaded from the same place as in the main process.
+        top_package = module_name.split(".")[0]
+        if top_package not in sys.modules:
+            spec = importlib.machinery.PathFinder().find_spec(top_package, [location])
+            if spec is None or spec.loader is None:
+                raise ImportError("Unable to find {module} in {location}".format(module = top_package, location = location))
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[top_package] = module
+            spec.loader.exec_module(module)
+        _readers[key] = getattr(importlib.import_module(module_name), class_name)()
+    return _readers[key]
+
+
+def _sendArray(array: numpy.ndarray, use_shared_memory: bool) -> _SharedArray:
+    if not use_shared_memory:
+        return array, array.shape, array.dtype.str
+    block = shared_memory.SharedMemory(create = True, size = array.nbytes)
+    try:
+        numpy.ndarray(array.shape, dtype = array.dtype, buffer = block.buf)[...] = array
+        name = block.name
+    finally:
+        block.close()
+    _unregister(name)  # The main process removes it.
+    return name, array.shape, array.dtype.str
+
+
+def _receiveArray(shared_array: _SharedArray) -> numpy.ndarray:
+    data, shape, dtype = shared_array
+    if isinstance(data, numpy.ndarray):
+        array = data
+    else:
+        block = shared_memory.SharedMemory(name = data)
+        try:
+            array = numpy.ndarray(shape, dtype = dtype, buffer = block.buf).copy()
+        finally:
+            block.close()
+            block.unlink()
+    array.flags.writeable = False  # Prevent MeshData from copying it again.
+    return array
+
+
+def _releaseArray(shared_array: _SharedArray) -> None:
+    if isinstance(shared_array[0], numpy.ndarray):
+        return
+    try:
+        block = shared_memory.SharedMemory(name = shared_array[0])
+        block.close()
+        block.unlink()
+    except OSError:
+        Logger.log("w", "Unable to remove shared memory block %s", shared_array[0])
+
+
+def _unregister(name: str) -> None:
+    """Stop the resource tracker of a worker process from removing a shared memory block when the worker stops."""
+
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister("/" + name.lstrip("/"), "shared_memory")
+    except Exception:
+        pass
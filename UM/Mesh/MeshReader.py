@@ -7,6 +7,7 @@ import UM.Application
 from UM.FileHandler.FileReader import FileReader
 from UM.FileHandler.FileHandler import resolveAnySymlink
 from UM.Logger import Logger
+from UM.Mesh.MeshData import MeshData
 from UM.MimeTypeDatabase import MimeTypeDatabase, MimeTypeNotFoundError
 from UM.Scene.SceneNode import SceneNode
 
@@ -24,6 +25,33 @@ class MeshReader(FileReader):
 
         file_name = resolveAnySymlink(file_name)
         result = self._read(file_name)
+        self._finishReading(file_name, result)
+        return result
+
+    def canReadInSubprocess(self) -> bool:
+        """Whether this reader can read files in another process, so that several files can be read in parallel.
+
+        See MeshReadPool. This requires that the reader can be created without arguments, that _read doesn't need the
+        application, and that _read returns a single scene node without children, of which only the mesh data is used.
+        :return: True if files can be read in another process, or False if they must be read with read.
+        """
+
+        return False
+
+    def createSceneNode(self, file_name: str, mesh_data: MeshData) -> SceneNode:
+        """Create the scene node for a mesh that was read in another process, like read would have returned it.
+
+        :param file_name: The file that the mesh was read from.
+        :param mesh_data: The mesh from the file.
+        :return: A scene node with the mesh.
+        """
+
+        scene_node = SceneNode()
+        scene_node.setMeshData(mesh_data)
+        self._finishReading(file_name, scene_node)
+        return scene_node
+
+    def _finishReading(self, file_name: str, result: Union[SceneNode, List[SceneNode]]) -> None:
         UM.Application.Application.getInstance().getController().getScene().addWatchedFile(file_name)
 
         # The mesh reader may set a MIME type itself if it knows a more specific MIME type than just going by extension.
@@ -40,7 +68,5 @@ class MeshReader(FileReader):
                     Logger.warning(f"Loaded file {file_name} has no associated MIME type.")
                     # Leave MIME type at None then.
 
-        return result
-
     def _read(self, file_name: str) -> Union[SceneNode, List[SceneNode]]:
         raise NotImplementedError("MeshReader plugin was not correctly implemented, no read was specified")
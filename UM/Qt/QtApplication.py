@@ -530,6 +530,11 @@ class QtApplication(QApplication, Application):
         except Exception as e:
             Logger.log("e", "Exception while emitting shutdown signal: %s", repr(e))
 
+        try:
+            self.getContainerRegistry().waitForSaving()  # Containers may still be being saved in the background.
+        except Exception as e:
+            Logger.log("e", "Exception while waiting for containers to be saved: %s", repr(e))
+
         try:
             self.getBackend().close()
         except Exception as e:
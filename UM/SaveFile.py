@@ -5,7 +5,7 @@ import tempfile
 import os
 import os.path
 import sys
-from typing import Union, IO
+from typing import Dict, Union, IO
 fsync = os.fsync
 if sys.platform != "win32":
     import fcntl
@@ -62,6 +62,60 @@ class SaveFile:
         self._temp_file.flush()
         fsync(self._temp_file.fileno())
         self._temp_file.close()
+        self._replaceFile()
+
+    @classmethod
+    def writeAll(cls, contents: Dict[str, str], encoding: str = "utf-8") -> Dict[str, Exception]:
+        """Atomically write several text files, syncing them to the disk together.
+
+        Each file is written like with a SaveFile, but the contents of all files are written before waiting for any of
+        them to be stored on the disk. This way the disk can store them together, rather than one after another.
+        :param contents: The text to write to each file, by path.
+        :param encoding: The encoding to write the files with.
+        :return: For each file that couldn't be written, the error that occurred.
+        """
+
+        errors = {}  # type: Dict[str, Exception]
+        save_files = {}  # type: Dict[str, SaveFile]
+        for path, data in contents.items():
+            save_file = cls(path, "wt", encoding = encoding)
+            try:
+                save_file.__enter__().write(data)
+                save_file._temp_file.flush()
+            except Exception as e:
+                errors[path] = e
+                save_file._removeTempFile()
+                continue
+            save_files[path] = save_file
+
+        for path, save_file in list(save_files.items()):
+            try:
+                fsync(save_file._temp_file.fileno())
+                save_file._temp_file.close()
+            except Exception as e:
+                errors[path] = e
+                save_file._removeTempFile()
+                del save_files[path]
+
+        for path, save_file in save_files.items():
+            try:
+                save_file._replaceFile()
+            except Exception as e:
+                errors[path] = e
+                save_file._removeTempFile()
+        return errors
+
+    def _removeTempFile(self) -> None:
+        if self._temp_file is None:
+            return
+        try:
+            self._temp_file.close()
+            os.remove(self._temp_file.name)
+        except OSError:
+            pass  # Already gone, or can't be removed. Either way there's nothing more to do.
+
+    def _replaceFile(self) -> None:
+        """Replace the file with the temporary file, once no other process is writing to it any more."""
 
         self.__max_retries = 10
         while not self._file:
@@ -0,0 +1,178 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from UM.Logger import Logger
+from UM.SaveFile import SaveFile
+
+
+class SaveQueue:
+    """Saves text files atomically, either right away or on a background thread.
+
+    Files whose contents didn't change are not written again. For each file, the queue remembers a hash of the contents
+    that it wrote or found in the file, along with the modification time and size of the file at that moment. If the
+    file was changed by something else in the meantime, it is read again to compare.
+
+    Files that are saved in the background are written together, syncing them to the disk at the same time (see
+    SaveFile.writeAll). If a file is saved again before it was written, only the last contents are written. The thread
+    stops when there is nothing left to write. It is not a daemon thread, so the interpreter waits for the last files to
+    be written before it exits. To wait for that earlier, call flush.
+
+    The files are saved from both the thread of the caller and the thread of the queue, so everything that they share,
+    including what the queue remembers of the stored files, is guarded by a single lock.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._pending = {}  # type: Dict[str, Tuple[str, Optional[Callable[[str, Exception], None]]]]  # The contents of the files that still need to be written and what to call if that fails, by path.
+        self._writing = set()  # type: Set[str]  # The files that the thread is writing right now.
+        self._thread = None  # type: Optional[threading.Thread]
+
+        self._stored = {}  # type: Dict[str, Tuple[bytes, int, int]]  # For each file, the hash of its contents, and its modification time and size.
+
+    def save(self, path: str, data: str, on_failed: Optional[Callable[[str, Exception], None]] = None) -> None:
+        """Save a file in the background.
+
+        Errors are logged, since the caller is not waiting for the file to be written any more.
+        :param path: The file to save.
+        :param data: The text to store in the file, which is written as UTF-8.
+        :param on_failed: Called with the path and the error if the file could not be written, on the thread of the
+        queue. It is not called if the file is saved again before it was written.
+        """
+
+        with self._condition:
+            self._pending[path] = (data, on_failed)
+            if self._thread is None:
+                self._thread = threading.Thread(target = self._run, name = "SaveQueue")
+                self._thread.start()
+
+    def write(self, path: str, data: str) -> None:
+        """Save a file right away.
+
+        If the file was also being saved in the background, that is cancelled, since it would be overwritten anyway.
+        :param path: The file to save.
+        :param data: The text to store in the file, which is written as UTF-8.
+        :exception OSError: The file could not be written.
+        """
+
+        with self._condition:
+            self._pending.pop(path, None)
+            while path in self._writing:
+                self._condition.wait()
+
+        digest = self._hash(data)
+        if self._isStored(path, digest):
+            return
+        with SaveFile(path, "wt") as f:
+            f.write(data)
+        self._remember(path, digest)
+
+    def cancel(self, path: str) -> None:
+        """Don't save a file in the background any more, for instance because it is about to be removed.
+
+        If the file is being written right now, this waits until it is written.
+        :param path: The file that shouldn't be saved.
+        """
+
+        with self._condition:
+            self._pending.pop(path, None)
+            while path in self._writing:
+                self._condition.wait()
+            self._stored.pop(path, None)
+
+    def flush(self, path: Optional[str] = None) -> None:
+        """Wait until files that are saved in the background are written.
+
+        :param path: A file to wait for. If not given, this waits until all files are written.
+        """
+
+        with self._condition:
+            if path is None:
+                while self._pending or self._writing:
+                    self._condition.wait()
+            else:
+                while path in self._pending or path in self._writing:
+                    self._condition.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._pending:
+                    self._thread = None
+                    return
+                batch = self._pending
+                self._pending = {}
+                self._writing = set(batch.keys())
+
+            try:
+                self._writeBatch(batch)
+            except Exception as e:
+                Logger.logException("e", "Failed to save files in the background.")
+                for path, (_, on_failed) in batch.items():
+                    self._reportFailure(path, e, on_failed)
+            finally:
+                with self._condition:
+                    self._writing = set()
+                    self._condition.notify_all()
+
+    def _writeBatch(self, batch: Dict[str, Tuple[str, Optional[Callable[[str, Exception], None]]]]) -> None:
+        changed = {}  # type: Dict[str, str]
+        digests = {}  # type: Dict[str, bytes]
+        for path, (data, _) in batch.items():
+            digests[path] = self._hash(data)
+            if not self._isStored(path, digests[path]):
+                changed[path] = data
+
+        errors = SaveFile.writeAll(changed)
+        for path, error in errors.items():
+            Logger.log("e", "Unable to save file {path}: {err}".format(path = path, err = str(error)))
+            self._reportFailure(path, error, batch[path][1])
+        for path in changed.keys() - errors.keys():
+            self._remember(path, digests[path])
+
+    @staticmethod
+    def _reportFailure(path: str, error: Exception, on_failed: Optional[Callable[[str, Exception], None]]) -> None:
+        if on_failed is None:
+            return
+        try:
+            on_failed(path, error)
+        except Exception:
+            Logger.logException("e", "Failed to handle the failure to save {path}.".format(path = path))
+
+    def _isStored(self, path: str, digest: bytes) -> bool:
+        """Check whether a file already contains the text with the given hash."""
+
+        try:
+            status = os.stat(path)
+        except OSError:  # Doesn't exist yet.
+            return False
+        with self._condition:
+            stored = self._stored.get(path)
+        if stored is None or stored[1:] != (status.st_mtime_ns, status.st_size):
+            # Not seen before, or changed by something else since. Find out what it contains now.
+            try:
+                with open(path, "r", encoding = "utf-8") as f:
+                    stored = (self._hash(f.read()), status.st_mtime_ns, status.st_size)
+            except (OSError, UnicodeDecodeError):
+                return False
+            with self._condition:
+                self._stored[path] = stored
+        return stored[0] == digest
+
+    def _remember(self, path: str, digest: bytes) -> None:
+        try:
+            status = os.stat(path)
+        except OSError:
+            with self._condition:
+                self._stored.pop(path, None)
+            return
+        with self._condition:
+            self._stored[path] = (digest, status.st_mtime_ns, status.st_size)
+
+    @staticmethod
+    def _hash(data: str) -> bytes:
+        return hashlib.blake2b(data.encode("utf-8"), digest_size = 16).digest()
@@ -1,7 +1,7 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
-from typing import Any, cast, Dict, Iterable, Optional
+from typing import Any, cast, Dict, Iterable, List, Optional
 
 from UM.Logger import Logger
 from UM.PluginObject import PluginObject #We're implementing this.
@@ -156,11 +156,32 @@ class ContainerProvider(PluginObject):
 
         raise NotImplementedError("The container provider {class_name} doesn't properly implement loadMetadata.".format(class_name = self.__class__.__name__))
 
+    def loadMetadataBatch(self, container_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Loads the metadata of several containers at once.
+
+        By default this loads them one by one with ``loadMetadata``. Providers
+        can implement this to load many containers more efficiently.
+
+        :param container_ids: The IDs of the containers to load the metadata of.
+        :return: The metadata of each of the containers, indexed by their IDs.
+        """
+
+        return {container_id: self.loadMetadata(container_id) for container_id in container_ids}
+
     def metadata(self) -> Dict[str, Dict[str, Any]]:
         """Gets a dictionary of metadata of all containers, indexed by ID."""
 
         return self._metadata
 
+    def waitForSaving(self) -> None:
+        """Wait until the containers that this provider was asked to save are stored.
+
+        Providers that save containers in the background need to override this. By default, containers are stored by
+        the time saveContainer returns, so there is nothing to wait for.
+        """
+
+        pass
+
     def removeContainer(self, container_id: str) -> None:
         """Delete a container from this provider.
 
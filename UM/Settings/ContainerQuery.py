@@ -2,11 +2,14 @@
 # Uranium is released under the terms of the LGPLv3 or higher.
 
 import collections  # To cache queries.
+import itertools
 import re
 from threading import Lock
-from typing import Any, cast, Dict, List, Optional, Tuple, Type, TYPE_CHECKING, Union, ValuesView
+from typing import Any, Callable, cast, Dict, List, Optional, Set, Tuple, Type, TYPE_CHECKING, Union, ValuesView
 import functools
 
+from UM.Settings.MetadataIndex import MetadataIndex
+
 if TYPE_CHECKING:
     from UM.Settings.ContainerRegistry import ContainerRegistry
 
@@ -44,6 +47,7 @@ class ContainerQuery:
         self._kwargs = kwargs
 
         self._result = None  # type: Optional[List[Dict[str, Any]]]
+        self._result_ids = None  # type: Optional[Set[str]]  # The IDs of the containers in the result, computed when first needed.
 
     def getContainerType(self) -> Optional[type]:
         """Get the class of the containers that this query should find, if any.
@@ -61,6 +65,28 @@ class ContainerQuery:
 
         return self._result
 
+    def matches(self, metadata: Dict[str, Any]) -> bool:
+        """Check whether a container with the given metadata matches all criteria of this query.
+
+        :param metadata: The metadata of the container to check.
+        :return: True if the container would be in the result of this query, or False if it wouldn't.
+        """
+
+        return all(self._getFilter(key, value)(metadata) for key, value in self._kwargs.items())
+
+    def resultContains(self, container_id: str) -> bool:
+        """Check whether a container is in the result of this query.
+
+        :param container_id: The ID of the container to look for.
+        :return: True if the query was executed and the container was found by it, or False otherwise.
+        """
+
+        if self._result is None:
+            return False
+        if self._result_ids is None:
+            self._result_ids = {metadata.get("id") for metadata in self._result}
+        return container_id in self._result_ids
+
     def isIdOnly(self) -> bool:
         """Check to see if this is a very simple query that looks up a single container by ID.
 
@@ -87,6 +113,9 @@ class ContainerQuery:
         # To this end we'll track the filter so far and progressively refine our
         # filter. At every step we check the cache and store the query in the
         # cache if it's not there yet.
+        if candidates is None and isinstance(self._registry.metadata, MetadataIndex) and self._executeIndexed(self._registry.metadata):
+            return
+
         key_so_far = (self._ignore_case, )  # type: Tuple[Any, ...]
         if candidates is None:
             filtered_candidates: Union[ValuesView[Dict[str, Any]], List[Dict[str, Any]]] = self._registry.metadata.values()
@@ -101,23 +130,9 @@ class ContainerQuery:
                     filtered_candidates = cast(List[Dict[str, Any]], self.cache[key_so_far].getResult())
                     continue
 
-            # Find the filter to execute.
-            if isinstance(value, type):
-                key_filter = functools.partial(self._matchType, property_name = key, value = value)
-            elif isinstance(value, str):
-                if ContainerQuery.OPTIONS_REGEX.fullmatch(value) is not None:
-                    # With [token1|token2|token3|...], we try to find if any of the given tokens is present in the value.
-                    key_filter = functools.partial(self._matchRegMultipleTokens, property_name = key, value = value)
-                elif ("*" or "|") in value:
-                    key_filter = functools.partial(self._matchRegExp, property_name = key, value = value)
-                else:
-                    key_filter = functools.partial(self._matchString, property_name = key, value = value)
-            else:
-                key_filter = functools.partial(self._matchDirect, property_name = key, value = value)
-
             with self.lock:
                 # Execute this filter.
-                filtered_candidates = list(filter(key_filter, filtered_candidates))
+                filtered_candidates = list(filter(self._getFilter(key, value), filtered_candidates))
 
             # Store the result in the cache.
             if candidates is None:  # Only cache if we didn't pre-filter candidates.
@@ -129,6 +144,61 @@ class ContainerQuery:
         if not isinstance(filtered_candidates, list):
             filtered_candidates = list(filtered_candidates)
         self._result = filtered_candidates
+        self._result_ids = None
+
+    def _executeIndexed(self, index: MetadataIndex) -> bool:
+        """Execute the query by looking up the containers in the indexes of the registry's metadata.
+
+        The containers found in the indexes are then filtered on the rest of the arguments. Only the complete query
+        is cached, since looking up the indexed part again is cheap.
+
+        :return: Whether the query could use the indexes. If not, nothing was executed.
+        """
+
+        if self._ignore_case:
+            return False
+        indexed_arguments = {key: value for key, value in self._kwargs.items() if index.isIndexed(key) and self._isExactString(value)}
+        if not indexed_arguments:
+            return False
+
+        cache_key = (self._ignore_case, ) + tuple(itertools.chain.from_iterable(self._kwargs.items()))  # type: Tuple[Any, ...]
+        with self.lock:
+            if cache_key in self.cache:
+                self._result = self.cache[cache_key].getResult()
+                self._result_ids = None
+                return True
+
+            filtered_candidates = [index[container_id] for container_id in index.findIds(indexed_arguments)]
+            for key, value in self._kwargs.items():
+                if key not in indexed_arguments:
+                    filtered_candidates = list(filter(self._getFilter(key, value), filtered_candidates))
+
+            self._result = filtered_candidates
+            self._result_ids = None
+            self.cache[cache_key] = self
+        return True
+
+    def _getFilter(self, key: str, value: Any) -> Callable[[Dict[str, Any]], Any]:
+        """Find the filter to execute for one of the arguments."""
+
+        if isinstance(value, type):
+            return functools.partial(self._matchType, property_name = key, value = value)
+        elif isinstance(value, str):
+            if ContainerQuery.OPTIONS_REGEX.fullmatch(value) is not None:
+                # With [token1|token2|token3|...], we try to find if any of the given tokens is present in the value.
+                return functools.partial(self._matchRegMultipleTokens, property_name = key, value = value)
+            elif ("*" or "|") in value:
+                return functools.partial(self._matchRegExp, property_name = key, value = value)
+            else:
+                return functools.partial(self._matchString, property_name = key, value = value)
+        else:
+            return functools.partial(self._matchDirect, property_name = key, value = value)
+
+    @staticmethod
+    def _isExactString(value: Any) -> bool:
+        """Whether a value in the query is matched with _matchString, so it can be looked up in a hash index."""
+
+        return isinstance(value, str) and ContainerQuery.OPTIONS_REGEX.fullmatch(value) is None and "*" not in value
 
     def __str__(self):
         """Human-readable string representation for debugging."""
@@ -195,5 +265,5 @@ class ContainerQuery:
 
         return value == metadata[property_name]
 
-    __slots__ = ("_ignore_case", "_kwargs", "_result", "_registry")
+    __slots__ = ("_ignore_case", "_kwargs", "_result", "_result_ids", "_registry")
 
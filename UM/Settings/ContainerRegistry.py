@@ -1,12 +1,17 @@
 # Copyright (c) 2022 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+from concurrent.futures import Future
 import gc
 import re  # For finding containers with asterisks in the constraints and for detecting backup files.
+import threading
 import time
 import sqlite3 as db
-from typing import Any, cast, Dict, List, Optional, Set, Type, TYPE_CHECKING
+from typing import Any, cast, Dict, Iterable, List, Optional, Set, Tuple, Type, TYPE_CHECKING
 import os
+
+from PyQt6.QtCore import QObject, QThread
+
 import UM.Dictionary
 import UM.FlameProfiler
 from UM.LockFile import LockFile
@@ -17,6 +22,7 @@ from UM.Resources import Resources
 from UM.Settings.EmptyInstanceContainer import EmptyInstanceContainer
 from UM.Settings.ContainerFormatError import ContainerFormatError
 from UM.Settings.ContainerProvider import ContainerProvider
+from UM.Settings.MetadataIndex import MetadataIndex
 from UM.Settings.AdditionalSettingDefinitionsAppender import AdditionalSettingDefinitionsAppender
 from UM.Settings.constant_instance_containers import empty_container
 from . import ContainerQuery
@@ -63,7 +69,7 @@ class ContainerRegistry(ContainerRegistryInterface):
         self._additional_setting_definitions_list: List[Dict[str, Dict[str, Any]]] = []
         PluginRegistry.addType("setting_definitions_appender", self.addAdditionalSettingDefinitionsAppender)
 
-        self.metadata = {}  # type: Dict[str, metadata_type]
+        self.metadata = MetadataIndex()  # type: Dict[str, metadata_type]  # Indexed on the keys that are searched for most often.
         self._containers = {}  # type: Dict[str, ContainerInterface]
         self._wrong_container_ids = set() # type: Set[str]  # Set of already known wrong containers that must be skipped
         self.source_provider = {}  # type: Dict[str, Optional[ContainerProvider]]  # Where each container comes from.
@@ -75,7 +81,7 @@ class ContainerRegistry(ContainerRegistryInterface):
 
         # Since queries are based on metadata, we need to make sure to clear the cache when a container's metadata
         # changes.
-        self.containerMetaDataChanged.connect(self._clearQueryCache)
+        self.containerMetaDataChanged.connect(self._clearQueryCacheByMetaDataChange)
 
         # We use a database to store the metadata so that we don't have to extract them from the files every time
         # the application starts. Reading the data from a lot of files is especially slow on Windows; about 30x as slow.
@@ -85,6 +91,23 @@ class ContainerRegistry(ContainerRegistryInterface):
         # to extract it from the database again), we use database controllers to do that. These are set by type; Each
         # type of container needs to have their own controller.
         self._database_handlers: Dict[str, DatabaseMetadataContainerController] = {}
+        # The thread of loadAsync uses the database too. The connection and the cursors of the handlers are shared, so
+        # all access to them goes through this lock.
+        self._database_lock = threading.RLock()
+
+        # Whether loadAllMetadata reconciles the database with the providers in bulk, rather than container by container.
+        self._bulk_metadata_reconciliation = False
+        # How many processes to parse the metadata of containers with during bulk reconciliation. 0 to parse them in this process.
+        self._metadata_extraction_workers = 0
+
+        # While loadAsync is loading in the background, the thread that does it and what it has loaded so far. The
+        # thread doesn't change the registry itself; its results are added to the registry on the main thread.
+        self._loading_thread = None  # type: Optional[threading.Thread]
+        self._loading_futures = {}  # type: Dict[str, Future]  # For each container that was asked to be loaded, the container once it's loaded, or None.
+        self._loading_metadata = {}  # type: Dict[str, metadata_type]
+        self._loading_source_provider = {}  # type: Dict[str, Optional[ContainerProvider]]
+        self._loaded_containers = {}  # type: Dict[str, ContainerInterface]  # Including the containers used by the loaded stacks.
+        self._loading_owner_thread = None  # type: Optional[QThread]  # The thread that the loaded containers are moved to.
 
         self._explicit_read_only_container_ids = set()  # type: Set[str]
 
@@ -93,6 +116,7 @@ class ContainerRegistry(ContainerRegistryInterface):
     containerMetaDataChanged = Signal()
     containerLoadComplete = Signal()
     allMetadataLoaded = Signal()
+    loadingFinished = Signal()
 
     def addResourceType(self, resource_type: int, container_type: str) -> None:
         self._resource_types[container_type] = resource_type
@@ -206,6 +230,9 @@ class ContainerRegistry(ContainerRegistryInterface):
         list if nothing was found.
         """
 
+        if self._loading_thread is not None and threading.current_thread() is self._loading_thread:
+            return self._findContainersWhileLoading(ignore_case, kwargs)
+
         # Find the metadata of the containers and grab the actual containers from there.
         results_metadata = self.findContainersMetadata(ignore_case = ignore_case, **kwargs)
         result = []
@@ -245,6 +272,12 @@ class ContainerRegistry(ContainerRegistryInterface):
         an empty list if nothing was found.
         """
 
+        if self._loading_thread is not None:
+            if threading.current_thread() is self._loading_thread:
+                return self._findContainersMetadataWhileLoading(ignore_case, kwargs)
+            if kwargs.get("id") in self._loading_futures or kwargs.get("id") in self._loaded_containers:
+                self._waitForContainer(kwargs["id"])
+
         candidates = None
         if "id" in kwargs and kwargs["id"] is not None and "*" not in kwargs["id"] and not ignore_case:
             if kwargs["id"] not in self.metadata:  # If we're looking for an unknown ID, try to lazy-load that one.
@@ -360,7 +393,7 @@ class ContainerRegistry(ContainerRegistryInterface):
         return container_id in self._containers
 
     def _createDatabaseFile(self, db_path: str) -> db.Connection:
-        connection = db.Connection(db_path)
+        connection = db.Connection(db_path, check_same_thread = False)  # Used by the thread of loadAsync as well, behind _database_lock.
         cursor = connection.cursor()
         cursor.executescript("""
             CREATE TABLE containers(
@@ -378,59 +411,64 @@ class ContainerRegistry(ContainerRegistryInterface):
         return connection
 
     def _getDatabaseConnection(self) -> db.Connection:
-        if self._db_connection is not None:
+        with self._database_lock:
+            if self._db_connection is not None:
+                return self._db_connection
+            db_path = os.path.join(Resources.getCacheStoragePath(), "containers.db")
+            if not os.path.exists(db_path):
+                self._db_connection = self._createDatabaseFile(db_path)
+                return self._db_connection
+            self._db_connection = db.Connection(db_path, check_same_thread = False)  # Used by the thread of loadAsync as well, behind _database_lock.
             return self._db_connection
-        db_path = os.path.join(Resources.getCacheStoragePath(), "containers.db")
-        if not os.path.exists(db_path):
-            self._db_connection = self._createDatabaseFile(db_path)
-            return self._db_connection
-        self._db_connection = db.Connection(db_path)
-        return self._db_connection
 
     def _getProfileType(self, container_id: str, db_cursor: db.Cursor) -> Optional[str]:
         try:
-            db_cursor.execute("select id, container_type from containers where id = ?", (container_id, ))
+            with self._database_lock:
+                db_cursor.execute("select id, container_type from containers where id = ?", (container_id, ))
+                row = db_cursor.fetchone()
         except (db.DatabaseError, db.OperationalError) as e:
             Logger.error(f"Could not access database: {e}. Is it corrupt? Recreating it.")
             self._recreateCorruptDataBase(db_cursor)
             return None
-        row = db_cursor.fetchone()
         if row:
             return row[1]
         return None
 
     def _recreateCorruptDataBase(self, cursor: Optional[db.Cursor]) -> None:
         """Closes the Database, removes the file from cache and recreate all metadata from scratch"""
-        if not cursor:
-            self.loadAllMetadata()
-            return
-        try:
-            cursor.execute("rollback")  # Cancel any ongoing transaction.
-        except:
-            # Could be that the cursor is already closed
-            pass
+        if cursor:
+            with self._database_lock:
+                try:
+                    cursor.execute("rollback")  # Cancel any ongoing transaction.
+                except:
+                    # Could be that the cursor is already closed
+                    pass
 
-        try:
-            cursor.close()
-        except db.ProgrammingError:
-            # Database was already closed
-            pass
+                try:
+                    cursor.close()
+                except db.ProgrammingError:
+                    # Database was already closed
+                    pass
 
-        if self._db_connection is not None:
-            self._db_connection.close()
-            self._db_connection = None
+                if self._db_connection is not None:
+                    self._db_connection.close()
+                    self._db_connection = None
 
-        db_path = os.path.join(Resources.getCacheStoragePath(), "containers.db")
-        try:
-            os.remove(db_path)
-        except EnvironmentError:  # Was already deleted by rollback.
-            pass
+                db_path = os.path.join(Resources.getCacheStoragePath(), "containers.db")
+                try:
+                    os.remove(db_path)
+                except EnvironmentError:  # Was already deleted by rollback.
+                    pass
 
-        self.loadAllMetadata()
+        if threading.current_thread() is self._loading_thread:  # Can't wait for itself, and the results aren't in the registry yet.
+            self._loadAllMetadata(self._loading_metadata, self._loading_source_provider)
+        else:
+            self.loadAllMetadata()
 
     def _getProfileModificationTime(self, container_id: str, db_cursor: db.Cursor) -> Optional[float]:
-        db_cursor.execute("select id, last_modified from containers where id = ?", (container_id, ))
-        row = db_cursor.fetchone()
+        with self._database_lock:
+            db_cursor.execute("select id, last_modified from containers where id = ?", (container_id, ))
+            row = db_cursor.fetchone()
 
         if row:
             return row[1]
@@ -440,7 +478,8 @@ class ContainerRegistry(ContainerRegistryInterface):
         container_type = metadata["type"]
         if container_type in self._database_handlers:
             try:
-                self._database_handlers[container_type].insert(metadata)
+                with self._database_lock:
+                    self._database_handlers[container_type].insert(metadata)
             except (db.DatabaseError, db.OperationalError) as e:
                 Logger.warning(f"Removing corrupt database and recreating database. {e}")
                 self._recreateCorruptDataBase(self._database_handlers[container_type].cursor)
@@ -449,26 +488,75 @@ class ContainerRegistry(ContainerRegistryInterface):
         container_type = metadata["type"]
         if container_type in self._database_handlers:
             try:
-                self._database_handlers[container_type].update(metadata)
+                with self._database_lock:
+                    self._database_handlers[container_type].update(metadata)
             except (db.DatabaseError, db.OperationalError) as e:
                 Logger.warning(f"Removing corrupt database and recreating database. {e}")
                 self._recreateCorruptDataBase(self._database_handlers[container_type].cursor)
 
     def _getMetadataFromDatabase(self, container_id: str, container_type: str) -> metadata_type:
         if container_type in self._database_handlers:
-            return self._database_handlers[container_type].getMetadata(container_id)
+            with self._database_lock:
+                return self._database_handlers[container_type].getMetadata(container_id)
         return {}
 
+    def isBulkMetadataReconciliation(self) -> bool:
+        return self._bulk_metadata_reconciliation
+
+    def setBulkMetadataReconciliation(self, bulk: bool) -> None:
+        """Set how loadAllMetadata brings the metadata database up to date with the containers of the providers.
+
+        :param bulk: If True, the whole database is read with one query per table and compared to the providers in
+        memory. Only the containers that were added or changed are read from their files, and the changes are
+        written with one statement per table. If False (the default), the database is queried for every container
+        separately.
+        """
+
+        self._bulk_metadata_reconciliation = bulk
+
+    def getMetadataExtractionWorkers(self) -> int:
+        return self._metadata_extraction_workers
+
+    def setMetadataExtractionWorkers(self, workers: int) -> None:
+        """Set how many processes may be used to parse the metadata of containers that are not in the database yet.
+
+        This is only used when reconciling the metadata in bulk (see setBulkMetadataReconciliation), by providers that
+        support it. Starting the processes takes a while, so it only helps if there are many containers to parse, for
+        instance when the database was just created.
+
+        :param workers: The number of processes to use, or 0 to parse all metadata in this process.
+        """
+
+        self._metadata_extraction_workers = workers
+
     def loadAllMetadata(self) -> None:
         """Load the metadata of all available definition containers, instance
         containers and container stacks.
         """
 
+        self.waitForLoading()  # Don't reconcile the database at the same time as loadAsync.
+        self._clearQueryCache()
+        self._loadAllMetadata(self.metadata, self.source_provider)
+        ContainerRegistry.allMetadataLoaded.emit()
+
+    def _loadAllMetadata(self, all_metadata: Dict[str, metadata_type], source_providers: Dict[str, Optional[ContainerProvider]]) -> None:
+        """Bring the metadata database up to date with the providers and get the metadata of all of their containers.
+
+        :param all_metadata: The dictionary to store the metadata of the containers in, by ID.
+        :param source_providers: The dictionary to store the provider of each container in, by ID.
+        """
+
+        with self._database_lock:  # Other threads must not use the cursors of the handlers in the meanwhile.
+            self._reconcileMetadata(all_metadata, source_providers)
+
+    def _reconcileMetadata(self, all_metadata: Dict[str, metadata_type], source_providers: Dict[str, Optional[ContainerProvider]]) -> None:
         cursor = self._getDatabaseConnection().cursor()
         for handlers in self._database_handlers.values():
             handlers.cursor = cursor
 
-        self._clearQueryCache()
+        if self._bulk_metadata_reconciliation:
+            self._loadAllMetadataInBulk(cursor, all_metadata, source_providers)
+            return
         gc.disable()
         resource_start_time = time.time()
 
@@ -510,8 +598,8 @@ class ContainerRegistry(ContainerRegistryInterface):
                             cursor.execute("begin")
                         self._addMetadataToDatabase(metadata)
 
-                    self.metadata[container_id] = metadata
-                    self.source_provider[container_id] = provider
+                    all_metadata[container_id] = metadata
+                    source_providers[container_id] = provider
 
                 else:
                     # Metadata already exists in database.
@@ -532,16 +620,16 @@ class ContainerRegistry(ContainerRegistryInterface):
                             cursor = self._getDatabaseConnection().cursor()  # After recreating the database, all the cursors have changed.
                             cursor.execute("begin")
                         self._updateMetadataInDatabase(metadata)
-                        self.metadata[container_id] = metadata
-                        self.source_provider[container_id] = provider
+                        all_metadata[container_id] = metadata
+                        source_providers[container_id] = provider
                         continue
 
                     # Since we know that the container exists, we also know that it will never be None.
                     container_type = cast(str, self._getProfileType(container_id, cursor))
 
                     # No need to do any file reading, we can just get it from the database.
-                    self.metadata[container_id] = self._getMetadataFromDatabase(container_id, container_type)
-                    self.source_provider[container_id] = provider
+                    all_metadata[container_id] = self._getMetadataFromDatabase(container_id, container_type)
+                    source_providers[container_id] = provider
 
         cursor.execute("commit")
 
@@ -564,11 +652,121 @@ class ContainerRegistry(ContainerRegistryInterface):
 
         Logger.log("d", "Loading metadata into container registry took %s seconds", time.time() - resource_start_time)
         gc.enable()
-        ContainerRegistry.allMetadataLoaded.emit()
+
+    def _loadAllMetadataInBulk(self, cursor: db.Cursor, all_metadata: Dict[str, metadata_type], source_providers: Dict[str, Optional[ContainerProvider]]) -> None:
+        gc.disable()
+        resource_start_time = time.time()
+
+        # Which provider each container comes from. Like with loading them one by one, the last provider wins.
+        container_providers = {}  # type: Dict[str, ContainerProvider]
+        for provider in self._providers:  # Automatically sorted by the priority queue.
+            for container_id in list(provider.getAllIds()):  # Make copy of all IDs since it might change during iteration.
+                container_providers[container_id] = provider
+
+        try:
+            database_containers, database_metadata = self._readAllMetadataFromDatabase(cursor)
+        except (db.DatabaseError, db.OperationalError) as e:
+            Logger.warning(f"Removing corrupt database and recreating database. {e}")
+            self._recreateCorruptDataBase(cursor)
+            cursor = self._getDatabaseConnection().cursor()  # After recreating the database, all the cursors have changed.
+            for handler in self._database_handlers.values():
+                handler.cursor = cursor
+            database_containers, database_metadata = {}, {}
+
+        # Find out which containers need to be read from their files, so that each provider can load them all at once.
+        modified_times = {}  # type: Dict[str, float]
+        ids_to_load = []  # type: List[str]
+        for container_id, provider in container_providers.items():
+            if container_id in database_containers:
+                try:
+                    modified_times[container_id] = provider.getLastModifiedTime(container_id)
+                except OSError:
+                    Logger.warning(f"Could not get last modified time of {container_id}.")
+                    continue
+                if modified_times[container_id] <= database_containers[container_id][0]:
+                    continue  # Up to date.
+            ids_to_load.append(container_id)
+        loaded_metadata = {}  # type: Dict[str, metadata_type]
+        for provider in self._providers:
+            provider_ids_to_load = [container_id for container_id in ids_to_load if container_providers[container_id] is provider]
+            if provider_ids_to_load:
+                loaded_metadata.update(provider.loadMetadataBatch(provider_ids_to_load))
+
+        new_rows = []  # type: List[Tuple[str, str, float, str]]
+        changed_rows = []  # type: List[Tuple[str, float, str, str]]
+        new_metadata = {container_type: [] for container_type in self._database_handlers}  # type: Dict[str, List[metadata_type]]
+        changed_metadata = {container_type: [] for container_type in self._database_handlers}  # type: Dict[str, List[metadata_type]]
+        for container_id, provider in container_providers.items():
+            if container_id not in database_containers:
+                # Item is not yet in the database. Add it now!
+                metadata = loaded_metadata[container_id]
+                if not self._isMetadataValid(metadata):
+                    Logger.log("w", f"Invalid metadata for container {container_id}: {metadata}")
+                    continue
+                if metadata.get("type") in self._database_handlers:
+                    # Only add it to the database if we have an actual handler.
+                    new_rows.append((container_id, metadata["name"], provider.getLastModifiedTime(container_id), metadata["type"]))
+                    new_metadata[metadata["type"]].append(metadata)
+            elif container_id not in modified_times:
+                continue  # Its modification time couldn't be read.
+            else:
+                db_last_modified_time, container_type = database_containers[container_id]
+                modified_time = modified_times[container_id]
+                if modified_time > db_last_modified_time:
+                    # Metadata is outdated, so it was loaded from file. Update the database.
+                    metadata = loaded_metadata[container_id]
+                    if not self._isMetadataValid(metadata):
+                        Logger.log("w", f"Invalid metadata for container {container_id}: {metadata}")
+                        continue
+                    changed_rows.append((metadata["name"], modified_time, metadata["type"], metadata["id"]))
+                    if metadata["type"] in self._database_handlers:
+                        changed_metadata[metadata["type"]].append(metadata)
+                else:
+                    # No need to do any file reading, we can just get it from the database.
+                    metadata = database_metadata.get(container_type, {}).get(container_id, {})
+            all_metadata[container_id] = metadata
+            source_providers[container_id] = provider
+
+        # Purge ID's that don't have a matching file.
+        ids_to_remove = set(database_containers.keys()) - set(container_providers.keys())
+
+        # Since it could well be that we have to make a *lot* of changes to the database, we want to do that in
+        # a single transaction to speed it up.
+        try:
+            cursor.execute("begin")
+            cursor.executemany("INSERT INTO containers (id, name, last_modified, container_type) VALUES (?, ?, ?, ?)", new_rows)
+            cursor.executemany("UPDATE containers SET name = ?, last_modified = ?, container_type = ? WHERE id = ?", changed_rows)
+            cursor.executemany("DELETE FROM containers WHERE id = ?", [(container_id, ) for container_id in ids_to_remove])
+            for container_type, handler in self._database_handlers.items():
+                handler.insertMany(new_metadata[container_type])
+                handler.updateMany(changed_metadata[container_type])
+                if ids_to_remove:
+                    handler.deleteMany(ids_to_remove)
+            cursor.execute("commit")
+        except (db.DatabaseError, db.OperationalError) as e:
+            # The metadata was already loaded, so it's only the cache for the next time that is lost.
+            Logger.warning(f"Unable to write the metadata cache to the database, recreating database: {str(e)}")
+            self._recreateCorruptDataBase(cursor)
+
+        Logger.log("d", "Loading metadata into container registry in bulk took %s seconds (%s new, %s changed, %s removed)", time.time() - resource_start_time, len(new_rows), len(changed_rows), len(ids_to_remove))
+        gc.enable()
+
+    def _readAllMetadataFromDatabase(self, cursor: db.Cursor) -> Tuple[Dict[str, Tuple[float, str]], Dict[str, Dict[str, metadata_type]]]:
+        """Read the modification times and metadata of all containers in the database, with one query per table.
+
+        :return: The last modification time and type of each container, by ID, and the metadata of the containers
+        that have a database handler, by type and then by ID.
+        """
+
+        cursor.execute("SELECT id, last_modified, container_type FROM containers")
+        database_containers = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        database_metadata = {container_type: handler.getAllMetadata() for container_type, handler in self._database_handlers.items()}
+        return database_containers, database_metadata
 
     def _removeContainerFromDatabase(self, container_id: str) -> None:
-        for database_handler in self._database_handlers.values():
-            database_handler.delete(container_id)
+        with self._database_lock:
+            for database_handler in self._database_handlers.values():
+                database_handler.delete(container_id)
 
     @UM.FlameProfiler.profile
     def load(self) -> None:
@@ -579,6 +777,8 @@ class ContainerRegistry(ContainerRegistryInterface):
         that were already added when the first call to this method happened will not be re-added.
         """
 
+        self.waitForLoading()
+
         # Disable garbage collection to speed up the loading (at the cost of memory usage).
         gc.disable()
         resource_start_time = time.time()
@@ -601,6 +801,171 @@ class ContainerRegistry(ContainerRegistryInterface):
         gc.enable()
         Logger.log("d", "Loading data into container registry took %s seconds", time.time() - resource_start_time)
 
+    def loadAsync(self, container_ids: Iterable[str] = ()) -> None:
+        """Load the metadata of all containers and some of the containers themselves on a background thread.
+
+        This does the same as loadAllMetadata, and loads the given containers (for instance the stacks that the
+        application starts with) along with the containers that they use. In the meantime the application can continue
+        to start. When a container that is being loaded is asked for by its ID, only that container is waited for.
+        Other searches only find the containers that were known before loadAsync was called, until loading is done.
+
+        The results are added to the registry on the main thread when the thread is done, after which allMetadataLoaded
+        and loadingFinished are emitted. To wait for that, call waitForLoading.
+        :param container_ids: The IDs of the containers to load completely.
+        """
+
+        if self._loading_thread is not None:
+            Logger.warning("The container registry is already loading in the background.")
+            return
+
+        self._loading_futures = {container_id: Future() for container_id in container_ids}
+        self._loading_metadata = {}
+        self._loading_source_provider = {}
+        self._loaded_containers = {}
+        self._loading_owner_thread = QThread.currentThread()
+        self._loading_thread = threading.Thread(target = self._loadInBackground, name = "ContainerRegistryLoader", daemon = True)
+        self._loading_thread.start()
+
+    def isLoading(self) -> bool:
+        """Whether loadAsync is still loading containers, or its results have not been added to the registry yet."""
+
+        return self._loading_thread is not None
+
+    def getLoadingFuture(self, container_id: str) -> Optional[Future]:
+        """Get the future of a container that loadAsync was asked to load.
+
+        :param container_id: The ID of the container.
+        :return: A future that gets the container when it is loaded, or None if it could not be loaded. The container
+        is not in the registry until it is found with findContainers or loading is done. If loadAsync is not loading
+        this container, None is returned.
+        """
+
+        return self._loading_futures.get(container_id)
+
+    def waitForLoading(self) -> None:
+        """Wait until loadAsync is done, and add everything that it loaded to the registry.
+
+        This is called on the main thread automatically when the thread is done. If loadAsync is not loading, this
+        does nothing.
+        """
+
+        if self._loading_thread is None:
+            return
+        self._loading_thread.join()
+        self._loading_thread = None
+
+        for container_id, metadata in self._loading_metadata.items():
+            if container_id not in self._containers:  # Keep the metadata of the containers that were loaded in the meantime.
+                self.metadata[container_id] = metadata
+                self.source_provider[container_id] = self._loading_source_provider.get(container_id)
+        self._clearQueryCache()
+        self._addLoadedContainers()
+
+        self._loading_futures = {}
+        self._loading_metadata = {}
+        self._loading_source_provider = {}
+        self._loaded_containers = {}
+        ContainerRegistry.allMetadataLoaded.emit()
+        self.loadingFinished.emit()
+
+    def _loadInBackground(self) -> None:
+        try:
+            self._loadAllMetadata(self._loading_metadata, self._loading_source_provider)
+        except Exception as e:
+            Logger.logException("e", "Failed to load the metadata of the containers in the background.")
+            for future in self._loading_futures.values():
+                future.set_exception(e)
+        else:
+            with self.lockCache():  # Because we might be writing cache files.
+                for container_id, future in self._loading_futures.items():
+                    future.set_result(self._loadContainerWhileLoading(container_id))
+        self._application.callLater(self._onLoadingThreadFinished)
+
+    def _onLoadingThreadFinished(self) -> None:
+        if threading.current_thread() is not self._loading_thread:  # Applications that call functions right away call this from the thread itself.
+            self.waitForLoading()
+
+    def _waitForContainer(self, container_id: str) -> None:
+        future = self._loading_futures.get(container_id)
+        if future is not None:
+            try:
+                future.result()
+            except Exception:
+                pass  # The thread logged the error. The container is loaded on this thread instead, if possible.
+        self._addLoadedContainers()
+
+    def _addLoadedContainers(self) -> None:
+        """Add the containers that loadAsync has loaded so far to the registry."""
+
+        for container_id, container in list(self._loaded_containers.items()):  # Make a copy, since the thread may still be adding to it.
+            if container_id in self._containers:
+                continue
+            self.source_provider[container_id] = self._loading_source_provider.get(container_id, self.source_provider.get(container_id))
+            self.addContainer(container)
+            self.containerLoadComplete.emit(container_id)
+
+    def _findContainersWhileLoading(self, ignore_case: bool, kwargs: Dict[str, Any]) -> List[ContainerInterface]:
+        """Find containers from the thread of loadAsync, without changing the registry.
+
+        This is used when the containers that are being loaded need other containers, for instance for stacks.
+        """
+
+        result = []
+        for metadata in self._findContainersMetadataWhileLoading(ignore_case, kwargs):
+            container = self._loadContainerWhileLoading(metadata["id"])
+            if container is not None:
+                result.append(container)
+        return result
+
+    def _findContainersMetadataWhileLoading(self, ignore_case: bool, kwargs: Dict[str, Any]) -> List[metadata_type]:
+        """Find the metadata of containers from the thread of loadAsync, without changing the registry.
+
+        Only searching by exact ID is supported, since the metadata of all containers is not known yet.
+        """
+
+        container_id = kwargs.get("id")
+        if container_id is None or "*" in container_id or ignore_case:
+            Logger.warning(f"While loading in the background, containers can only be found by their ID, not by {kwargs}.")
+            return []
+
+        metadata = self._loading_metadata.get(container_id, self.metadata.get(container_id))
+        if metadata is None:
+            for provider in self._providers:
+                if container_id in provider.getAllIds():
+                    metadata = provider.loadMetadata(container_id)
+                    break
+            else:
+                return []
+            if metadata is None or "id" not in metadata or metadata["id"] in self._wrong_container_ids:
+                return []
+            self._loading_metadata[container_id] = metadata
+            self._loading_source_provider[container_id] = provider
+
+        if not ContainerQuery.ContainerQuery(self, ignore_case = ignore_case, **kwargs).matches(metadata):
+            return []
+        return [metadata]
+
+    def _loadContainerWhileLoading(self, container_id: str) -> Optional[ContainerInterface]:
+        container = self._containers.get(container_id, self._loaded_containers.get(container_id))
+        if container is not None:
+            return container
+        if container_id in self._wrong_container_ids:
+            return None
+        provider = self._loading_source_provider.get(container_id, self.source_provider.get(container_id))
+        if not provider:
+            return None
+        try:
+            container = provider.loadContainer(container_id)
+        except Exception as e:
+            Logger.logException("e", "Error when loading container {container_id}: {error_msg}".format(container_id = container_id, error_msg = str(e)))
+            return None
+        if isinstance(container, QObject) and container.thread() is QThread.currentThread() is not self._loading_owner_thread:
+            # A QObject belongs to the thread that created it, which ends when loading is done. Give it to the thread
+            # that uses the registry, so that its queued signals and timers keep working. Only the owner can do this.
+            container.moveToThread(self._loading_owner_thread)
+        self._loaded_containers[container_id] = container
+        return container
+
     @UM.FlameProfiler.profile
     def addContainer(self, container: ContainerInterface) -> bool:
         container_id = container.getId()
@@ -819,7 +1184,11 @@ class ContainerRegistry(ContainerRegistryInterface):
         self.source_provider[container.getId()] = provider
 
     def saveDirtyContainers(self) -> None:
-        """Save all the dirty containers by calling the appropriate container providers"""
+        """Save all the dirty containers by calling the appropriate container providers
+
+        Providers may still be writing the containers in the background after this returns. Use waitForSaving to wait
+        until they are stored.
+        """
 
         # Lock file for "more" atomically loading and saving to/from config dir.
         with self.lockFile():
@@ -829,28 +1198,36 @@ class ContainerRegistry(ContainerRegistryInterface):
             for stack in self.findContainerStacks():
                 self.saveContainer(stack)
 
+    def waitForSaving(self) -> None:
+        """Wait until all providers have stored the containers that they were asked to save."""
+
+        for provider in self._providers:
+            provider.waitForSaving()
+
     # Clear the internal query cache
     def _clearQueryCache(self, *args: Any, **kwargs: Any) -> None:
         with ContainerQuery.ContainerQuery.lock:
             ContainerQuery.ContainerQuery.cache.clear()
 
     def _clearQueryCacheByContainer(self, container: ContainerInterface) -> None:
-        """Clear the query cache by using container type.
-        This is a slightly smarter way of clearing the cache. Only queries that are of the same type (or without one)
-        are cleared.
+        """Clear the cached queries whose result may change because a container was added, removed or changed.
+
+        Those are the queries that found the container before, and the queries that its current metadata matches.
+        The results of all other queries can't contain the container, neither before nor after the change, so they
+        are kept.
         """
+        container_id = container.getId()
+        metadata = container.getMetaData()
         with ContainerQuery.ContainerQuery.lock:
-            # Remove all case-insensitive matches since we won't find those with the below "<=" subset check.
-            # TODO: Properly check case-insensitively in the dict's values.
-            for key in list(ContainerQuery.ContainerQuery.cache):
-                if not key[0]:
+            for key, query in list(ContainerQuery.ContainerQuery.cache.items()):
+                if query.resultContains(container_id) or query.matches(metadata):
                     del ContainerQuery.ContainerQuery.cache[key]
 
-            # Remove all cache items that this container could fall in.
-            for key in list(ContainerQuery.ContainerQuery.cache):
-                query_metadata = dict(zip(key[1::2], key[2::2]))
-                if query_metadata.items() <= container.getMetaData().items():
-                    del ContainerQuery.ContainerQuery.cache[key]
+    def _clearQueryCacheByMetaDataChange(self, *args: Any, **kwargs: Any) -> None:
+        if args and isinstance(args[0], ContainerInterface):
+            self._clearQueryCacheByContainer(args[0])
+        else:  # Don't know which container changed.
+            self._clearQueryCache()
 
     def _onContainerMetaDataChanged(self, *args: ContainerInterface, **kwargs: Any) -> None:
         """Called when any container's metadata changed.
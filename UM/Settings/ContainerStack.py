@@ -4,7 +4,7 @@
 import configparser
 import io
 from functools import lru_cache
-from typing import Any, cast, Dict, List, Optional, Set, Tuple
+from typing import Any, cast, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from PyQt6.QtCore import QObject, pyqtProperty, pyqtSignal
 
@@ -22,8 +22,11 @@ from UM.Settings.DefinitionContainer import DefinitionContainer #For getting all
 from UM.Settings.InstanceContainer import InstanceContainer
 from UM.Settings.Interfaces import ContainerInterface, ContainerRegistryInterface
 from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext
-from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings import SettingEvaluationProfiler
+from UM.Settings.SettingDefinition import DefinitionPropertyType, SettingDefinition
 from UM.Settings.SettingFunction import SettingFunction
+from UM.Settings.SettingRelation import RelationType
+from UM.Settings.SettingValueSnapshot import nextGeneration, SettingValueSnapshot
 from UM.Settings.Validator import ValidatorState
 
 
@@ -58,6 +61,9 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
 
     Version = 6  # type: int
 
+    # Cached member functions of which the result only depends on the setting key passed as first argument.
+    _keyed_cached_function_names = ("getProperty", "getRawProperty", "hasProperty", "getSettingDefinition")
+
     def __init__(self, stack_id: str) -> None:
         """Constructor
 
@@ -83,6 +89,15 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         self._property_changes = {}  # type: Dict[str, Set[str]]
         self._emit_property_changed_queued = False  # type: bool
 
+        # When enabled, a property change only invalidates the cached properties of the changed setting and of the
+        # settings that (transitively) depend on it, instead of the whole cache of this stack.
+        self._selective_cache_invalidation = False  # type: bool
+        # For the containers in this stack, by their ID: the container, its generation and the dependents of its keys.
+        self._container_dependents = {}  # type: Dict[int, Tuple[ContainerInterface, int, Optional[Dict[str, Set[str]]]]]
+
+        self._generation = nextGeneration()  # type: int
+        self._value_snapshot = None  # type: Optional[SettingValueSnapshot]
+
     def __getnewargs__(self) -> Tuple[str]:
         """For pickle support"""
 
@@ -223,13 +238,32 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
     def isDirty(self) -> bool:
         return self._dirty
 
+    def isSelectiveCacheInvalidation(self) -> bool:
+        return self._selective_cache_invalidation
+
+    def setSelectiveCacheInvalidation(self, selective: bool) -> None:
+        """Set whether a property change should only invalidate the cache of the settings that depend on it.
+
+        :param selective: If True, changing a setting only drops the cached properties of that setting and its
+        (transitive) dependents, as found through the relations of its SettingDefinition and the functions in the
+        instance containers of this stack. If False, any property change drops all cached properties of this stack.
+        The whole cache is still dropped if this stack contains another stack, or a container that doesn't list its
+        keys (getAllKeys returns None) or has an invalid function.
+        """
+
+        if selective != self._selective_cache_invalidation:
+            CachedMemberFunctions.clearInstanceCache(self)
+            self._selective_cache_invalidation = selective
+
     def setDirty(self, dirty: bool) -> None:
         CachedMemberFunctions.clearInstanceCache(self)
         self._dirty = dirty
 
     containersChanged = Signal()
 
+    @SettingEvaluationProfiler.profileGetProperty
     @cache_per_instance
+    @SettingEvaluationProfiler.profileEvaluation
     def getProperty(self, key: str, property_name: str, context: Optional[PropertyEvaluationContext] = None) -> Any:
         """:copydoc ContainerInterface::getProperty
 
@@ -306,6 +340,103 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         else:
             return None
 
+    def getProperties(self, keys: Iterable[str], property_names: Iterable[str], context: Optional[PropertyEvaluationContext] = None) -> Dict[str, Dict[str, Any]]:
+        """Get the values of several properties of several settings in one pass.
+
+        This gives the same results as calling getProperty() for every combination of key and property name, but the
+        containers are only walked once per key, and the result of every setting function evaluated in the process
+        is shared with all other settings that refer to it. The result cache of getProperty() is not used.
+
+        If a context is provided, setting functions evaluate the settings they refer to through the root stack of that
+        context, so only the requested properties themselves are shared.
+
+        :param keys: The keys of the settings to get the properties of.
+        :param property_names: The names of the properties to get of each setting.
+        :return: A dictionary with, for every key, a dictionary of property names to their values.
+        """
+
+        property_names = list(property_names)
+        if type(self).getProperty is not ContainerStack.getProperty:
+            # Subclasses may give different meaning to getProperty, so we can't bypass it.
+            return {key: {property_name: self.getProperty(key, property_name, context) for property_name in property_names} for key in keys}
+
+        batch = _PropertyBatch(self, context)
+        return {key: batch.getProperties(key, property_names) for key in keys}
+
+    @staticmethod
+    def getPropertiesOfSiblings(stacks: Sequence["ContainerStack"], keys: Iterable[str], property_names: Iterable[str]) -> List[Dict[str, Dict[str, Any]]]:
+        """Get the values of several properties of several settings in several sibling stacks in one pass.
+
+        Sibling stacks are stacks with the same next stack, like the extruder stacks of a machine. This gives the same
+        results as calling getProperties() on every stack, but the containers of the common next stack are only walked
+        once for all siblings. A value that a sibling gets from the next stack is only evaluated once as well, unless
+        it is a setting function that refers to a setting that the sibling itself overrides.
+
+        :param stacks: The stacks to evaluate the properties in. Stacks with different next stacks are allowed, but
+        only the stacks that have the same next stack share their evaluations.
+        :param keys: The keys of the settings to get the properties of.
+        :param property_names: The names of the properties to get of each setting.
+        :return: For every stack in the same order, a dictionary with, for every key, a dictionary of property names
+        to their values.
+        """
+
+        keys = list(keys)
+        property_names = list(property_names)
+        shared_batches = {}  # type: Dict[int, _SharedPropertyBatch]
+        results = []  # type: List[Dict[str, Dict[str, Any]]]
+        for stack in stacks:
+            next_stack = stack.getNextStack()
+            if type(stack).getProperty is not ContainerStack.getProperty or next_stack is None:
+                results.append(stack.getProperties(keys, property_names))
+                continue
+            if id(next_stack) not in shared_batches:
+                shared_batches[id(next_stack)] = _SharedPropertyBatch(next_stack)
+            batch = _PropertyBatch(stack, None, shared_batches[id(next_stack)])
+            results.append({key: batch.getProperties(key, property_names) for key in keys})
+        return results
+
+    def _getRawProperties(self, key: str, property_names: List[str], context: Optional[PropertyEvaluationContext] = None, use_next: bool = True) -> Dict[str, Any]:
+        """Retrieve several raw properties of a setting, walking the containers of the stack only once.
+
+        :param use_next: True if the properties that are not found in this stack should be retrieved from the next
+        stack, False if they should be None.
+        :return: A dictionary of property names to the raw property values, like getRawProperty() would return them.
+        """
+
+        results = {property_name: None for property_name in property_names}  # type: Dict[str, Any]
+        containers = self._containers
+        if context is not None:
+            # if context is provided, check if there is any container that needs to be skipped.
+            start_index = context.context.get("evaluate_from_container_index", 0)
+            if start_index >= len(self._containers):
+                return results
+            containers = self._containers[start_index:]
+
+        remaining = []  # type: List[str]
+        for property_name in property_names:
+            if property_name not in ["value", "state", "validationState"]:
+                # Value, state & validationState can be changed by instanceContainer, the rest cant. Ask the definition
+                # right away
+                if containers:
+                    results[property_name] = containers[-1].getProperty(key, property_name, context)
+                if results[property_name] is None:
+                    remaining.append(property_name)
+
+        stackable = [property_name for property_name in property_names if property_name in ["value", "state", "validationState"]]
+        for container in containers:
+            if not stackable:
+                break
+            for property_name in stackable[:]:
+                value = container.getProperty(key, property_name, context)
+                if value is not None:
+                    results[property_name] = value
+                    stackable.remove(property_name)
+        remaining.extend(stackable)
+
+        if remaining and self._next_stack and use_next:
+            results.update(self._next_stack._getRawProperties(key, remaining, context))
+        return results
+
     @cache_per_instance
     def hasProperty(self, key: str, property_name: str) -> bool:
         """:copydoc ContainerInterface::hasProperty
@@ -331,6 +462,15 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
     propertyChanged = Signal(Signal.Queued)
     propertiesChanged = Signal(Signal.Queued)
 
+    propertiesChangedBatch = Signal(Signal.Queued)
+    """Emitted once with all property changes that were collected since the last emission.
+
+    This is emitted along with the propertiesChanged signal per setting, for listeners that would rather handle all
+    changes at once.
+
+    :param changes: A dictionary of setting keys to the sets of names of properties of those settings that changed.
+    """
+
     def serialize(self, ignored_metadata_keys: Optional[Set[str]] = None) -> str:
         """:copydoc ContainerInterface::serialize
 
@@ -429,7 +569,7 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
 
         # Clear all data before starting.
         for container in self._containers:
-            container.propertyChanged.disconnect(self._collectPropertyChanges)
+            self._disconnectContainerSignals(container)
 
         self._containers = []
         self._metadata = {}
@@ -445,7 +585,7 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
             for index, container_id in parser.items("containers"):
                 containers = _containerRegistry.findContainers(id = container_id)
                 if containers:
-                    containers[0].propertyChanged.connect(self._collectPropertyChanges)
+                    self._connectContainerSignals(containers[0])
                     self._containers.append(containers[0])
                 else:
                     self._containers.append(_containerRegistry.getEmptyInstanceContainer())
@@ -462,7 +602,7 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
                 if container_id != "":
                     containers = _containerRegistry.findContainers(id = container_id)
                     if containers:
-                        containers[0].propertyChanged.connect(self._collectPropertyChanges)
+                        self._connectContainerSignals(containers[0])
                         self._containers.append(containers[0])
                     else:
                         self._containers.append(_containerRegistry.getEmptyInstanceContainer())
@@ -472,6 +612,7 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
 
         ## TODO; Deserialize the containers.
 
+        self._generation = nextGeneration()
         return serialized
 
     @classmethod
@@ -545,6 +686,37 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
 
         return settings
 
+    def getGeneration(self) -> int:
+        """Get the generation of this stack.
+
+        The generation changes whenever anything changes that may affect the value of a setting in this stack: a
+        change in one of its containers, a change of the containers themselves, or a change of the next stack. It only
+        ever goes up, so it can be compared with the generation of an earlier SettingValueSnapshot.
+        """
+
+        generation = self._generation
+        for container in self._containers:
+            if isinstance(container, (InstanceContainer, ContainerStack)):  # Other containers can't change.
+                generation = max(generation, container.getGeneration())
+        if self._next_stack:
+            generation = max(generation, self._next_stack.getGeneration())
+        return generation
+
+    def getValueSnapshot(self) -> SettingValueSnapshot:
+        """Get the evaluated values of all settings in this stack (and its next stacks), frozen in a snapshot.
+
+        The snapshot is only re-evaluated if the generation of the stack changed since the previous snapshot, so
+        asking for it repeatedly is cheap. The snapshot can be read from other threads, while this stack changes.
+        """
+
+        generation = self.getGeneration()
+        snapshot = self._value_snapshot
+        if snapshot is None or snapshot.getGeneration() != generation:
+            values = {key: properties["value"] for key, properties in self.getProperties(self.getAllKeys(), ["value"]).items()}
+            snapshot = SettingValueSnapshot(values, generation, self.getId())
+            self._value_snapshot = snapshot
+        return snapshot
+
     @cache_per_instance
     def getContainers(self) -> List[ContainerInterface]:
         """Get a list of all containers in this stack.
@@ -693,8 +865,9 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
             raise Exception("Unable to add stack to itself.")
 
         CachedMemberFunctions.clearInstanceCache(self)
-        container.propertyChanged.connect(self._collectPropertyChanges)
+        self._connectContainerSignals(container)
         self._containers.insert(index, container)
+        self._generation = nextGeneration()
         self.containersChanged.emit(container)
         self._dirty = True
 
@@ -715,9 +888,10 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
             raise Exception("Unable to replace container with ContainerStack (self) ")
 
         CachedMemberFunctions.clearInstanceCache(self)
-        self._containers[index].propertyChanged.disconnect(self._collectPropertyChanges)
-        container.propertyChanged.connect(self._collectPropertyChanges)
+        self._disconnectContainerSignals(self._containers[index])
+        self._connectContainerSignals(container)
         self._containers[index] = container
+        self._generation = nextGeneration()
         self._dirty = True
         if postpone_emit:
             # send it using sendPostponedEmits
@@ -739,8 +913,9 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
             CachedMemberFunctions.clearInstanceCache(self)
             container = self._containers[index]
             self._dirty = True
-            container.propertyChanged.disconnect(self._collectPropertyChanges)
+            self._disconnectContainerSignals(container)
             del self._containers[index]
+            self._generation = nextGeneration()
             self.containersChanged.emit(container)
         except TypeError:
             raise IndexError("Can't delete container with index %s" % index)
@@ -774,6 +949,7 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
             self._next_stack.propertyChanged.disconnect(self._collectPropertyChanges)
             self.containersChanged.disconnect(self._next_stack.containersChanged)
         self._next_stack = stack
+        self._generation = nextGeneration()
         if self._next_stack and connect_signals:
             self._next_stack.propertyChanged.connect(self._collectPropertyChanges)
             self.containersChanged.connect(self._next_stack.containersChanged)
@@ -841,18 +1017,116 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
     # In addition, it allows us to emit a single signal that reports all properties that
     # have changed.
     def _collectPropertyChanges(self, key: str, property_name: str) -> None:
-        CachedMemberFunctions.clearInstanceCache(self)
+        self._generation = nextGeneration()
+        if self._selective_cache_invalidation:
+            self._invalidateCachedProperties(key)
+        else:
+            CachedMemberFunctions.clearInstanceCache(self)
 
         if key not in self._property_changes:
             self._property_changes[key] = set()
 
         self._property_changes[key].add(property_name)
 
+        self._queueEmitCollectedPropertyChanges()
+
+    # Same as _collectPropertyChanges, but for the changes of several properties of several settings at once.
+    def _collectPropertiesChanges(self, changes: Dict[str, Set[str]]) -> None:
+        self._generation = nextGeneration()
+        if self._selective_cache_invalidation:
+            self._invalidateCachedProperties(*changes.keys())
+        else:
+            CachedMemberFunctions.clearInstanceCache(self)
+
+        for key, property_names in changes.items():
+            if key not in self._property_changes:
+                self._property_changes[key] = set()
+            self._property_changes[key].update(property_names)
+
+        self._queueEmitCollectedPropertyChanges()
+
+    def _queueEmitCollectedPropertyChanges(self) -> None:
         if not self._emit_property_changed_queued:
             from UM.Application import Application
             Application.getInstance().callLater(self._emitCollectedPropertyChanges)
             self._emit_property_changed_queued = True
 
+    # Drop the cached properties of settings and of all settings of which the properties depend on them.
+    # Cached results of functions that aren't looked up by setting key (hasErrors, getAllKeys, etc.) are always dropped.
+    def _invalidateCachedProperties(self, *keys: str) -> None:
+        instance_dependents = self._getInstanceDependents()
+        if instance_dependents is None or any(self.getSettingDefinition(key) is None for key in keys):
+            # Without a definition or without knowing the functions in the containers, we don't know what depends on
+            # these keys, so play it safe.
+            CachedMemberFunctions.clearInstanceCache(self)
+            return
+
+        affected_keys = set(keys)
+        keys_to_visit = list(keys)
+        while keys_to_visit:
+            key = keys_to_visit.pop()
+            dependents = set()  # type: Set[str]
+            for container_dependents in instance_dependents:
+                dependents.update(container_dependents.get(key, ()))
+            definition = self.getSettingDefinition(key)
+            if definition is not None:
+                dependents.update(relation.target.key for relation in definition.relations if relation.type == RelationType.RequiredByTarget)
+            for dependent in dependents - affected_keys:
+                affected_keys.add(dependent)
+                keys_to_visit.append(dependent)
+
+        keyed_functions = [getattr(type(self), function_name) for function_name in self._keyed_cached_function_names]
+        CachedMemberFunctions.clearInstanceCacheEntries(self, affected_keys, keyed_functions)
+
+    # For each container in this stack that isn't a definition, the settings with a property that is a function of
+    # each setting, such as the formulas in a profile. The functions of the definitions are followed through their
+    # relations instead. None if they can't be found, because a container is a stack itself, doesn't list its keys or
+    # has an invalid function. These are only found again for a container when its generation changed.
+    def _getInstanceDependents(self) -> Optional[List[Dict[str, Set[str]]]]:
+        result = []  # type: List[Dict[str, Set[str]]]
+        found_all = True
+        container_dependents = {}  # type: Dict[int, Tuple[ContainerInterface, int, Optional[Dict[str, Set[str]]]]]
+        for container in self._containers:
+            if isinstance(container, DefinitionContainer):
+                continue
+            if isinstance(container, ContainerStack):
+                found_all = False
+                continue
+            generation = container.getGeneration() if hasattr(container, "getGeneration") else None
+            cached = self._container_dependents.get(id(container))
+            if generation is not None and cached is not None and cached[0] is container and cached[1] == generation:
+                dependents = cached[2]
+            else:
+                dependents = self._findDependents(container)
+            if generation is not None:
+                container_dependents[id(container)] = (container, generation, dependents)
+            if dependents is None:
+                found_all = False
+            else:
+                result.append(dependents)
+        self._container_dependents = container_dependents
+        return result if found_all else None
+
+    # For each setting, the settings in a container with a property that is a function of it. None if they can't be
+    # found.
+    @staticmethod
+    def _findDependents(container: ContainerInterface) -> Optional[Dict[str, Set[str]]]:
+        keys = container.getAllKeys()
+        if keys is None:
+            return None
+        dependents = {}  # type: Dict[str, Set[str]]
+        property_names = SettingDefinition.getPropertyNames(DefinitionPropertyType.Function)
+        for key in keys:
+            for property_name in property_names:
+                value = container.getProperty(key, property_name)
+                if not isinstance(value, SettingFunction):
+                    continue
+                if not value.isValid():
+                    return None
+                for used_key in value.getUsedSettingKeys():
+                    dependents.setdefault(used_key, set()).add(key)
+        return dependents
+
     # Perform the emission of the change signals that were collected in a previous step.
     def _emitCollectedPropertyChanges(self) -> None:
         for key, property_names in self._property_changes.items():
@@ -861,9 +1135,23 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
             for property_name in property_names:
                 self.propertyChanged.emit(key, property_name)
 
+        if self._property_changes:
+            self.propertiesChangedBatch.emit(self._property_changes)
+
         self._property_changes = {}
         self._emit_property_changed_queued = False
 
+    # Listen to the changes of a container in this stack.
+    def _connectContainerSignals(self, container: ContainerInterface) -> None:
+        container.propertyChanged.connect(self._collectPropertyChanges)
+        if isinstance(container, InstanceContainer):
+            container.propertiesChangedBatch.connect(self._collectPropertiesChanges)
+
+    def _disconnectContainerSignals(self, container: ContainerInterface) -> None:
+        container.propertyChanged.disconnect(self._collectPropertyChanges)
+        if isinstance(container, InstanceContainer):
+            container.propertiesChangedBatch.disconnect(self._collectPropertiesChanges)
+
     def __str__(self) -> str:
         return "<{class_name} '{id}' containers={containers}>".format(class_name=type(self).__name__, id = self.getId(),
                                                                       containers = self._containers)
@@ -876,6 +1164,101 @@ class ContainerStack(QObject, ContainerInterface, PluginObject):
         getattr(super(), "__del__", lambda s: None)(self)
 
 
+class _SharedPropertyBatch:
+    """The part of the property batches of sibling stacks that they have in common: the next stack.
+
+    It keeps the raw properties of the next stack, and the evaluated properties that are known to be the same for
+    all the siblings.
+    """
+
+    def __init__(self, stack: ContainerStack) -> None:
+        self._stack = stack
+        self._raw_values = {}  # type: Dict[Tuple[str, str], Any]
+        self.values = {}  # type: Dict[Tuple[str, str], Any]
+
+    def getRawProperties(self, key: str, property_names: List[str]) -> Dict[str, Any]:
+        missing = [property_name for property_name in property_names if (key, property_name) not in self._raw_values]
+        if missing:
+            for property_name, value in self._stack._getRawProperties(key, missing).items():
+                self._raw_values[(key, property_name)] = value
+        return {property_name: self._raw_values[(key, property_name)] for property_name in property_names}
+
+
+class _PropertyBatch:
+    """Evaluates properties of a stack for ContainerStack.getProperties(), remembering every evaluated property.
+
+    It acts as the value provider for the setting functions that are evaluated, so that the settings they refer to
+    are also taken from (and stored in) the batch.
+
+    If a shared batch is given, the properties that the stack doesn't have itself are taken from the shared batch
+    instead of from the next stack, and their evaluated values are shared with the siblings where possible.
+    """
+
+    def __init__(self, stack: ContainerStack, context: Optional[PropertyEvaluationContext], shared: Optional[_SharedPropertyBatch] = None) -> None:
+        self._stack = stack
+        self._context = context
+        self._shared = shared
+        self._results = {}  # type: Dict[Tuple[str, str], Any]
+        self._common = set()  # type: Set[Tuple[str, str]] # The results that are the same for all siblings.
+        self._evaluating = set()  # type: Set[Tuple[str, str]]
+
+    def getProperties(self, key: str, property_names: List[str]) -> Dict[str, Any]:
+        missing = [property_name for property_name in property_names if (key, property_name) not in self._results]
+        if missing:
+            if self._shared is None:
+                raw_values = self._stack._getRawProperties(key, missing, self._context)
+                for property_name in missing:
+                    self._results[(key, property_name)] = self._evaluate(raw_values[property_name])
+            else:
+                raw_values = self._stack._getRawProperties(key, missing, use_next = False)
+                not_found = [property_name for property_name in missing if raw_values[property_name] is None]
+                for property_name in missing:
+                    if raw_values[property_name] is not None:
+                        self._results[(key, property_name)] = self._evaluate(raw_values[property_name])
+                for property_name, value in self._shared.getRawProperties(key, not_found).items():
+                    self._results[(key, property_name)] = self._evaluateShared(key, property_name, value)
+        return {property_name: self._results[(key, property_name)] for property_name in property_names}
+
+    def getProperty(self, key: str, property_name: str, context: Optional[PropertyEvaluationContext] = None) -> Any:
+        return self.getProperties(key, [property_name])[property_name]
+
+    def _evaluate(self, value: Any) -> Any:
+        if not isinstance(value, SettingFunction):
+            return value
+        if self._context is None:
+            return value(self)
+        self._context.pushContainer(self._stack)
+        value = value(self._stack, self._context)
+        self._context.popContainer()
+        return value
+
+    def _evaluateShared(self, key: str, property_name: str, value: Any) -> Any:
+        """Evaluate a raw property that came from the next stack, sharing the result with the siblings if possible.
+
+        A setting function from the next stack gives the same result in all siblings if all the settings that it refers
+        to do so too.
+        """
+
+        shared = cast(_SharedPropertyBatch, self._shared)
+        if isinstance(value, SettingFunction):
+            if (key, property_name) in self._evaluating:  # Circular reference. Let the setting function deal with it.
+                return self._evaluate(value)
+            self._evaluating.add((key, property_name))
+            try:
+                used_values = value.getUsedValues()
+                for name in used_values:
+                    self.getProperty(name, "value")  # To find out whether it's common.
+            finally:
+                self._evaluating.discard((key, property_name))
+            if not all((name, "value") in self._common for name in used_values):
+                return self._evaluate(value)
+            if (key, property_name) not in shared.values:
+                shared.values[(key, property_name)] = self._evaluate(value)
+            value = shared.values[(key, property_name)]
+        self._common.add((key, property_name))
+        return value
+
+
 _containerRegistry = ContainerRegistryInterface()  # type: ContainerRegistryInterface
 
 
@@ -1,7 +1,7 @@
 # Copyright (c) 2021 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
-from typing import Tuple, List, Generator, Optional
+from typing import Dict, Iterable, Tuple, List, Generator, Optional
 from sqlite3 import Cursor
 
 from UM.Logger import Logger
@@ -30,6 +30,13 @@ class DatabaseMetadataContainerController:
             Logger.error("Could not execute, cursor not set")
             raise RuntimeError("Could not execute, cursor not set")
 
+    def _executeMany(self, query: str, parameters: Iterable) -> Cursor:
+        if self.cursor:
+            return self.cursor.executemany(query, parameters)
+        else:
+            Logger.error("Could not execute, cursor not set")
+            raise RuntimeError("Could not execute, cursor not set")
+
     def setupTable(self, cursor: Cursor) -> None:
         """Creates the table in the DB.
 
@@ -59,6 +66,26 @@ class DatabaseMetadataContainerController:
         """Removes a container from the DB."""
         self._execute(self._queries.delete, (container_id,))
 
+    def insertMany(self, metadata_list: List[metadata_type]) -> None:
+        """Insert several containers in the DB with a single statement.
+
+        param metadata_list: The metadata of the containers to insert
+        """
+        if metadata_list:
+            self._executeMany(self._queries.insert, [list(self.groomMetadata(metadata).values()) for metadata in metadata_list])
+
+    def updateMany(self, metadata_list: List[metadata_type]) -> None:
+        """Updates several containers in the DB with a single statement.
+
+        param metadata_list: The metadata of the containers to update
+        """
+        if metadata_list:
+            self._executeMany(self._queries.update, [list(self.groomMetadata(metadata).values()) + [metadata["id"]] for metadata in metadata_list])
+
+    def deleteMany(self, container_ids: Iterable[str]) -> None:
+        """Removes several containers from the DB with a single statement."""
+        self._executeMany(self._queries.delete, [(container_id,) for container_id in container_ids])
+
     def keys(self) -> Generator:
         """Yields all the metadata keys. These consist of the DB fields and `container_type` and `type`"""
         for key in self._queries.fields.keys():
@@ -96,6 +123,19 @@ class DatabaseMetadataContainerController:
         metadata = {k: v for k, v in self.items(container_id)}
         return metadata
 
+    def getAllMetadata(self) -> Dict[str, metadata_type]:
+        """Return the metadata of all containers in the DB table, with a single query.
+
+        :return The container metadata, by container_id
+        """
+        keys = list(self.keys())
+        extra_values = [self._container_type, self._queries.table]
+        all_metadata = {}
+        for row in self._execute(self._queries.select_all).fetchall():
+            metadata = dict(zip(keys, list(row) + extra_values))
+            all_metadata[metadata["id"]] = metadata
+        return all_metadata
+
     def groomMetadata(self, metadata: metadata_type) -> metadata_type:
         """
         Ensures that the metadata is in the order of the field keys and has the right size.
@@ -4,6 +4,8 @@
 import json
 import collections
 import copy
+import os
+from threading import Lock
 
 from PyQt6.QtCore import QObject, pyqtProperty
 from PyQt6.QtQml import QQmlEngine
@@ -17,12 +19,13 @@ from UM.Settings.Interfaces import DefinitionContainerInterface
 from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext
 from UM.Settings.SettingDefinition import SettingDefinition
 from UM.Settings.SettingDefinition import DefinitionPropertyType
+from UM.Settings.SettingDefinitionSource import DictSettingDefinitionSource, SettingDefinitionSource
 from UM.Settings.SettingRelation import SettingRelation
 from UM.Settings.SettingRelation import RelationType
 from UM.Settings.SettingFunction import SettingFunction
 from UM.Signal import Signal
 
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Deque, Dict, Any, List, Optional, Set, Tuple
 
 class InvalidDefinitionError(Exception):
     pass
@@ -69,6 +72,18 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         self._definition_cache = {}                # type: Dict[str, SettingDefinition]
         self._path = ""
 
+        # For each property of each setting, the properties of other settings that need to be updated when it changes.
+        # Built when deserialising and pickled along with the definitions, so that the cached definitions have it too.
+        self._relation_closure = None              # type: Optional[Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]]
+        # If the relation closure was only computed for some settings, the keys of those settings.
+        self._relation_closure_keys = None         # type: Optional[Set[str]]
+
+        # If set, the setting definitions are created from this source when they are first needed. See setDefinitionSource.
+        self._definition_source = None             # type: Optional[SettingDefinitionSource]
+        # For each setting, the properties of other settings that depend on it directly. Used to create the relations
+        # of the settings that were created from a source, when they are needed.
+        self._dependents = None                    # type: Optional[Dict[str, List[Tuple[str, str]]]]
+
     def __setattr__(self, name: str, value: Any) -> None:
         """Reimplement __setattr__ so we can make sure the definition remains unchanged after creation."""
 
@@ -83,6 +98,9 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
     def __getstate__(self) -> Dict[str, Any]:
         """For pickle support"""
 
+        if self._definition_source is not None or self._dependents is not None:  # Created from a source. Pickle all settings, with their relations.
+            for definition in self.findDefinitions():
+                definition.relations  # Creates the relations that weren't created yet.
         return self.__dict__
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
@@ -92,6 +110,10 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         # pickle doesn't do that so we have to do this here.
         QObject.__init__(self, parent = None)
         self.__dict__.update(state)
+        self.__dict__.setdefault("_relation_closure", None)  # Pickled before the relation closure existed. Rebuild it when needed.
+        self.__dict__.setdefault("_relation_closure_keys", None)
+        self.__dict__.setdefault("_definition_source", None)
+        self.__dict__.setdefault("_dependents", None)
 
     def getId(self) -> str:
         """:copydoc ContainerInterface::getId
@@ -154,8 +176,27 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
 
     @property
     def definitions(self) -> List[SettingDefinition]:
+        if self._definition_source is not None:
+            self._createAllDefinitions()
         return self._definitions
 
+    def setDefinitionSource(self, source: SettingDefinitionSource) -> None:
+        """Replace the setting definitions of this container by the settings of a source.
+
+        The SettingDefinition objects are not created right away. When a setting is requested by its key, only the
+        category that contains it is created from the source. The relations of each setting are created when they are
+        first requested too. Everything is created when the definitions are requested in any other way, or when
+        additional settings are appended.
+
+        :param source: The settings to create the definitions from.
+        """
+
+        self._definitions = []
+        self._definition_cache = {}
+        self._relation_closure = None
+        self._definition_source = source
+        self._dependents = None
+
     def getInheritedFiles(self) -> List[str]:
         """Gets all ancestors of this definition container.
 
@@ -176,6 +217,9 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         :return: A set of all keys of settings in this container.
         """
 
+        if self._definition_source is not None:
+            return self._definition_source.getAllKeys()
+
         keys = set()  # type: Set[str]
         for definition in self.definitions:
             keys |= definition.getAllKeys()
@@ -269,8 +313,9 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         parsed = json.loads(serialized, object_pairs_hook = collections.OrderedDict)
 
         if "inherits" in parsed:
+            # The parents are shared with other definitions, so the result is an overlay that must not be modified.
             inherited = self._resolveInheritance(parsed["inherits"])
-            parsed = self._mergeDicts(inherited, parsed, new_dict = False)
+            parsed = self._overlayDicts(inherited, parsed)
 
         self._verifyJson(parsed)
 
@@ -293,13 +338,17 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         # Pre-process the JSON data to include the overrides.
         is_valid = True
         if "overrides" in parsed:
+            paths = self._findPathsInDict(parsed["settings"], set(parsed["overrides"]))  # Search the settings only once for all of them.
             for key, value in parsed["overrides"].items():
-                setting = self._findInDict(parsed["settings"], key)
-                if setting is None:
+                path = paths.get(key)
+                if path is not None and not self._isPathInDict(parsed["settings"], path):  # An earlier override replaced part of the path.
+                    path = self._findPathInDict(parsed["settings"], key)
+                if path is None:
                     Logger.log("w", "Unable to override setting %s", key)
                     is_valid = False
                 else:
-                    setting.update(value)
+                    # The settings may be shared with the parent definitions, so replace the path to the setting instead of modifying it.
+                    parsed["settings"] = self._updateInDict(parsed["settings"], path, value)
 
         return is_valid
 
@@ -309,10 +358,11 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         Warning: this might not work when there are relationships higher up in the stack.
         """
 
-        if definition.key not in [d.key for d in self._definitions]:
+        if definition.key not in [d.key for d in self.definitions]:
             self._definitions.append(definition)
             self._definition_cache[definition.key] = definition
             self._updateRelations(definition)
+            self._relation_closure = None
 
     def deserialize(self, serialized: str, file_name: Optional[str] = None) -> str:
         """:copydoc ContainerInterface::deserialize
@@ -326,16 +376,21 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
 
         # Update properties with the data from the JSON
         old_id = self.getId() #The ID must be set via the constructor. Retain it.
-        self._metadata = parsed["metadata"]
+        self._metadata = collections.OrderedDict(parsed["metadata"])  # May be shared with the parent definitions.
         self._metadata["id"] = old_id
         self._metadata["name"] = parsed["name"]
         self._metadata["version"] = self.Version #Guaranteed to be equal to what's in the parsed data by the validation.
         self._metadata["container_type"] = DefinitionContainer
 
+        if self.__lazy_deserialization:
+            self.setDefinitionSource(DictSettingDefinitionSource(parsed["settings"]))
+            return serialized
+
         self._deserializeDefinitions(parsed["settings"])
 
         for definition in self._definitions:
             self._updateRelations(definition)
+        self._relation_closure = self._buildRelationClosure()
 
         return serialized
 
@@ -371,6 +426,9 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         :param additional_settings: A dictionary of category-name to categories, each containing setting-definitions.
         """
         try:
+            # The settings of a definition source can't be extended, so create all settings before adding to them.
+            self._createAllDefinitions()
+
             merge_with_existing_categories = {}
             create_new_categories = {}
 
@@ -392,6 +450,7 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
 
             for definition in added_definitions:
                 self._updateRelations(definition)
+            self._relation_closure = None
 
         except Exception as ex:
             Logger.error(f"Failed to append additional settings from external source because: {str(ex)}")
@@ -411,6 +470,10 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         """
 
         serialized = cls._updateSerialized(serialized) #Update to most recent version.
+        return [cls.completeParsedMetadata(metadata) for metadata in cls.parseMetadata(serialized, container_id)]
+
+    @classmethod
+    def parseMetadata(cls, serialized: str, container_id: str) -> List[Dict[str, Any]]:
         try:
             parsed = json.loads(serialized, object_pairs_hook = collections.OrderedDict) #TODO: Load only part of this JSON until we find the metadata. We need an external library for this though.
         except json.JSONDecodeError as e:
@@ -418,14 +481,7 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
             return []
         metadata = {} #type: Dict[str, Any]
         if "inherits" in parsed:
-            import UM.Settings.ContainerRegistry #To find the definitions we're inheriting from.
-            parent_metadata = UM.Settings.ContainerRegistry.ContainerRegistry.getInstance().findDefinitionContainersMetadata(id = parsed["inherits"])
-            if not parent_metadata:
-                Logger.log("e", "Could not load parent definition container {parent} of child {child}".format(parent = parsed["inherits"], child = container_id))
-                #Ignore the parent then.
-            else:
-                metadata.update(parent_metadata[0])
-                metadata["inherits"] = parsed["inherits"]
+            metadata["inherits"] = parsed["inherits"]  # The metadata of the parent is added by completeParsedMetadata.
 
         metadata["container_type"] = DefinitionContainer
         metadata["id"] = container_id
@@ -438,6 +494,24 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
             metadata.update(parsed["metadata"])
         return [metadata]
 
+    @classmethod
+    def completeParsedMetadata(cls, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the metadata of the parent definition to the metadata of a definition.
+
+        :param metadata: The metadata of the definition itself, as obtained from parseMetadata.
+        :return: The metadata including everything that is inherited from the parent.
+        """
+
+        if "inherits" not in metadata:
+            return metadata
+        import UM.Settings.ContainerRegistry #To find the definitions we're inheriting from.
+        parent_metadata = UM.Settings.ContainerRegistry.ContainerRegistry.getInstance().findDefinitionContainersMetadata(id = metadata["inherits"])
+        if not parent_metadata:
+            Logger.log("e", "Could not load parent definition container {parent} of child {child}".format(parent = metadata["inherits"], child = metadata["id"]))
+            #Ignore the parent then.
+            return {key: value for key, value in metadata.items() if key != "inherits"}
+        return {**parent_metadata[0], **metadata}
+
     def findDefinitions(self, **kwargs: Any) -> List[SettingDefinition]:
         """Find definitions matching certain criteria.
 
@@ -450,9 +524,16 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
             key = kwargs["key"]
             if key in self._definition_cache:
                 return [self._definition_cache[key]]
+            if self._definition_source is not None and "*" not in key:
+                # Only create the category of the setting. Creating it adds all of its settings to the cache.
+                category_key = self._definition_source.getCategoryOf(key)
+                if category_key is None:
+                    return []
+                self._createCategory(category_key)
+                return [self._definition_cache[key]]
 
         definitions = []
-        for definition in self._definitions:
+        for definition in self.definitions:
             definitions.extend(definition.findDefinitions(**kwargs))
 
         if len(kwargs) == 1 and "key" in kwargs:
@@ -462,33 +543,153 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
 
         return definitions
 
+    def getAffectedProperties(self, key: str, property_name: str) -> Tuple[Tuple[str, str], ...]:
+        """Get the properties of other settings that need to be updated when a property of a setting changes.
+
+        This follows the relations of the setting transitively: if a property of another setting is affected, the
+        properties that depend on that setting are affected too. The result is looked up in an index that is built
+        once for the whole container.
+
+        :param key: The key of the setting that changed.
+        :param property_name: The property of the setting that changed.
+        :return: The affected properties, as (setting key, property name) pairs, without the setting itself.
+        """
+
+        if self._relation_closure is None:
+            if self._definition_source is not None:
+                # Most of the settings are never changed, so only compute this for the settings that are.
+                self._relation_closure = {}
+                self._relation_closure_keys = set()
+            else:
+                self._relation_closure = self._buildRelationClosure()
+                self._relation_closure_keys = None
+        if self._relation_closure_keys is not None and key not in self._relation_closure_keys:
+            self._relation_closure.update(self._buildRelationClosureOf(key, self.getDependents()))
+            self._relation_closure_keys.add(key)
+        return self._relation_closure.get((key, property_name), ())
+
+    def getDependents(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Get which properties of other settings depend directly on each setting.
+
+        :return: For each setting key, (setting key, property name) pairs of the properties whose functions use the
+        setting.
+        """
+
+        if self._definition_source is not None:
+            if self._dependents is None:
+                self._dependents = self._definition_source.getDependents()
+            return self._dependents
+
+        dependents = {}  # type: Dict[str, List[Tuple[str, str]]]
+        for definition in self.findDefinitions():
+            for relation in definition.relations:
+                if relation.type == RelationType.RequiredByTarget:
+                    dependents.setdefault(definition.key, []).append((relation.target.key, relation.role))
+        return dependents
+
+    def createRelations(self, definition: SettingDefinition) -> List[SettingRelation]:
+        """Create the relations of a setting that was created from the definition source.
+
+        :param definition: A setting of this container, whose relations were discarded with resetRelations.
+        :return: The relations of the setting, as they would have been created when deserialising the container.
+        """
+
+        relations = []  # type: List[SettingRelation]
+        for property_name in SettingDefinition.getPropertyNames(DefinitionPropertyType.Function):
+            for setting in self._getSettingDependencies(definition, property_name):
+                other = self._getDefinition(setting)
+                if not other:
+                    other = SettingDefinition(setting)
+                relations.append(SettingRelation(definition, other, RelationType.RequiresTarget, property_name))
+
+        if self._dependents is None:
+            self._dependents = self._definition_source.getDependents()  # type: ignore  # Only settings from a source have their relations reset.
+        for setting, property_name in self._dependents.get(definition.key, []):
+            other = self._getDefinition(setting)
+            if other:
+                relations.append(SettingRelation(definition, other, RelationType.RequiredByTarget, property_name))
+        return relations
+
     @classmethod
     def getLoadingPriority(cls) -> int:
         return 0
 
-    # protected:
+    @classmethod
+    def setLazyDeserialization(cls, enabled: bool) -> None:
+        """Set whether deserialising a definition container creates its setting definitions right away.
 
-    # Load a file from disk, used to handle inheritance and includes
-    def _loadFile(self, file_name: str) -> Dict[str, Any]:
-        path = Resources.getPath(Resources.DefinitionContainers, file_name + ".def.json")
-        with open(path, encoding = "utf-8") as f:
-            contents = json.load(f, object_pairs_hook=collections.OrderedDict)
+        If lazy, the container keeps the parsed settings and only creates the setting definitions of a category when
+        a setting in it is first requested, see setDefinitionSource. Errors in the settings are then only found when
+        their category is created.
+
+        :param enabled: True to create the setting definitions when they are needed, False to create them all when
+        deserialising.
+        """
+
+        cls.__lazy_deserialization = enabled
 
-        self._inherited_files.append(path)
-        return contents
+    @classmethod
+    def isLazyDeserialization(cls) -> bool:
+        return cls.__lazy_deserialization
+
+    __lazy_deserialization = False
+
+    # protected:
 
-    # Recursively resolve loading inherited files
+    # Recursively resolve loading inherited files. The result is shared with other definitions, so it must not be modified.
     def _resolveInheritance(self, file_name: str) -> Dict[str, Any]:
-        json_dict = self._loadFile(file_name)
+        path = Resources.getPath(Resources.DefinitionContainers, file_name + ".def.json")
+        json_dict, inherited_files, _ = self._loadResolvedFile(path)
+        self._inherited_files.extend(inherited_files)
+        return json_dict
+
+    # Load a file from disk with everything that it inherits, or get it from the cache if it didn't change since then.
+    # Returns the resolved file, the files it was resolved from, from the file itself to the root, and their modification
+    # times.
+    def _loadResolvedFile(self, path: str) -> Tuple[Dict[str, Any], List[str], List[float]]:
+        with DefinitionContainer.__resolved_files_lock:
+            cached = DefinitionContainer.__resolved_files.get(path)
+        if cached is not None:
+            json_dict, inherited_files, modified_times = cached
+            try:
+                if all(os.path.getmtime(file_path) == modified_time for file_path, modified_time in zip(inherited_files, modified_times)):
+                    return cached
+            except OSError:  # A file was removed. Load it again to get the proper error.
+                pass
+
+        modified_time = os.path.getmtime(path)  # Before reading it, so that changes while reading are found next time.
+        with open(path, encoding = "utf-8") as f:
+            json_dict = json.load(f, object_pairs_hook = collections.OrderedDict)
+        inherited_files = [path]
+        modified_times = [modified_time]
 
         if "inherits" in json_dict:
-            # NOTE: Since load-file isn't cached, this will load base definitions multiple times!
-            inherited = self._resolveInheritance(json_dict["inherits"])
-            json_dict = self._mergeDicts(inherited, json_dict)
+            parent_path = Resources.getPath(Resources.DefinitionContainers, json_dict["inherits"] + ".def.json")
+            inherited, parent_files, parent_modified_times = self._loadResolvedFile(parent_path)
+            inherited_files += parent_files
+            modified_times += parent_modified_times
+            json_dict = self._overlayDicts(inherited, json_dict)
 
         self._verifyJson(json_dict)
 
-        return json_dict
+        with DefinitionContainer.__resolved_files_lock:
+            DefinitionContainer.__resolved_files[path] = (json_dict, inherited_files, modified_times)
+        return json_dict, inherited_files, modified_times
+
+    @classmethod
+    def clearResolvedFiles(cls) -> None:
+        """Forget the parsed definition files that are kept to resolve the inheritance of other definitions.
+
+        They are loaded again when they are inherited from next.
+        """
+
+        with cls.__resolved_files_lock:
+            cls.__resolved_files.clear()
+
+    # For each definition file that was inherited from: The file with everything it inherits, the paths of the files
+    # it was resolved from and their modification times.
+    __resolved_files = {}  # type: Dict[str, Tuple[Dict[str, Any], List[str], List[float]]]
+    __resolved_files_lock = Lock()
 
     # Verify that a loaded json matches our basic expectations.
     def _verifyJson(self, json_dict: Dict[str, Any]):
@@ -500,6 +701,50 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         if json_dict["version"] != self.Version:
             raise IncorrectDefinitionVersionError("Definition uses version {0} but expected version {1}".format(json_dict["version"], self.Version))
 
+    # Recursively find the path of keys to a dictionary that is stored with a certain key, like _findInDict.
+    def _findPathInDict(self, dictionary: Dict[str, Any], key: str) -> Optional[List[str]]:
+        if key in dictionary:
+            return [key] if isinstance(dictionary[key], dict) else None
+        for k, v in dictionary.items():
+            if isinstance(v, dict):
+                path = self._findPathInDict(v, key)
+                if path is not None:
+                    return [k] + path
+        return None
+
+    # Find the paths to several keys at once. Gives the same paths as _findPathInDict for each of the keys.
+    def _findPathsInDict(self, dictionary: Dict[str, Any], keys: Set[str], prefix: Optional[List[str]] = None, result: Optional[Dict[str, Optional[List[str]]]] = None) -> Dict[str, Optional[List[str]]]:
+        prefix = prefix if prefix is not None else []
+        result = result if result is not None else {}
+        for key in keys:
+            if key not in result and key in dictionary:
+                result[key] = prefix + [key] if isinstance(dictionary[key], dict) else None
+        if len(result) < len(keys):
+            for k, v in dictionary.items():
+                if isinstance(v, dict):
+                    self._findPathsInDict(v, keys, prefix + [k], result)
+                    if len(result) == len(keys):
+                        break
+        return result
+
+    def _isPathInDict(self, dictionary: Dict[str, Any], path: List[str]) -> bool:
+        for key in path:
+            if not isinstance(dictionary, dict) or key not in dictionary:
+                return False
+            dictionary = dictionary[key]
+        return isinstance(dictionary, dict)
+
+    # Get a copy of a dictionary in which the dictionary at the end of a path of keys is updated with new entries. Only
+    # the dictionaries along the path are copied, the rest is shared with the original.
+    def _updateInDict(self, dictionary: Dict[str, Any], path: List[str], entries: Dict[str, Any]) -> Dict[str, Any]:
+        result = collections.OrderedDict(dictionary)
+        if len(path) == 1:
+            result[path[0]] = collections.OrderedDict(result[path[0]])
+            result[path[0]].update(entries)
+        else:
+            result[path[0]] = self._updateInDict(result[path[0]], path[1:], entries)
+        return result
+
     # Recursively find a key in a dictionary
     def _findInDict(self, dictionary: Dict[str, Any], key: str) -> Any:
         if key in dictionary:
@@ -533,6 +778,25 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
 
         return result
 
+    def _overlayDicts(self, first: Dict[Any, Any], second: Dict[Any, Any]) -> Dict[Any, Any]:
+        """
+        Recursively merge a dictionary into another without modifying either of them, like _mergeDicts.
+
+        Instead of copying the first dictionary completely, the result shares all parts that the second dictionary
+        doesn't change with the first, so it must not be modified.
+        :param first: First dictionary to merge
+        :param second: Dictionary with the changes to the first dictionary
+        :return: Merged dict
+        """
+        result = collections.OrderedDict(first)
+        for key, value in second.items():
+            if key in result and isinstance(value, dict) and isinstance(result[key], dict):
+                result[key] = self._overlayDicts(result[key], value)
+            else:
+                result[key] = value
+
+        return result
+
     # Recursively update relations of settings
     def _updateRelations(self, definition: SettingDefinition) -> None:
         for property_name in SettingDefinition.getPropertyNames(DefinitionPropertyType.Function):
@@ -543,12 +807,26 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
 
     # Create relation objects for all settings used by a certain function
     def _processFunction(self, definition: SettingDefinition, property_name: str) -> None:
+        for setting in self._getSettingDependencies(definition, property_name):
+            other = self._getDefinition(setting)
+            if not other:
+                other = SettingDefinition(setting)
+
+            relation = SettingRelation(definition, other, RelationType.RequiresTarget, property_name)
+            definition.relations.append(relation)
+
+            relation = SettingRelation(other, definition, RelationType.RequiredByTarget, property_name)
+            other.relations.append(relation)
+
+    # Get the keys of the settings that a function property of a setting depends on, without the setting itself if
+    # the property is its value.
+    def _getSettingDependencies(self, definition: SettingDefinition, property_name: str) -> Set[str]:
         try:
             function = getattr(definition, property_name)
         except AttributeError:
-            return
+            return set()
 
-        settings_dependencies = set()
+        settings_dependencies = set()  # type: Set[str]
 
         if isinstance(function, SettingFunction):
             settings_dependencies.update(function.getUsedSettingKeys())
@@ -558,23 +836,74 @@ class DefinitionContainer(QObject, DefinitionContainerInterface, PluginObject):
         except AttributeError:
             pass
 
-        for setting in settings_dependencies:
-            # Prevent circular relations between the same setting and the same property
-            # Note that the only property used by SettingFunction is the "value" property, which
-            # is why this is hard coded here.
-            if setting == definition.key and property_name == "value":
-                Logger.log("w", "Found circular relation for property 'value' between {0} and {1}", definition.key, setting)
-                continue
-
-            other = self._getDefinition(setting)
-            if not other:
-                other = SettingDefinition(setting)
-
-            relation = SettingRelation(definition, other, RelationType.RequiresTarget, property_name)
-            definition.relations.append(relation)
+        # Prevent circular relations between the same setting and the same property
+        # Note that the only property used by SettingFunction is the "value" property, which
+        # is why this is hard coded here.
+        if definition.key in settings_dependencies and property_name == "value":
+            Logger.log("w", "Found circular relation for property 'value' between {0} and {1}", definition.key, definition.key)
+            settings_dependencies.discard(definition.key)
+
+        return settings_dependencies
+
+    # Compute for all properties of all settings which properties of other settings depend on them, directly or through
+    # other settings. The properties that depend on a property of a setting are collected by following its dependents
+    # for that property, and then all dependents of the settings that were reached, without passing the setting itself.
+    def _buildRelationClosure(self) -> Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]:
+        dependents = self.getDependents()
+        closure = {}  # type: Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]
+        for key in dependents:
+            closure.update(self._buildRelationClosureOf(key, dependents))
+        return closure
+
+    # Compute the part of the relation closure for the properties of one setting.
+    def _buildRelationClosureOf(self, key: str, dependents: Dict[str, List[Tuple[str, str]]]) -> Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]:
+        closure = {}  # type: Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]
+        direct_dependents = dependents.get(key, [])
+        roles = {role for _, role in direct_dependents}
+        for role in roles:
+            affected = {}  # type: Dict[Tuple[str, str], None]  # Used as an ordered set.
+            visited = {key}
+            to_visit = collections.deque()  # type: Deque[str]
+            for target, target_role in direct_dependents:
+                if target_role != role or target == key:
+                    continue
+                affected[(target, target_role)] = None
+                if target not in visited:
+                    visited.add(target)
+                    to_visit.append(target)
+
+            while to_visit:
+                for target, target_role in dependents.get(to_visit.popleft(), []):
+                    if target == key:
+                        continue
+                    affected[(target, target_role)] = None
+                    if target not in visited:
+                        visited.add(target)
+                        to_visit.append(target)
+
+            if affected:
+                closure[(key, role)] = tuple(affected)
+        return closure
+
+    # Create a category and all of its settings from the definition source.
+    def _createCategory(self, category_key: str) -> SettingDefinition:
+        category = SettingDefinition(category_key, self, None, self._i18n_catalog)
+        category.deserialize(self._definition_source.getCategoryDict(category_key))  # type: ignore
+        for definition in category.findDefinitions():
+            definition.resetRelations()  # The other settings in the relations may not have been created yet.
+            self._definition_cache[definition.key] = definition
+        return category
 
-            relation = SettingRelation(other, definition, RelationType.RequiredByTarget, property_name)
-            other.relations.append(relation)
+    # Create all categories that weren't created yet, after which the definition source is no longer needed.
+    def _createAllDefinitions(self) -> None:
+        source = self._definition_source
+        if source is None:
+            return
+        if self._dependents is None:
+            self._dependents = source.getDependents()  # Still needed for the relations that weren't created yet.
+        self._definitions = [self._definition_cache.get(key) or self._createCategory(key) for key in source.getCategoryKeys()]
+        self._definition_source = None
+        source.close()
 
     def _getDefinition(self, key: str) -> Optional[SettingDefinition]:
         definition = None
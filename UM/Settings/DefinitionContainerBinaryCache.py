@@ -0,0 +1,413 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+"""A binary file format to cache definition containers in, which can be read without creating all of their settings.
+
+The file consists of a header followed by these sections:
+- The string table: The offset of each string in the string data, followed by the string data, encoded as UTF-8.
+- The settings: One record per setting, in depth-first order, so that the descendants of each setting directly follow
+  it. Each record refers to the properties and dependents of the setting.
+- The properties: One record per property of each setting, with a tag telling how its value is stored.
+- The dependents: For each setting, the properties of other settings that depend on it directly.
+- The bytecode: The compiled setting functions, each preceded by its length.
+The metadata of the container itself is stored as a JSON string in the string table.
+
+The file is mapped in memory, and only the settings that are requested are read from it. The header contains the magic
+number of the Python bytecode, so that files written by a different version of Python are not used, and the size of the
+file. The parts of the file are only checked for damage when they are read: the setting records, their keys and the
+container JSON when the file is loaded, the properties of a setting when its dictionary is read, and the dependents when
+they are requested.
+"""
+
+import collections
+import importlib.util  # To get the version of the bytecode that the functions are compiled to.
+import json
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings.SettingDefinitionSource import SettingDefinitionSource
+from UM.Settings.SettingFunction import SettingFunction
+
+MAGIC = b"UMDC"
+FORMAT_VERSION = 2
+
+# Magic, format version, reserved, Python bytecode magic, file size, checksum of the settings with their keys and the
+# container JSON, checksum of the dependents, string offsets offset, string count, string data offset, settings offset,
+# settings count, properties offset, dependents offset, bytecode offset, string index of the container JSON.
+_HEADER = struct.Struct("<4sHH4sIIIIIIIIIIII")
+_STRING_OFFSET = struct.Struct("<I")
+_STRING_RANGE = struct.Struct("<II")
+# Key string, parent setting (-1 for categories), end of the descendants, first property, property count, first dependent,
+# dependent count, checksum of the properties.
+_SETTING = struct.Struct("<IiIIIIII")
+# Name string, value tag, and two fields whose meaning depends on the tag. The second field is read as a float for _FLOAT.
+_PROPERTY = struct.Struct("<IBxxxIq")
+_FLOAT_PROPERTY = struct.Struct("<IBxxxId")
+# Dependent setting, property string.
+_DEPENDENT = struct.Struct("<II")
+_BYTECODE_LENGTH = struct.Struct("<I")
+
+# How the value of a property is stored.
+_NONE = 0
+_BOOL = 1  # In the second field.
+_INT = 2  # In the second field.
+_FLOAT = 3  # In the second field.
+_STRING = 4  # The string index is in the first field.
+_JSON = 5  # The string index of the value as JSON is in the first field.
+_FUNCTION = 6  # The string index of the expression is in the first field, the offset of its bytecode in the second.
+_INVALID_FUNCTION = 7  # The string index of the expression is in the first field. Compiled when it is read, which logs the error.
+
+
+def writeBinaryCache(definition_container: DefinitionContainer, file_path: str) -> None:
+    """Store a definition container in the binary cache format.
+
+    :param definition_container: The container to store.
+    :param file_path: The file to write it to.
+    :raise ValueError: The container contains property values that can't be stored in this format.
+    :raise OSError: The file could not be written.
+    """
+
+    serialized = _BinaryCacheWriter(definition_container).write()
+    # Replace the file rather than overwriting it, since containers that were read from it may still have it mapped.
+    temporary_path = file_path + ".tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(serialized)
+    os.replace(temporary_path, file_path)
+
+
+def readBinaryCache(file_path: str) -> Optional[DefinitionContainer]:
+    """Load a definition container from the binary cache format.
+
+    The settings of the container are created from the file when they are needed, so the file stays mapped in memory
+    until all of them are created.
+
+    :param file_path: The file to read.
+    :return: The definition container, or None if the file was written in a different format or by a different version
+    of Python.
+    :raise ValueError: The file is damaged.
+    :raise OSError: The file could not be read.
+    """
+
+    with open(file_path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)  # Stays valid after closing the file.
+
+    try:
+        if len(data) < _HEADER.size:
+            raise ValueError("The file is too short to be a definition cache.")
+        header = _HEADER.unpack_from(data, 0)
+        if header[0] != MAGIC or header[1] != FORMAT_VERSION or header[3] != importlib.util.MAGIC_NUMBER:
+            data.close()
+            return None
+        if header[4] != len(data):
+            raise ValueError("The definition cache is damaged.")
+
+        source = _BinarySettingSource(data, header)
+        container_data = json.loads(source.getString(header[15]), object_pairs_hook = collections.OrderedDict)
+    except (ValueError, struct.error, UnicodeDecodeError, KeyError, IndexError) as e:
+        data.close()
+        raise ValueError("Invalid definition cache: {error}".format(error = str(e)))
+
+    container = DefinitionContainer(container_data["id"])
+    container._metadata = container_data["metadata"]
+    container._metadata["container_type"] = DefinitionContainer
+    container._inherited_files = container_data["inherited_files"]
+    container.setPath(container_data["path"])
+    container.setDefinitionSource(source)
+    return container
+
+
+def _getBytecodeBytes(data: Any, offset: int) -> bytes:
+    """Get the bytecode of a function at an offset, including its length."""
+
+    length = _BYTECODE_LENGTH.unpack_from(data, offset)[0]
+    return bytes(data[offset:offset + _BYTECODE_LENGTH.size + length])
+
+
+def _propertiesChecksum(properties: bytes, get_string: Callable[[int], bytes], get_bytecode: Callable[[int], bytes]) -> int:
+    """Get the checksum of the property records of a setting, together with the strings and bytecode they refer to.
+
+    :param properties: The property records.
+    :param get_string: Gets the UTF-8 encoded string with an index.
+    :param get_bytecode: Gets the bytecode at an offset in the bytecode section.
+    """
+
+    checksum = zlib.crc32(properties)
+    for name_index, tag, first, second in _PROPERTY.iter_unpack(properties):
+        checksum = zlib.crc32(get_string(name_index), checksum)
+        if tag in (_STRING, _JSON, _FUNCTION, _INVALID_FUNCTION):
+            checksum = zlib.crc32(get_string(first), checksum)
+        if tag == _FUNCTION:
+            checksum = zlib.crc32(get_bytecode(second), checksum)
+    return checksum
+
+
+class _StringTable:
+    """Collects the strings of a binary cache, storing each distinct string once."""
+
+    def __init__(self) -> None:
+        self._indices = {}  # type: Dict[str, int]
+        self._strings = []  # type: List[str]
+
+    def add(self, string: str) -> int:
+        index = self._indices.get(string)
+        if index is None:
+            index = len(self._indices)
+            self._indices[string] = index
+            self._strings.append(string)
+        return index
+
+    def getBytes(self, index: int) -> bytes:
+        return self._strings[index].encode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def serialize(self) -> Tuple[bytes, bytes]:
+        """Get the offsets of the strings and the string data."""
+
+        offsets = bytearray()
+        string_data = bytearray()
+        for string in self._indices:  # Dictionaries keep their insertion order, which is the order of the indices.
+            offsets += _STRING_OFFSET.pack(len(string_data))
+            string_data += string.encode("utf-8")
+        offsets += _STRING_OFFSET.pack(len(string_data))
+        return bytes(offsets), bytes(string_data)
+
+
+class _BinaryCacheWriter:
+    """Serialises a definition container to the binary cache format."""
+
+    def __init__(self, definition_container: DefinitionContainer) -> None:
+        self._container = definition_container
+        self._strings = _StringTable()
+        self._settings = []  # type: List[List[int]]
+        self._setting_indices = {}  # type: Dict[str, int]
+        self._properties = bytearray()
+        self._property_count = 0
+        self._bytecode = bytearray()
+
+    def write(self) -> bytes:
+        for definition in self._container.definitions:
+            self._addSetting(definition, -1)
+
+        dependents = bytearray()
+        dependent_count = 0
+        dependent_property_names = []  # type: List[str]
+        all_dependents = self._container.getDependents()
+        for key, index in self._setting_indices.items():
+            self._settings[index][5] = dependent_count
+            for dependent_key, property_name in all_dependents.get(key, []):
+                if dependent_key not in self._setting_indices:
+                    raise ValueError("Setting {key} depends on unknown setting {dependent}.".format(key = key, dependent = dependent_key))
+                dependents += _DEPENDENT.pack(self._setting_indices[dependent_key], self._strings.add(property_name))
+                dependent_property_names.append(property_name)
+                dependent_count += 1
+            self._settings[index][6] = dependent_count - self._settings[index][5]
+        dependents_checksum = zlib.crc32(dependents)
+        for property_name in dependent_property_names:
+            dependents_checksum = zlib.crc32(property_name.encode("utf-8"), dependents_checksum)
+
+        metadata = {key: value for key, value in self._container.getMetaData().items() if key != "container_type"}
+        try:
+            container_json = json.dumps({
+                "id": self._container.getId(),
+                "metadata": metadata,
+                "inherited_files": self._container.getInheritedFiles(),
+                "path": self._container.getPath()
+            })
+        except TypeError as e:
+            raise ValueError("The metadata of {container_id} can't be stored: {error}".format(container_id = self._container.getId(), error = str(e)))
+        container_string = self._strings.add(container_json)
+
+        settings = b"".join(_SETTING.pack(*record) for record in self._settings)
+        index_checksum = zlib.crc32(settings)
+        for record in self._settings:
+            index_checksum = zlib.crc32(self._strings.getBytes(record[0]), index_checksum)
+        index_checksum = zlib.crc32(container_json.encode("utf-8"), index_checksum)
+        string_offsets, string_data = self._strings.serialize()
+        sections = [string_offsets, string_data, settings, bytes(self._properties), bytes(dependents), bytes(self._bytecode)]
+        offsets = []
+        offset = _HEADER.size
+        for section in sections:
+            offsets.append(offset)
+            offset += len(section)
+        body = b"".join(sections)
+
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, importlib.util.MAGIC_NUMBER, offset, index_checksum, dependents_checksum,
+                              offsets[0], len(self._strings), offsets[1],
+                              offsets[2], len(self._settings),
+                              offsets[3], offsets[4], offsets[5],
+                              container_string)
+        return header + body
+
+    def _addSetting(self, definition: SettingDefinition, parent_index: int) -> None:
+        index = len(self._settings)
+        self._setting_indices[definition.key] = index
+        record = [self._strings.add(definition.key), parent_index, 0, self._property_count, 0, 0, 0, 0]
+        self._settings.append(record)
+
+        for name, value in definition.getPropertyValues().items():
+            self._addProperty(definition.key, name, value)
+        record[4] = self._property_count - record[3]
+        properties = bytes(self._properties[record[3] * _PROPERTY.size:])
+        record[7] = _propertiesChecksum(properties, self._strings.getBytes, lambda offset: _getBytecodeBytes(self._bytecode, offset))
+
+        for child in definition.children:
+            self._addSetting(child, index)
+        record[2] = len(self._settings)
+
+    def _addProperty(self, key: str, name: str, value: Any) -> None:
+        name_index = self._strings.add(name)
+        if value is None:
+            self._properties += _PROPERTY.pack(name_index, _NONE, 0, 0)
+        elif isinstance(value, bool):
+            self._properties += _PROPERTY.pack(name_index, _BOOL, 0, int(value))
+        elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+            self._properties += _PROPERTY.pack(name_index, _INT, 0, value)
+        elif isinstance(value, float):
+            self._properties += _FLOAT_PROPERTY.pack(name_index, _FLOAT, 0, value)
+        elif isinstance(value, str):
+            self._properties += _PROPERTY.pack(name_index, _STRING, self._strings.add(value), 0)
+        elif isinstance(value, SettingFunction):
+            expression_index = self._strings.add(str(value)[1:])  # Without the = sign.
+            bytecode = value.getBytecode()
+            if bytecode is None:
+                self._properties += _PROPERTY.pack(name_index, _INVALID_FUNCTION, expression_index, 0)
+            else:
+                self._properties += _PROPERTY.pack(name_index, _FUNCTION, expression_index, len(self._bytecode))
+                self._bytecode += _BYTECODE_LENGTH.pack(len(bytecode)) + bytecode
+        else:
+            try:
+                serialized = json.dumps(value)
+            except TypeError:
+                serialized = None
+            # Only store values that JSON restores to the same thing, e.g. no tuples.
+            if serialized is None or json.loads(serialized, object_pairs_hook = collections.OrderedDict) != value:
+                raise ValueError("Property {name} of setting {key} can't be stored: {value}".format(name = name, key = key, value = repr(value)))
+            self._properties += _PROPERTY.pack(name_index, _JSON, self._strings.add(serialized), 0)
+        self._property_count += 1
+
+
+class _BinarySettingSource(SettingDefinitionSource):
+    """Provides the settings of a definition container from a memory-mapped binary cache file."""
+
+    def __init__(self, data: mmap.mmap, header: Tuple[Any, ...]) -> None:
+        self._data = data
+        self._dependents_checksum = header[6]
+        self._string_offsets = header[7]
+        self._string_count = header[8]
+        self._string_data = header[9]
+        self._properties = header[12]
+        self._dependents = header[13]
+        self._bytecode = header[14]
+
+        # Only the small setting records are read up front, to find the settings by key.
+        settings_offset = header[10]
+        settings_end = settings_offset + header[11] * _SETTING.size
+        settings = data[settings_offset:settings_end]
+        self._settings = list(_SETTING.iter_unpack(settings))  # type: List[Tuple[int, ...]]
+        checksum = zlib.crc32(settings)
+        for record in self._settings:
+            checksum = zlib.crc32(self._getStringBytes(record[0]), checksum)
+        if zlib.crc32(self._getStringBytes(header[15]), checksum) != header[5]:
+            raise ValueError("The settings in the definition cache are damaged.")
+        self._keys = [self.getString(record[0]) for record in self._settings]
+        self._indices = {key: index for index, key in enumerate(self._keys)}
+
+    def getString(self, index: int) -> str:
+        return self._getStringBytes(index).decode("utf-8")
+
+    def _getStringBytes(self, index: int) -> bytes:
+        if not 0 <= index < self._string_count:
+            raise IndexError("String {index} is not in the string table.".format(index = index))
+        start, end = _STRING_RANGE.unpack_from(self._data, self._string_offsets + index * _STRING_OFFSET.size)
+        return self._data[self._string_data + start:self._string_data + end]
+
+    def getCategoryKeys(self) -> List[str]:
+        return [self._keys[index] for index, record in enumerate(self._settings) if record[1] < 0]
+
+    def getAllKeys(self) -> Set[str]:
+        return set(self._keys)
+
+    def getCategoryOf(self, key: str) -> Optional[str]:
+        index = self._indices.get(key)
+        if index is None:
+            return None
+        while self._settings[index][1] >= 0:
+            index = self._settings[index][1]
+        return self._keys[index]
+
+    def getCategoryDict(self, category_key: str) -> Dict[str, Any]:
+        return self._getSettingDict(self._indices[category_key])
+
+    def getDependents(self) -> Dict[str, List[Tuple[str, str]]]:
+        result = {}  # type: Dict[str, List[Tuple[str, str]]]
+        checksum = zlib.crc32(self._data[self._dependents:self._bytecode])
+        for index, record in enumerate(self._settings):
+            if record[6] == 0:
+                continue
+            start = self._dependents + record[5] * _DEPENDENT.size
+            end = start + record[6] * _DEPENDENT.size
+            dependents = []  # type: List[Tuple[str, str]]
+            for dependent, property_name in _DEPENDENT.iter_unpack(self._data[start:end]):
+                property_name_bytes = self._getStringBytes(property_name)
+                checksum = zlib.crc32(property_name_bytes, checksum)
+                dependents.append((self._keys[dependent], property_name_bytes.decode("utf-8")))
+            result[self._keys[index]] = dependents
+        if checksum != self._dependents_checksum:
+            raise ValueError("The dependents in the definition cache are damaged.")
+        return result
+
+    def close(self) -> None:
+        self._data.close()
+
+    def _getSettingDict(self, index: int) -> Dict[str, Any]:
+        _, _, end, property_start, property_count, _, _, checksum = self._settings[index]
+        start = self._properties + property_start * _PROPERTY.size
+        properties = self._data[start:start + property_count * _PROPERTY.size]
+        if _propertiesChecksum(properties, self._getStringBytes, lambda offset: _getBytecodeBytes(self._data, self._bytecode + offset)) != checksum:
+            raise ValueError("Setting {key} in the definition cache is damaged.".format(key = self._keys[index]))
+
+        result = collections.OrderedDict()  # type: Dict[str, Any]
+        for property_index in range(property_start, property_start + property_count):
+            name, value = self._getProperty(property_index)
+            result[name] = value
+
+        children = collections.OrderedDict()  # type: Dict[str, Any]
+        child = index + 1
+        while child < end:
+            children[self._keys[child]] = self._getSettingDict(child)
+            child = self._settings[child][2]  # Skip the descendants of this child.
+        if children:
+            result["children"] = children
+        return result
+
+    def _getProperty(self, index: int) -> Tuple[str, Any]:
+        offset = self._properties + index * _PROPERTY.size
+        name_index, tag, first, second = _PROPERTY.unpack_from(self._data, offset)
+        name = self.getString(name_index)
+        if tag == _NONE:
+            return name, None
+        if tag == _BOOL:
+            return name, bool(second)
+        if tag == _INT:
+            return name, second
+        if tag == _FLOAT:
+            return name, _FLOAT_PROPERTY.unpack_from(self._data, offset)[3]
+        if tag == _STRING:
+            return name, self.getString(first)
+        if tag == _JSON:
+            return name, json.loads(self.getString(first), object_pairs_hook = collections.OrderedDict)
+        if tag == _FUNCTION:
+            bytecode_offset = self._bytecode + second
+            length = _BYTECODE_LENGTH.unpack_from(self._data, bytecode_offset)[0]
+            bytecode_offset += _BYTECODE_LENGTH.size
+            return name, SettingFunction.fromBytecode(self.getString(first), self._data[bytecode_offset:bytecode_offset + length])
+        if tag == _INVALID_FUNCTION:
+            return name, SettingFunction(self.getString(first))
+        raise ValueError("Unknown type {tag} of property {name}.".format(tag = tag, name = name))
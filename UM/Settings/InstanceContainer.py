@@ -24,6 +24,7 @@ from UM.MimeTypeDatabase import MimeTypeDatabase, MimeType
 
 from UM.Settings.Interfaces import ContainerInterface, ContainerRegistryInterface
 from UM.Settings.SettingInstance import SettingInstance
+from UM.Settings.SettingValueSnapshot import nextGeneration
 import re
 
 class InvalidInstanceError(Exception):
@@ -80,6 +81,8 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
 
         self._cached_values = None  # type: Optional[Dict[str, Any]]
 
+        self._generation = nextGeneration()  # type: int
+
     def __hash__(self) -> int:
         # We need to re-implement the hash, because we defined the __eq__ operator.
         # According to some, returning the ID is technically not right, as objects with the same value should return
@@ -182,6 +185,7 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
         if not self._instances:
             CachedMemberFunctions.clearInstanceCache(self)
             self._cached_values = cached_values
+            self._generation = nextGeneration()
         else:
             Logger.log("w", "Unable set values to be lazy loaded when values are already loaded ")
 
@@ -300,6 +304,14 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
             self._dirty = True
             self.metaDataChanged.emit(self)
 
+    def getGeneration(self) -> int:
+        """Get the generation of this container.
+
+        The generation changes whenever the settings in this container change, see SettingValueSnapshot.
+        """
+
+        return self._generation
+
     def isDirty(self) -> bool:
         """Check if this container is dirty, that is, if it changed from deserialization."""
 
@@ -425,10 +437,21 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
         self._instances[key].setProperty(property_name, property_value, container, emit_signals = not set_from_cache)
 
         if not set_from_cache:
+            self._generation = nextGeneration()
             self.setDirty(True)
 
     propertyChanged = Signal()
 
+    propertiesChangedBatch = Signal()
+    """Emitted when properties of several settings in this container changed at once.
+
+    This is emitted instead of a propertyChanged signal per property when a change of a setting affects the properties
+    of other settings. So propertyChanged is only emitted for the properties of the setting that was changed itself;
+    listeners that need to know about the properties of its dependents as well must also connect to this signal.
+
+    :param changes: A dictionary of setting keys to the sets of names of properties of those settings that changed.
+    """
+
     def clear(self) -> None:
         """Remove all instances from this container."""
 
@@ -639,6 +662,7 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
             self._cached_values = dict(parser["values"])
 
         self._dirty = False
+        self._generation = nextGeneration()
 
         return serialized
 
@@ -656,6 +680,10 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
         """
 
         serialized = cls._updateSerialized(serialized)  # Update to most recent version.
+        return cls.parseMetadata(serialized, container_id)
+
+    @classmethod
+    def parseMetadata(cls, serialized: str, container_id: str) -> List[Dict[str, Any]]:
         parser = FastConfigParser(serialized)
 
         metadata = {
@@ -725,6 +753,7 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
             return
 
         CachedMemberFunctions.clearInstanceCache(self)
+        self._generation = nextGeneration()
 
         instance.propertyChanged.connect(self.propertyChanged)
         instance.propertyChanged.emit(key, "value")
@@ -741,6 +770,7 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
             return
 
         CachedMemberFunctions.clearInstanceCache(self)
+        self._generation = nextGeneration()
 
         instance = self._instances[key]
         del self._instances[key]
@@ -769,6 +799,7 @@ class InstanceContainer(QObject, ContainerInterface, PluginObject):
         """Update all instances from this container."""
 
         CachedMemberFunctions.clearInstanceCache(self)
+        self._generation = nextGeneration()
 
         self._instantiateCachedValues()
         for key, instance in self._instances.items():
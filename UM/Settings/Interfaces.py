@@ -160,6 +160,34 @@ class ContainerInterface:
         Logger.log("w", "Class {class_name} hasn't implemented deserializeMetadata!".format(class_name = cls.__name__))
         return []
 
+    @classmethod
+    def parseMetadata(cls, serialized: str, container_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get just the metadata from a string representation that is already at the most recent version.
+
+        Unlike deserializeMetadata, this may only use the string itself. It may not use the container registry or
+        the version upgrades, so that it can be called in a different process. Anything that needs other containers
+        must be done in completeParsedMetadata.
+
+        :param serialized: A string representing one or more containers, of the most recent version.
+        :param container_id: The ID of the (base) container is already known and provided here.
+
+        :return: A list of the metadata of all containers found in the document, or None if this type of container
+        can't get its metadata without the rest of the application.
+        """
+
+        return None
+
+    @classmethod
+    def completeParsedMetadata(cls, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Complete the metadata obtained from parseMetadata with the metadata of other containers, like parents.
+
+        :param metadata: The metadata of one of the containers, as obtained from parseMetadata.
+
+        :return: The complete metadata of that container.
+        """
+
+        return metadata
+
     @classmethod
     def _updateSerialized(cls, serialized: str, file_name: Optional[str] = None) -> str:
         """Updates the given serialized data to the latest version."""
@@ -0,0 +1,113 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import itertools
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+class MetadataIndex(dict):
+    """A dictionary of container metadata by container ID, which keeps indexes on some of the metadata entries.
+
+    For each indexed metadata key, the index tracks which containers have which value for that key. This allows
+    finding all containers with certain values without looking through the metadata of all containers. The indexes are
+    kept up to date whenever metadata is added, replaced or removed through the dictionary. If a metadata dictionary
+    is changed in-place, it needs to be stored again to update the indexes.
+
+    Values are indexed by their string representation, in the same way that ContainerQuery compares them.
+    """
+
+    # The metadata keys that are searched for most often, without being (nearly) unique.
+    default_indexed_keys = ("type", "definition", "base_file", "material", "variant")
+
+    def __init__(self, indexed_keys: Iterable[str] = default_indexed_keys) -> None:
+        """Creates an empty index.
+
+        :param indexed_keys: The metadata keys to keep an index for.
+        """
+
+        super().__init__()
+        self._postings = {key: {} for key in indexed_keys}  # type: Dict[str, Dict[str, Set[str]]]  # For each indexed key and value, the IDs of the containers that have it.
+        self._indexed_values = {}  # type: Dict[str, List[Tuple[str, str]]]  # For each container, the values it was indexed with, to remove them when it changes.
+        self._order = {}  # type: Dict[str, int]  # When each container was added, to return them in the same order as the dictionary would.
+        self._order_counter = itertools.count()
+
+    def isIndexed(self, key: str) -> bool:
+        return key in self._postings
+
+    def findIds(self, criteria: Mapping[str, str]) -> List[str]:
+        """Finds the containers that have all of the given metadata values.
+
+        :param criteria: For some of the indexed keys, the value that the containers must have.
+        :return: The IDs of the containers that have all of these values, in the order in which they were added.
+        """
+
+        postings = []  # type: List[Set[str]]
+        for key, value in criteria.items():
+            container_ids = self._postings[key].get(value)
+            if not container_ids:
+                return []
+            postings.append(container_ids)
+        if not postings:
+            return list(self.keys())
+        postings.sort(key = len)  # Start with the smallest set, so that the intersection is as cheap as possible.
+        return sorted(postings[0].intersection(*postings[1:]), key = self._order.__getitem__)
+
+    def __setitem__(self, container_id: str, metadata: Dict[str, Any]) -> None:
+        self._unindex(container_id)
+        if container_id not in self._order:
+            self._order[container_id] = next(self._order_counter)
+        super().__setitem__(container_id, metadata)
+        self._index(container_id, metadata)
+
+    def __delitem__(self, container_id: str) -> None:
+        super().__delitem__(container_id)
+        self._unindex(container_id)
+        del self._order[container_id]
+
+    def __ior__(self, other: Any) -> "MetadataIndex":
+        self.update(other)
+        return self
+
+    def pop(self, container_id: str, *args: Any) -> Any:
+        if container_id not in self:
+            return super().pop(container_id, *args)  # Raises KeyError if no default is given.
+        metadata = self[container_id]
+        del self[container_id]
+        return metadata
+
+    def popitem(self) -> Tuple[str, Dict[str, Any]]:
+        container_id, metadata = super().popitem()
+        self._unindex(container_id)
+        del self._order[container_id]
+        return container_id, metadata
+
+    def setdefault(self, container_id: str, default: Optional[Dict[str, Any]] = None) -> Any:
+        if container_id not in self:
+            self[container_id] = default
+        return self[container_id]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for container_id, metadata in dict(*args, **kwargs).items():
+            self[container_id] = metadata
+
+    def clear(self) -> None:
+        super().clear()
+        for postings in self._postings.values():
+            postings.clear()
+        self._indexed_values.clear()
+        self._order.clear()
+
+    def _index(self, container_id: str, metadata: Optional[Dict[str, Any]]) -> None:
+        if not metadata:
+            return
+        indexed_values = [(key, str(metadata[key])) for key in self._postings if key in metadata]
+        for key, value in indexed_values:
+            self._postings[key].setdefault(value, set()).add(container_id)
+        self._indexed_values[container_id] = indexed_values
+
+    def _unindex(self, container_id: str) -> None:
+        for key, value in self._indexed_values.pop(container_id, ()):
+            container_ids = self._postings[key][value]
+            container_ids.discard(container_id)
+            if not container_ids:
+                del self._postings[key][value]
@@ -9,6 +9,7 @@ from UM.Settings.SettingFunction import SettingFunction
 from UM.Settings.ContainerRegistry import ContainerRegistry
 from UM.Settings.SettingDefinition import SettingDefinition
 from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.InstanceContainer import InstanceContainer
 
 
 class ContainerPropertyProvider(QObject):
@@ -37,6 +38,8 @@ class ContainerPropertyProvider(QObject):
 
         if self._container:
             self._container.propertyChanged.disconnect(self._onPropertyChanged)
+            if isinstance(self._container, InstanceContainer):
+                self._container.propertiesChangedBatch.disconnect(self._onPropertiesChangedBatch)
 
         if self._container_id:
             containers = ContainerRegistry.getInstance().findContainers(id = self._container_id)
@@ -45,6 +48,8 @@ class ContainerPropertyProvider(QObject):
 
             if self._container:
                 self._container.propertyChanged.connect(self._onPropertyChanged)
+                if isinstance(self._container, InstanceContainer):
+                    self._container.propertiesChangedBatch.connect(self._onPropertiesChangedBatch)
         else:
             self._container = None
 
@@ -139,6 +144,10 @@ class ContainerPropertyProvider(QObject):
             self._property_values[property_name] = value
             self.propertiesChanged.emit()
 
+    def _onPropertiesChangedBatch(self, changes):
+        for property_name in changes.get(self._key, ()):
+            self._onPropertyChanged(self._key, property_name)
+
     def _update(self, container = None):
         if not self._container or not self._watched_properties or not self._key:
             return
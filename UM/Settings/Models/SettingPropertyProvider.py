@@ -1,7 +1,7 @@
 # Copyright (c) 2024 UltiMaker
 # Uranium is released under the terms of the LGPLv3 or higher.
 
-from typing import Optional, List, Set, Any, OrderedDict
+from typing import Optional, Dict, List, Set, Any, OrderedDict
 
 from PyQt6.QtCore import QObject, QTimer, pyqtProperty, pyqtSignal
 from PyQt6.QtQml import QQmlPropertyMap
@@ -61,13 +61,13 @@ class SettingPropertyProvider(QObject):
         CachedMemberFunctions.clearInstanceCache(self)
 
         if self._stack:
-            self._stack.propertiesChanged.disconnect(self._onPropertiesChanged)
+            self._stack.propertiesChangedBatch.disconnect(self._onPropertiesChangedBatch)
             self._stack.containersChanged.disconnect(self._containersChanged)
 
         self._stack = stack
 
         if self._stack:
-            self._stack.propertiesChanged.connect(self._onPropertiesChanged)
+            self._stack.propertiesChangedBatch.connect(self._onPropertiesChangedBatch)
             self._stack.containersChanged.connect(self._containersChanged)
 
         self._validator = None
@@ -333,19 +333,24 @@ class SettingPropertyProvider(QObject):
         return self._value_used
 
     def _onPropertiesChanged(self, key: str, property_names: List[str]) -> None:
+        self._onPropertiesChangedBatch({key: set(property_names)})
+
+    def _onPropertiesChangedBatch(self, changes: Dict[str, Set[str]]) -> None:
         CachedMemberFunctions.clearInstanceCache(self)
 
-        if key != self._key:
-            if key in self._relations:
-                self._value_used = None
-                try:
-                    self.isValueUsedChanged.emit()
-                except RuntimeError:
-                    # QtObject has been destroyed, no need to handle the signals anymore.
-                    # This can happen when the QtObject in C++ has been destroyed, but the python object hasn't quite
-                    # caught on yet. Once we call any signals, it will cause a runtimeError since all the underlying
-                    # logic to emit pyqtSignals is gone.
-                    return
+        if any(key in self._relations for key in changes if key != self._key):
+            self._value_used = None
+            try:
+                self.isValueUsedChanged.emit()
+            except RuntimeError:
+                # QtObject has been destroyed, no need to handle the signals anymore.
+                # This can happen when the QtObject in C++ has been destroyed, but the python object hasn't quite
+                # caught on yet. Once we call any signals, it will cause a runtimeError since all the underlying
+                # logic to emit pyqtSignals is gone.
+                return
+
+        property_names = changes.get(self._key)
+        if property_names is None:
             return
 
         has_values_changed = False
@@ -0,0 +1,101 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type
+
+from UM.Logger import Logger
+from UM.Settings.Interfaces import ContainerInterface
+
+# A file to extract the metadata from: The class of the container, the path to the file and the ID of the container.
+ExtractionJob = Tuple[Type[ContainerInterface], str, str]
+
+# The versions that files don't need to be upgraded from, in the worker processes.
+_current_versions = frozenset()  # type: FrozenSet[Tuple[str, int]]
+
+
+class ParallelMetadataExtractor:
+    """Gets the metadata of many container files at once, by parsing them in several processes.
+
+    Only the parsing is done in the other processes. Files that need to be upgraded first and files that fail to
+    parse are left out of the result, so that they can be loaded normally, with the usual error handling.
+    """
+
+    minimum_jobs = 100  # Starting the processes takes about a second, so it's not worth it for fewer files.
+
+    def __init__(self, workers: int) -> None:
+        """Creates the extractor.
+
+        :param workers: How many processes to parse the files with.
+        """
+
+        self._workers = workers
+
+    @staticmethod
+    def canExtract(container_class: Type[ContainerInterface]) -> bool:
+        """Returns whether the metadata of a type of container can be parsed in a different process.
+
+        That is only possible if the class gets its metadata through parseMetadata. If a subclass overrides how the
+        metadata is deserialized without overriding parseMetadata as well, it needs to be loaded normally.
+        """
+
+        parse_class = _getDefiningClass(container_class, "parseMetadata")
+        if parse_class is None or parse_class is ContainerInterface:  # The default implementation doesn't parse anything.
+            return False
+        for function_name in ("deserializeMetadata", "getConfigurationTypeFromSerialized", "getVersionFromSerialized"):
+            if _getDefiningClass(container_class, function_name) not in parse_class.__mro__:
+                return False
+        return True
+
+    def extract(self, jobs: List[ExtractionJob]) -> Dict[str, List[Dict[str, Any]]]:
+        """Parses the metadata of the given files.
+
+        :param jobs: The files to parse. Their container classes must be able to be extracted, see canExtract.
+        :return: For each container ID, the metadata obtained from the file with parseMetadata. The metadata still
+        needs to be completed with completeParsedMetadata. Containers that couldn't be parsed are missing.
+        """
+
+        if self._workers < 1 or len(jobs) < self.minimum_jobs:
+            return {}
+
+        from UM.VersionUpgradeManager import VersionUpgradeManager
+        current_versions = frozenset(VersionUpgradeManager.getInstance().getCurrentVersions().keys())
+
+        result = {}  # type: Dict[str, List[Dict[str, Any]]]
+        chunk_size = max(1, len(jobs) // (self._workers * 4))  # Send the jobs in chunks to reduce the overhead, but still balance the load.
+        try:
+            # Spawn new processes rather than forking, since forking a process with running threads is not safe.
+            with ProcessPoolExecutor(max_workers = self._workers, mp_context = multiprocessing.get_context("spawn"), initializer = _initializeWorker, initargs = (current_versions, )) as executor:
+                for job, metadata in zip(jobs, executor.map(_extractMetadata, jobs, chunksize = chunk_size)):
+                    if metadata is not None:
+                        result[job[2]] = metadata
+        except Exception as e:  # The processes couldn't be started or crashed. The rest will just be loaded normally.
+            Logger.warning(f"Parallel extraction of container metadata failed after {len(result)} of {len(jobs)} containers: {e}")
+        return result
+
+
+def _getDefiningClass(container_class: type, attribute_name: str) -> Optional[type]:
+    for base in container_class.__mro__:
+        if attribute_name in base.__dict__:
+            return base
+    return None
+
+
+def _initializeWorker(current_versions: FrozenSet[Tuple[str, int]]) -> None:
+    global _current_versions
+    _current_versions = current_versions
+
+
+def _extractMetadata(job: ExtractionJob) -> Optional[List[Dict[str, Any]]]:
+    container_class, file_path, container_id = job
+    try:
+        with open(file_path, "r", encoding = "utf-8") as f:
+            serialized = f.read()
+        configuration_type = container_class.getConfigurationTypeFromSerialized(serialized)
+        version = container_class.getVersionFromSerialized(serialized)
+        if configuration_type is not None and version is not None and (configuration_type, version) not in _current_versions:
+            return None  # Needs to be upgraded, which requires the upgrade plug-ins of the application.
+        return container_class.parseMetadata(serialized, container_id)
+    except Exception:  # The error is reported when the file gets loaded normally.
+        return None
@@ -13,6 +13,9 @@ class PropertyEvaluationContext:
     """
 
 
+    # The context changes during an evaluation, so the results of cached functions must not be keyed on it.
+    __hash__ = None  # type: ignore
+
     def __init__(self, source_stack = None):
         self.stack_of_containers = deque()
         if source_stack is not None:
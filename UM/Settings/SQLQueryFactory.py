@@ -16,6 +16,7 @@ class SQLQueryFactory:
         self.__insert = ""
         self.__update = ""
         self.__select = ""
+        self.__select_all = ""
         self.__delete = ""
         self._update_queries()
 
@@ -59,6 +60,11 @@ class SQLQueryFactory:
         """Select SQL query """
         return self.__select
 
+    @property
+    def select_all(self) -> str:
+        """Select SQL query for all rows"""
+        return self.__select_all
+
     @property
     def delete(self) -> str:
         """Delete SQL query """
@@ -73,4 +79,5 @@ class SQLQueryFactory:
         columns_update = ", ".join([f"{k} = ?" for k in self.fields.keys()])
         self.__update = f"UPDATE {self.table} SET {columns_update} WHERE id = ?"
         self.__select = f"SELECT * FROM {self.table} WHERE id = ?"
+        self.__select_all = f"SELECT * FROM {self.table}"
         self.__delete = f"DELETE FROM {self.table} WHERE id = ?"
@@ -236,8 +236,18 @@ class SettingDefinition:
         :return: :type{list<SettingRelation>}
         """
 
+        if self._relations is None:  # Discarded by resetRelations, so the container creates them when they're needed.
+            self._relations = self._container.createRelations(self)  # type: ignore
         return self._relations
 
+    def resetRelations(self) -> None:
+        """Discard the relations of this setting, so that they get created when they are needed next.
+
+        The container of this setting must be able to create them, see DefinitionContainer.createRelations.
+        """
+
+        self._relations = None  # type: ignore
+
     @cache_per_instance
     def relationsAsFrozenSet(self) -> frozenset["SettingRelation"]:
         """A frozen set of SettingRelation objects of this setting.
@@ -288,6 +298,14 @@ class SettingDefinition:
 
         return result
 
+    def getPropertyValues(self) -> Dict[str, Any]:
+        """Get the properties that are specified for this setting, without the default values of the other properties.
+
+        :return: :type{dict} The values of the properties by property name. This must not be modified.
+        """
+
+        return self.__property_values
+
     def deserialize(self, serialized: Union[str, Dict[str, Any]]) -> None:
         """Deserialize this setting from a string or dict.
 
@@ -714,10 +732,10 @@ class SettingDefinition:
                 if value not in self.__type_definitions:
                     raise ValueError(f"Type {value} is not a correct setting type.")
 
-            if key == "options" and not isinstance(value, collections.OrderedDict):
+            if key == "options":
                 if not isinstance(value, dict):
                     raise ValueError(f"Type {value} is not a correct value for an enum-definition.")
-                value = collections.OrderedDict(value)
+                value = collections.OrderedDict(value)  # Always a copy, since the options can be extended, and the parsed definition can be shared.
 
             if self.__property_definitions[key]["type"] == DefinitionPropertyType.Any:
                 self.__property_values[key] = value
@@ -726,7 +744,7 @@ class SettingDefinition:
             elif self.__property_definitions[key]["type"] == DefinitionPropertyType.TranslatedString:
                 self.__property_values[key] = self._i18n_catalog.i18n(str(value)) if self._i18n_catalog is not None else value
             elif self.__property_definitions[key]["type"] == DefinitionPropertyType.Function:
-                self.__property_values[key] = SettingFunction.SettingFunction(str(value))
+                self.__property_values[key] = value if isinstance(value, SettingFunction.SettingFunction) else SettingFunction.SettingFunction(str(value))
             else:
                 Logger.log("w", f"Unknown DefinitionPropertyType ({key}) for key {self.__property_definitions[key]['type']}")
 
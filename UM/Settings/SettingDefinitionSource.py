@@ -0,0 +1,135 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import collections
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from UM.Settings.SettingDefinition import DefinitionPropertyType, SettingDefinition
+from UM.Settings.SettingFunction import SettingFunction
+
+
+class SettingDefinitionSource:
+    """Provides the settings of a definition container without creating SettingDefinition objects for them.
+
+    A definition container with a source only creates the SettingDefinition objects of a category when a setting in
+    that category is first needed, see DefinitionContainer.setDefinitionSource. Most settings of a definition are never
+    looked at during a session, so this saves creating them.
+    """
+
+    def getCategoryKeys(self) -> List[str]:
+        """Get the keys of the top-level settings, in the order in which they are defined."""
+
+        raise NotImplementedError()
+
+    def getAllKeys(self) -> Set[str]:
+        """Get the keys of all settings, including the top-level settings."""
+
+        raise NotImplementedError()
+
+    def getCategoryOf(self, key: str) -> Optional[str]:
+        """Get the key of the top-level setting that contains a setting.
+
+        :param key: The key of the setting to find.
+        :return: The key of its top-level ancestor, the key itself if it is a top-level setting, or None if there is no
+        setting with that key.
+        """
+
+        raise NotImplementedError()
+
+    def getCategoryDict(self, category_key: str) -> Dict[str, Any]:
+        """Get a top-level setting and all of its descendants, in the format that SettingDefinition.deserialize takes.
+
+        :param category_key: The key of the top-level setting.
+        """
+
+        raise NotImplementedError()
+
+    def getDependents(self) -> Dict[str, List[Tuple[str, str]]]:
+        """For each setting, the properties of other settings that depend on it directly.
+
+        :return: For each setting key, (setting key, property name) pairs of the properties that use the setting.
+        """
+
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """Release the resources of this source. Called when all settings have been created."""
+
+        pass
+
+
+class DictSettingDefinitionSource(SettingDefinitionSource):
+    """Provides the settings of a definition container from the settings dictionary of its parsed JSON document."""
+
+    def __init__(self, settings: Dict[str, Any]) -> None:
+        """Create a source for the settings of a definition.
+
+        :param settings: The "settings" of the parsed definition, with inheritance and overrides applied. This is not
+        modified, but it must not be modified by others either.
+        """
+
+        self._settings = settings
+        self._categories = None  # type: Optional[Dict[str, str]]  # The key of the top-level setting of each setting.
+        self._functions = None  # type: Optional[Dict[Tuple[str, str], SettingFunction]]  # Each function property, once they're compiled.
+
+    def getCategoryKeys(self) -> List[str]:
+        return list(self._settings.keys())
+
+    def getAllKeys(self) -> Set[str]:
+        return set(self._getCategories().keys())
+
+    def getCategoryOf(self, key: str) -> Optional[str]:
+        return self._getCategories().get(key)
+
+    def getCategoryDict(self, category_key: str) -> Dict[str, Any]:
+        if self._functions is None:
+            return self._settings[category_key]
+        return self._withFunctions(category_key, self._settings[category_key])  # Don't compile the functions again.
+
+    def getDependents(self) -> Dict[str, List[Tuple[str, str]]]:
+        # The functions need to be compiled to know which settings they use.
+        if self._functions is None:
+            self._functions = {}
+            for key, setting in self._iterateSettings(self._settings):
+                for property_name in SettingDefinition.getPropertyNames(DefinitionPropertyType.Function):
+                    if property_name in setting:
+                        self._functions[(key, property_name)] = SettingFunction(str(setting[property_name]))
+
+        all_keys = self._getCategories()
+        dependents = {}  # type: Dict[str, List[Tuple[str, str]]]
+        for key, setting in self._iterateSettings(self._settings):
+            for property_name in SettingDefinition.getPropertyNames(DefinitionPropertyType.Function):
+                # The same dependencies as DefinitionContainer._getSettingDependencies finds.
+                used_settings = set(setting.get("force_depends_on_settings", []))
+                function = self._functions.get((key, property_name))
+                if function is not None:
+                    used_settings.update(function.getUsedSettingKeys())
+                if property_name == "value":
+                    used_settings.discard(key)
+                for used_setting in used_settings & all_keys.keys():
+                    dependents.setdefault(used_setting, []).append((key, property_name))
+        return dependents
+
+    def _getCategories(self) -> Dict[str, str]:
+        if self._categories is None:
+            self._categories = {}
+            for category_key, category in self._settings.items():
+                self._categories[category_key] = category_key
+                for key, _ in self._iterateSettings(category.get("children", {})):
+                    self._categories[key] = category_key
+        return self._categories
+
+    def _iterateSettings(self, settings: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for key, setting in settings.items():
+            yield key, setting
+            yield from self._iterateSettings(setting.get("children", {}))
+
+    def _withFunctions(self, key: str, setting: Dict[str, Any]) -> Dict[str, Any]:
+        result = dict(setting)
+        for property_name in SettingDefinition.getPropertyNames(DefinitionPropertyType.Function):
+            function = self._functions.get((key, property_name))  # type: ignore
+            if function is not None:
+                result[property_name] = function
+        if "children" in setting:
+            result["children"] = collections.OrderedDict((child_key, self._withFunctions(child_key, child)) for child_key, child in setting["children"].items())
+        return result
@@ -0,0 +1,304 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from UM.FlameProfiler import _ProfileCallNode
+from UM.Logger import Logger
+
+# A profiler for the evaluation of settings. It records how often the properties of each setting are asked for, how
+# often they had to be evaluated because they weren't cached, how much time that took and which chains of settings
+# depend on each other the deepest. The evaluations can be exported in the same JSON format as UM.FlameProfiler, to
+# view them as a flame graph.
+#
+# Set the environment variable URANIUM_SETTING_PROFILER to something before starting the application to make the
+# profiling code available. Then call startRecording() and stopRecording() around the code to profile.
+
+
+def enabled() -> bool:
+    return "URANIUM_SETTING_PROFILER" in os.environ
+
+
+SettingEvaluationStatistics = NamedTuple("SettingEvaluationStatistics", [
+    ("calls", int),  # How often the property was asked for.
+    ("evaluations", int),  # How often it was not in the cache, so it had to be evaluated.
+    ("cache_hit_ratio", float),  # The fraction of the calls that were answered from the cache.
+    ("total_time", float),  # The time spent evaluating the property, in seconds, including settings it depends on.
+    ("own_time", float),  # The time spent evaluating the property, excluding other settings it depends on.
+    ("function_calls", int),  # How often a setting function of the property was called.
+    ("function_time", float)  # The time spent in those setting functions, including settings they depend on.
+])
+
+
+class _Statistics:
+    """Statistics that are being recorded for a property of a setting."""
+
+    __slots__ = ("calls", "evaluations", "total_time", "own_time", "function_calls", "function_time")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.evaluations = 0
+        self.total_time = 0.0
+        self.own_time = 0.0
+        self.function_calls = 0
+        self.function_time = 0.0
+
+
+class _CallTreeNode:
+    """A node in the tree of evaluations, which combines all evaluations with the same chain of callers."""
+
+    __slots__ = ("time", "children")
+
+    def __init__(self) -> None:
+        self.time = 0.0
+        self.children = {}  # type: Dict[str, _CallTreeNode]
+
+    def getChild(self, name: str) -> "_CallTreeNode":
+        child = self.children.get(name)
+        if child is None:
+            child = _CallTreeNode()
+            self.children[name] = child
+        return child
+
+
+class _Frame:
+    """An evaluation that is in progress."""
+
+    __slots__ = ("key", "name", "node", "start_time", "child_time")
+
+    def __init__(self, key: Optional[Tuple[str, str]], name: str, node: _CallTreeNode) -> None:
+        self.key = key  # The setting and property that are being evaluated, or None for a setting function.
+        self.name = name
+        self.node = node
+        self.start_time = time.perf_counter()
+        self.child_time = 0.0
+
+
+_recording = False
+_statistics = {}  # type: Dict[Tuple[str, str], _Statistics]
+_call_tree = _CallTreeNode()
+_frames = []  # type: List[_Frame]
+_deepest_chains = {}  # type: Dict[Tuple[Tuple[str, str], ...], None]  # Used as an ordered set.
+_max_deepest_chains = 10
+
+
+def startRecording() -> None:
+    """Start recording evaluations of settings. Earlier recordings are kept, until clear() is called."""
+
+    global _recording
+    if not enabled():
+        Logger.log("w", "Setting profiling is not available. Set URANIUM_SETTING_PROFILER to enable it.")
+        return
+    _recording = True
+
+
+def stopRecording() -> None:
+    """Stop recording evaluations of settings."""
+
+    global _recording
+    _recording = False
+
+
+def isRecording() -> bool:
+    """Return whether evaluations are being recorded right now.
+
+    Only evaluations on the main thread are recorded.
+    """
+
+    return _recording and threading.main_thread() is threading.current_thread()
+
+
+def clear() -> None:
+    """Erase all recorded data."""
+
+    global _statistics, _call_tree, _deepest_chains
+    _statistics = {}
+    _call_tree = _CallTreeNode()
+    _deepest_chains = {}
+
+
+def getStatistics() -> Dict[Tuple[str, str], SettingEvaluationStatistics]:
+    """Get the recorded statistics.
+
+    :return: The statistics for each (setting key, property name) that was asked for.
+    """
+
+    result = {}  # type: Dict[Tuple[str, str], SettingEvaluationStatistics]
+    for key, statistics in _statistics.items():
+        cache_hit_ratio = (statistics.calls - statistics.evaluations) / statistics.calls if statistics.calls else 0.0
+        result[key] = SettingEvaluationStatistics(calls = statistics.calls, evaluations = statistics.evaluations, cache_hit_ratio = cache_hit_ratio,
+                                                  total_time = statistics.total_time, own_time = statistics.own_time,
+                                                  function_calls = statistics.function_calls, function_time = statistics.function_time)
+    return result
+
+
+def getMostExpensive(count: int = 10) -> List[Tuple[Tuple[str, str], SettingEvaluationStatistics]]:
+    """Get the properties of settings on which the most time was spent, not counting the settings they depend on.
+
+    :param count: How many properties to return at most.
+    :return: (setting key, property name) and statistics, in order from most to least expensive.
+    """
+
+    return sorted(getStatistics().items(), key = lambda item: item[1].own_time, reverse = True)[:count]
+
+
+def getDeepestChains() -> List[Tuple[Tuple[str, str], ...]]:
+    """Get the longest chains of settings that were evaluated because one depends on the other.
+
+    :return: A number of the deepest chains, each one a sequence of (setting key, property name) starting with the
+    property that was asked for and ending with the property that was evaluated last. Deepest chains come first.
+    """
+
+    return sorted(_deepest_chains, key = len, reverse = True)
+
+
+def getProfileData() -> Optional[_ProfileCallNode]:
+    """Get the recorded evaluations as a tree of UM.FlameProfiler nodes.
+
+    All evaluations with the same chain of callers are combined into one node, with the total time they took. The
+    nodes are laid out one after the other, starting at 0.
+
+    :return: The root node, or None if nothing was recorded.
+    """
+
+    if not _call_tree.children:
+        return None
+    children, end_time = _layOutChildren(_call_tree, 0.0)
+    return _ProfileCallNode("", 0, 0.0, end_time, children)
+
+
+def toJSON() -> str:
+    """Export the recorded evaluations as a flame graph, in the same format as UM.FlameProfiler.
+
+    :return: A JSON document, or an empty string if nothing was recorded.
+    """
+
+    profile_data = getProfileData()
+    if profile_data is None:
+        return ""
+    return profile_data.toJSON(root = True)
+
+
+def profileGetProperty(function: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator for the getProperty function of a container stack, to count how often properties are asked for.
+
+    Apply this outside of the caching decorator, so that calls that are answered from the cache are counted as well.
+    """
+
+    if not enabled():
+        return function
+
+    @functools.wraps(function)
+    def wrapper(self, key: str, property_name: str, *args: Any, **kwargs: Any) -> Any:
+        if isRecording():
+            statistics = _getStatistics(key, property_name)
+            statistics.calls += 1
+        return function(self, key, property_name, *args, **kwargs)
+    return wrapper
+
+
+def profileEvaluation(function: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator for the getProperty function of a container stack, to record the evaluations of properties.
+
+    Apply this inside of the caching decorator, so that only the actual evaluations are recorded.
+    """
+
+    if not enabled():
+        return function
+
+    @functools.wraps(function)
+    def wrapper(self, key: str, property_name: str, *args: Any, **kwargs: Any) -> Any:
+        if not isRecording():
+            return function(self, key, property_name, *args, **kwargs)
+
+        setting = (key, property_name)
+        _pushFrame(setting, "{0}.{1}".format(key, property_name))
+        try:
+            return function(self, key, property_name, *args, **kwargs)
+        finally:
+            frame = _popFrame()
+            statistics = _getStatistics(key, property_name)
+            statistics.evaluations += 1
+            elapsed = time.perf_counter() - frame.start_time
+            if setting not in (other.key for other in _frames):  # Don't count the time of recursive evaluations twice.
+                statistics.total_time += elapsed
+            statistics.own_time += elapsed - frame.child_time
+    return wrapper
+
+
+def profileFunction(function: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator for SettingFunction.__call__, to record the time spent in setting functions.
+
+    The time is added to the property of the setting that is being evaluated.
+    """
+
+    if not enabled():
+        return function
+
+    @functools.wraps(function)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        if not isRecording():
+            return function(self, *args, **kwargs)
+
+        _pushFrame(None, str(self))
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            frame = _popFrame()
+            setting = next((other.key for other in reversed(_frames) if other.key is not None), None)
+            if setting is not None:
+                statistics = _getStatistics(*setting)
+                statistics.function_calls += 1
+                statistics.function_time += time.perf_counter() - frame.start_time
+    return wrapper
+
+
+def _getStatistics(key: str, property_name: str) -> _Statistics:
+    statistics = _statistics.get((key, property_name))
+    if statistics is None:
+        statistics = _Statistics()
+        _statistics[(key, property_name)] = statistics
+    return statistics
+
+
+def _pushFrame(setting: Optional[Tuple[str, str]], name: str) -> None:
+    parent_node = _frames[-1].node if _frames else _call_tree
+    _frames.append(_Frame(setting, name, parent_node.getChild(name)))
+
+    if setting is not None:
+        chain = tuple(frame.key for frame in _frames if frame.key is not None)
+        if chain in _deepest_chains:
+            return
+        _deepest_chains.pop(chain[:-1], None)  # Only keep the longest version of a chain.
+        if len(_deepest_chains) < _max_deepest_chains:
+            _deepest_chains[chain] = None
+        else:
+            shortest = min(_deepest_chains, key = len)
+            if len(chain) > len(shortest):
+                del _deepest_chains[shortest]
+                _deepest_chains[chain] = None
+
+
+def _popFrame() -> _Frame:
+    frame = _frames.pop()
+    elapsed = time.perf_counter() - frame.start_time
+    frame.node.time += elapsed
+    if _frames:
+        _frames[-1].child_time += elapsed
+    return frame
+
+
+def _layOutChildren(node: _CallTreeNode, start_time: float) -> Tuple[List[_ProfileCallNode], float]:
+    children = []  # type: List[_ProfileCallNode]
+    time_counter = start_time
+    for name, child in node.children.items():
+        grandchildren, _ = _layOutChildren(child, time_counter)
+        escaped_name = json.dumps(name)[1:-1]  # The profile nodes don't escape names, but setting functions may contain quotes.
+        children.append(_ProfileCallNode(escaped_name, 0, time_counter, time_counter + child.time, grandchildren))
+        time_counter += child.time
+    return children, time_counter
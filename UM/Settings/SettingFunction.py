@@ -10,12 +10,13 @@ import hashlib  # Imported here so it can be used easily by the setting function
 # noinspection PyUnresolvedReferences
 import uuid  # Imported here so it can be used easily by the setting functions.
 from types import CodeType
-from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional, Set, TYPE_CHECKING
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional, Set, Tuple, TYPE_CHECKING
 
 # noinspection PyUnresolvedReferences
 import math  # Imported here so it can be used easily by the setting functions.
 
 from UM.Logger import Logger
+from UM.Settings import SettingEvaluationProfiler
 from UM.Settings.Interfaces import ContainerInterface
 from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext
 
@@ -60,17 +61,22 @@ class SettingFunction:
         self._compiled: Optional[CodeType] = None
         self._valid: bool = False
 
+        # Closure that evaluates this function when the compiled evaluation engine is enabled. Created on first use.
+        self._evaluator: Optional[Callable[[ContainerInterface, Optional[PropertyEvaluationContext], Optional[Dict[str, Any]]], Any]] = None
+
         self._safeCompile()
 
     def _safeCompile(self):
         try:
-            tree = ast.parse(self._code, "eval")
+            tree = ast.parse(self._code, mode = "eval")
+            _SettingExpressionVisitor().visit(tree)  # Check the whole expression for illegal code before it's simplified.
 
-            result = _SettingExpressionVisitor().visit(tree)
+            tree = ast.fix_missing_locations(_SettingExpressionOptimizer().visit(tree))
+            result = _SettingExpressionVisitor().visit(tree)  # Only the settings that can still be reached are used.
             self._used_keys = frozenset(result.keys)
             self._used_values = frozenset(result.values)
 
-            self._compiled = compile(self._code, repr(self), "eval")
+            self._compiled = compile(tree, repr(self), "eval")
             self._valid = True
         except (SyntaxError, TypeError) as e:
             Logger.log("e", "Parse error in function ({1}) for setting: {0}".format(str(e), self._code))
@@ -79,6 +85,7 @@ class SettingFunction:
         except Exception as e:
             Logger.log("e", "Exception in function ({0}) for setting: {1}".format(str(e), self._code))
 
+    @SettingEvaluationProfiler.profileFunction
     def __call__(self, value_provider: ContainerInterface, context: Optional[PropertyEvaluationContext] = None, *,
                  additional_variables: Optional[Dict[str, Any]] = None) -> Any:
         """Call the actual function to calculate the value.
@@ -93,6 +100,11 @@ class SettingFunction:
         if not self._valid:
             return None
 
+        if self.__compiled_evaluation:
+            if self._evaluator is None:
+                self._evaluator = self._createEvaluator()
+            return self._evaluator(value_provider, context, additional_variables)
+
         local_variables: Dict[str, Any] = {}
         # If there is a context, evaluate the values from the perspective of the original caller
         if context is not None:
@@ -123,6 +135,62 @@ class SettingFunction:
             Logger.logException("w", f"An exception occurred in inherit function {self}: {str(e)}\nTrace: {stack_str}")
             return 0  # Settings may be used in calculations and they need a value
 
+    def _createEvaluator(self) -> Callable[[ContainerInterface, Optional[PropertyEvaluationContext], Optional[Dict[str, Any]]], Any]:
+        """Create a closure that evaluates this function, for the compiled evaluation engine.
+
+        The closure has the compiled code and the names of the referenced settings bound to it, and uses the globals
+        that are shared by all setting functions, so that none of this needs to be gathered again on every call.
+        """
+
+        compiled = self._compiled
+        used_values = tuple(self._used_values)
+
+        def evaluate(value_provider: ContainerInterface, context: Optional[PropertyEvaluationContext], additional_variables: Optional[Dict[str, Any]]) -> Any:
+            # If there is a context, evaluate the values from the perspective of the original caller
+            if context is not None:
+                value_provider = context.rootStack()
+            local_variables = SettingFunction._resolveValues(value_provider, used_values, context)
+
+            if additional_variables is not None:
+                local_variables |= additional_variables
+
+            globals_variables = SettingFunction._getBoundGlobals()
+            # Override operators if there is any in the context
+            if context is not None and "override_operators" in context.context:
+                globals_variables = globals_variables.copy()
+                globals_variables.update(context.context["override_operators"])
+
+            try:
+                if compiled:
+                    return eval(compiled, globals_variables, local_variables)
+                Logger.log("e", "An error occurred evaluating the function {0}.".format(self))
+                return 0
+            except Exception as e:
+                stack_str = traceback.format_stack()
+                Logger.logException("w", f"An exception occurred in inherit function {self}: {str(e)}\nTrace: {stack_str}")
+                return 0  # Settings may be used in calculations and they need a value
+
+        return evaluate
+
+    @staticmethod
+    def _resolveValues(value_provider: ContainerInterface, names: Tuple[str, ...], context: Optional[PropertyEvaluationContext]) -> Dict[str, Any]:
+        """Get the values of all the given settings from the value provider.
+
+        The values are asked one by one with getProperty, so that the result cache of a stack is used. A stack's
+        getProperties would walk its containers again for every setting. Settings without a value are left out of
+        the result.
+        """
+
+        values = {}  # type: Dict[str, Any]
+        if not names:
+            return values
+        get_property = value_provider.getProperty
+        for name in names:
+            value = get_property(name, "value", context)
+            if value is not None:
+                values[name] = value
+        return values
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, SettingFunction):
             return False
@@ -148,6 +216,48 @@ class SettingFunction:
 
         return self._used_keys
 
+    def getUsedValues(self) -> FrozenSet[str]:
+        """Retrieve a set of the names of all the settings of which this function uses the value.
+
+        Unlike getUsedSettingKeys(), this doesn't include setting keys that are only passed to operators as strings.
+
+        :return: A set of the keys (strings) of the settings that are referred to by name in this function.
+        """
+
+        return self._used_values
+
+    def getBytecode(self) -> Optional[bytes]:
+        """Get the compiled form of this function, to store it and restore it later with fromBytecode.
+
+        The result can only be restored by the same version of Python.
+
+        :return: The compiled code and the used settings, serialised with marshal, or None if the function is not valid.
+        """
+
+        if not self._valid or self._compiled is None:
+            return None
+        import marshal  # Not imported globally, since the globals of this module are available to the setting functions.
+        return marshal.dumps((self._compiled, tuple(self._used_keys), tuple(self._used_values)))
+
+    @classmethod
+    def fromBytecode(cls, expression: str, bytecode: bytes) -> "SettingFunction":
+        """Restore a function from its compiled form, without parsing and compiling the expression again.
+
+        :param expression: The Python code of the function.
+        :param bytecode: The result of getBytecode of a function with that code, by the same version of Python.
+        """
+
+        import marshal
+        compiled, used_keys, used_values = marshal.loads(bytecode)
+        function = cls.__new__(cls)
+        function._code = expression
+        function._used_keys = frozenset(used_keys)
+        function._used_values = frozenset(used_values)
+        function._compiled = compiled
+        function._valid = True
+        function._evaluator = None
+        return function
+
     def __str__(self) -> str:
         return "={0}".format(self._code)
 
@@ -163,11 +273,13 @@ class SettingFunction:
 
         state = self.__dict__.copy()
         del state["_compiled"]
+        state.pop("_evaluator", None)
         return state
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
         self.__dict__.update(state)
         self._compiled = None  # Just to be sure.
+        self._evaluator = None
         self._safeCompile()
 
     @classmethod
@@ -179,16 +291,123 @@ class SettingFunction:
         """
 
         cls.__operators[name] = operator
+        cls.__bound_globals = None  # Needs to be rebuilt to include the new operator.
         _SettingExpressionVisitor._knownNames.add(name)
 
+    @classmethod
+    def setCompiledEvaluation(cls, enabled: bool) -> None:
+        """Switch between the default and the compiled evaluation engine.
+
+        The compiled engine binds the compiled code and referenced settings of each function into a closure, and shares
+        a single globals dictionary (including the registered operators) between all functions instead of building a
+        new one on every call. The results are the same.
+
+        :param enabled: True to evaluate all setting functions with the compiled engine, False for the default one.
+        """
+
+        cls.__compiled_evaluation = enabled
+
+    @classmethod
+    def isCompiledEvaluation(cls) -> bool:
+        return cls.__compiled_evaluation
+
+    @classmethod
+    def _getBoundGlobals(cls) -> Dict[str, Any]:
+        """Get the globals that setting functions are evaluated with when using the compiled engine.
+
+        This is built once and shared by all functions, so it must not be modified by the caller.
+        """
+
+        if cls.__bound_globals is None:
+            bound_globals: Dict[str, Any] = {}
+            bound_globals.update(globals())
+            bound_globals.update(cls.__operators)
+            cls.__bound_globals = bound_globals
+        return cls.__bound_globals
+
     __operators = {
         "debug": _debug_value
     }
 
+    __compiled_evaluation = False
+    __bound_globals = None  # type: Optional[Dict[str, Any]]
+
 
 _VisitResult = NamedTuple("_VisitResult", [("values", Set[str]), ("keys", Set[str])])
 
 
+class _SettingExpressionOptimizer(ast.NodeTransformer):
+    """
+    Helper class used to simplify a parsed function before it is compiled.
+
+    It folds operations of which all operands are constants into a single constant, and removes the parts of
+    conditional expressions and boolean operators that can never be evaluated because they are guarded by a constant.
+    The settings that are only referred to in removed parts are then no longer seen by _SettingExpressionVisitor, so
+    their values don't need to be looked up and they don't become relations of the setting.
+
+    The simplified expression always gives the same result as the original one. Operations that would fail are left
+    alone, so that they still fail when the function is evaluated.
+    """
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        if not isinstance(node.left, ast.Constant) or not isinstance(node.right, ast.Constant):
+            return node
+        # Leave out operations that can take a lot of time and memory to compute, like 10 ** 10 ** 10 or "x" * 10 ** 10.
+        if isinstance(node.op, (ast.Pow, ast.LShift)):
+            return node
+        if isinstance(node.op, ast.Mult) and not (self._isNumber(node.left.value) and self._isNumber(node.right.value)):
+            return node
+        return self._fold(node)
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if not isinstance(node.operand, ast.Constant):
+            return node
+        return self._fold(node)
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        if not isinstance(node.left, ast.Constant) or not all(isinstance(comparator, ast.Constant) for comparator in node.comparators):
+            return node
+        return self._fold(node)
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        values = list(node.values)
+        # Only constants at the start can be removed. Any operand after a variable one might not be evaluated.
+        while len(values) > 1 and isinstance(values[0], ast.Constant):
+            if bool(values[0].value) == isinstance(node.op, ast.Or):
+                # "True or ..." and "False and ..." are decided by the constant.
+                return ast.copy_location(values[0], node)
+            values.pop(0)  # "False or x" and "True and x" are decided by x.
+        if len(values) == 1:
+            return values[0]
+        node.values = values
+        return node
+
+    def visit_IfExp(self, node: ast.IfExp) -> ast.AST:
+        self.generic_visit(node)
+        if not isinstance(node.test, ast.Constant):
+            return node
+        return node.body if node.test.value else node.orelse
+
+    @staticmethod
+    def _isNumber(value: Any) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    @staticmethod
+    def _fold(node: ast.expr) -> ast.AST:
+        try:
+            expression = ast.fix_missing_locations(ast.Expression(body = node))
+            value = eval(compile(expression, "<constant>", "eval"), {"__builtins__": {}})
+        except Exception:  # Leave it to fail when the function is evaluated, where it's logged.
+            return node
+        if not isinstance(value, (bool, int, float, str)):
+            return node
+        return ast.copy_location(ast.Constant(value = value), node)
+
+
 class _SettingExpressionVisitor(ast.NodeVisitor):
     """
     Helper class used to analyze a parsed function.
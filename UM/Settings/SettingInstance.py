@@ -5,9 +5,10 @@ import copy #To implement deepcopy.
 import enum
 from functools import lru_cache
 import os
-from typing import Any, cast, Dict, Iterable, List, Optional, Set, TYPE_CHECKING
+from typing import Any, cast, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
 
 from UM.Decorators import CachedMemberFunctions, cache_per_instance
+from UM.Settings.DefinitionContainer import DefinitionContainer
 from UM.Settings.Interfaces import ContainerInterface
 from UM.Signal import Signal, signalemitter
 from UM.Logger import Logger
@@ -248,28 +249,62 @@ class SettingInstance:
         property_names.insert(0, "value")
 
         CachedMemberFunctions.clearInstanceCache(self)
-        
+        if not emit_signals:
+            return
+
         # Note: The global stack is only used in case of cross-stack relations ('force_depends_on_settings'), see below.
         from UM.Application import Application
         global_stack_container = Application.getInstance().getGlobalContainerStack()
 
+        # Collect the changes in the container, so that they can be sent as a single batch.
+        changes = {}  # type: Dict[str, Set[str]]
         for property_name in property_names:
             if SettingDefinition.isReadOnlyProperty(property_name):
                 continue
 
-            # TODO: We should send this as a single change event instead of several of them.
-            # That would increase performance by reducing the amount of updates.
-            if emit_signals:
-                changed_relations = SettingInstance._listRelations(self.definition.key, frozenset(), self._definition.relationsAsFrozenSet(), frozenset([property_name]))
-
-                for relation in changed_relations:
-                    used_container = container
-                    if self.definition.key in relation.target.force_depends_on_settings:
-                        used_container = global_stack_container
-                    used_container.propertyChanged.emit(relation.target.key, relation.role)
-                    # If the value/minimum value/etc state is updated, the validation state must be re-evaluated
-                    if relation.role in {"value", "minimum_value", "maximum_value", "minimum_value_warning", "maximum_value_warning"}:
-                        used_container.propertyChanged.emit(relation.target.key, "validationState")
+            for target, role in self._listAffectedProperties(property_name):
+                changed_properties = {role}
+                # If the value/minimum value/etc state is updated, the validation state must be re-evaluated
+                if role in {"value", "minimum_value", "maximum_value", "minimum_value_warning", "maximum_value_warning"}:
+                    changed_properties.add("validationState")
+
+                if self.definition.key in target.force_depends_on_settings:
+                    for changed_property in changed_properties:
+                        global_stack_container.propertyChanged.emit(target.key, changed_property)
+                else:
+                    changes.setdefault(target.key, set()).update(changed_properties)
+
+        if not changes:
+            return
+        batch_signal = getattr(container, "propertiesChangedBatch", None)
+        if batch_signal is not None:
+            batch_signal.emit(changes)
+        else:  # This container can't receive changes in batches.
+            for key, changed_properties in changes.items():
+                for changed_property in changed_properties:
+                    container.propertyChanged.emit(key, changed_property)
+
+    def _listAffectedProperties(self, property_name: str) -> List[Tuple[SettingDefinition, str]]:
+        """Get the properties of other settings that are affected by a change of a property of this setting.
+
+        If the definition belongs to a definition container, this is a lookup in the relation index of the container.
+        Otherwise the relations are followed one by one.
+
+        :param property_name: The property of this setting that changed.
+        :return: The definitions of the affected settings, with the name of the affected property of each.
+        """
+
+        definition_container = self._definition.container
+        if isinstance(definition_container, DefinitionContainer):
+            affected = []  # type: List[Tuple[SettingDefinition, str]]
+            for key, role in definition_container.getAffectedProperties(self._definition.key, property_name):
+                targets = definition_container.findDefinitions(key = key)
+                if targets:
+                    affected.append((targets[0], role))
+            return affected
+
+        changed_relations = SettingInstance._listRelations(self._definition.key, frozenset(), self._definition.relationsAsFrozenSet(), frozenset([property_name]))
+        return [(relation.target, relation.role) for relation in changed_relations]
 
     @staticmethod
     @lru_cache
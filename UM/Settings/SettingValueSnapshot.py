@@ -0,0 +1,59 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import itertools
+from typing import Any, Dict, Iterator, Mapping
+
+# Shared by all containers, so that every change anywhere results in a generation that is higher than all earlier ones.
+_generation_counter = itertools.count(1)
+
+
+def nextGeneration() -> int:
+    """Get a new generation number, for a container that has just changed.
+
+    Generation numbers only go up, and are unique for the whole application. Taking one is thread-safe.
+    """
+
+    return next(_generation_counter)
+
+
+class SettingValueSnapshot(Mapping[str, Any]):
+    """The evaluated values of all settings in a container stack, frozen at a certain generation of that stack.
+
+    The snapshot can't be changed, and doesn't change when the stack changes, so it can safely be read from other
+    threads. Compare getGeneration() with the generation of the stack to see whether it is still up to date.
+
+    Note that the values themselves are not copied. Values such as lists must not be modified.
+    """
+
+    __slots__ = ("_values", "_generation", "_stack_id")
+
+    def __init__(self, values: Dict[str, Any], generation: int, stack_id: str) -> None:
+        """Constructor.
+
+        :param values: The evaluated values, by setting key. The snapshot takes ownership of this dictionary.
+        :param generation: The generation of the stack at the moment the values were evaluated.
+        :param stack_id: The ID of the stack that the values were evaluated in.
+        """
+
+        self._values = values
+        self._generation = generation
+        self._stack_id = stack_id
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def getGeneration(self) -> int:
+        return self._generation
+
+    def getStackId(self) -> str:
+        return self._stack_id
+
+    def __repr__(self) -> str:
+        return "<SettingValueSnapshot stack={0} generation={1} settings={2}>".format(self._stack_id, self._generation, len(self._values))
@@ -145,6 +145,15 @@ class VersionUpgradeManager:
 
         self._current_versions = current_versions
 
+    def getCurrentVersions(self) -> Dict[Tuple[str, int], Any]:
+        """Gets the target versions to upgrade to.
+
+        :return: A dictionary of tuples of configuration types and their versions currently in use, and with each of
+        these a tuple of where to store this type of file and its MIME type.
+        """
+
+        return self._current_versions
+
     def registerCurrentVersion(self, version_info: Tuple[str, int], type_info: Any) -> None:
         if version_info in self._current_versions:
             Logger.log("d", "Overwriting current version info: %s", repr(version_info))
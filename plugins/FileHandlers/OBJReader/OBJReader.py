@@ -3,118 +3,213 @@
 # Uranium is released under the terms of the LGPLv3 or higher.
 
 import os
+import re
+from typing import List, Optional
+
+import numpy
 
 from UM.Job import Job
 from UM.Logger import Logger
+from UM.Mesh.MeshData import MeshData, calculateNormalsFromVertices
 from UM.Mesh.MeshReader import MeshReader
-from UM.Mesh.MeshBuilder import MeshBuilder
 from UM.Scene.SceneNode import SceneNode
 
+# The lines that we read, found by the keyword at the start of the line. Other lines are ignored.
+_keyword_regex = re.compile(r"^[ \t]*(v|vt|vn|f)[ \t]", re.MULTILINE)
+_vertex_regex = re.compile(r"^[ \t]*v[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)", re.MULTILINE)
+_normal_regex = re.compile(r"^[ \t]*vn[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)", re.MULTILINE)
+_uv_regex = re.compile(r"^[ \t]*vt[ \t]+(\S+)[ \t]+(\S+)", re.MULTILINE)
+_face_regex = re.compile(r"^[ \t]*f[ \t]+([^\n]*)", re.MULTILINE)
+
+# A backslash at the end of a line continues the line on the next line.
+_continuation_regex = re.compile(r"(^|[ \t])\\[ \t]*\n", re.MULTILINE)
+
 
 class OBJReader(MeshReader):
     def __init__(self) -> None:
         super().__init__()
         self._supported_extensions = [".obj"]
 
-    def _toAbsoluteIndex(self, max, data):
-        """ Handle negative indices (those are relative to the position, so -2 is the second one before the face). """
-        return [index if index > 0 else 1 + max + index for index in data]
-
-    def _read(self, file_name):
-        scene_node = None
-
-        extension = os.path.splitext(file_name)[1]
-        if extension.lower() in self._supported_extensions:
-            vertex_list = []
-            normal_list = []
-            uv_list = []
-            face_list = []
-            scene_node = SceneNode()
-
-            mesh_builder = MeshBuilder()
-            mesh_builder.setFileName(file_name)
-            previous_line_parts = []
-            f = open(file_name, "rt", encoding = "utf-8", errors='ignore')
-            for line in f:
-                parts = previous_line_parts + line.split()
-                previous_line_parts = []
-                if len(parts) < 1:
-                    continue
-                if parts[-1] == "\\":
-                    del parts[-1]
-                    previous_line_parts = parts
-                    continue
-                if parts[0] == "f":
-                    parts = [i for i in map(lambda p: p.split("/"), parts)]
-                    for idx in range(1, len(parts) - 2):
-                        data = self._toAbsoluteIndex(len(vertex_list), [int(parts[1][0]), int(parts[idx + 1][0]), int(parts[idx + 2][0])])
-
-                        if len(parts[1]) > 1 and parts[1][1] and parts[idx + 1][1] and parts[idx + 2][1]:
-                            data += self._toAbsoluteIndex(len(normal_list), [int(parts[1][1]), int(parts[idx + 1][1]), int(parts[idx + 2][1])])
-                        else:
-                            data += [0, 0, 0]
-
-                        if len(parts[1]) > 2:
-                            data += self._toAbsoluteIndex(len(uv_list), [int(parts[1][2]), int(parts[idx + 1][2]), int(parts[idx + 2][2])])
-                        else:
-                            data += [0, 0, 0]
-
-                        face_list.append(data)
-                elif parts[0] == "v":
-                    vertex_list.append([float(parts[1]), float(parts[3]), -float(parts[2])])
-                elif parts[0] == "vn":
-                    normal_list.append([float(parts[1]), float(parts[3]), -float(parts[2])])
-                elif parts[0] == "vt":
-                    uv_list.append([float(parts[1]), float(parts[2])])
-                Job.yieldThread()
-            f.close()
+        self._chunk_size = 1 << 24  # How many bytes of the file are parsed at a time.
 
-            mesh_builder.reserveVertexCount(3 * len(face_list))
-            num_vertices = len(vertex_list)
+    def setChunkSize(self, chunk_size: int) -> None:
+        """Set how many bytes of a file are parsed at a time.
 
-            for face in face_list:
-                # Substract 1 from index, as obj starts counting at 1 instead of 0
-                i = face[0] - 1
-                j = face[1] - 1
-                k = face[2] - 1
+        :param chunk_size: The size of each chunk. Lines are never split over chunks, so chunks may be bigger.
+        """
 
-                ui = face[3] - 1
-                uj = face[4] - 1
-                uk = face[5] - 1
+        self._chunk_size = max(1, chunk_size)
 
-                ni = face[6] - 1
-                nj = face[7] - 1
-                nk = face[8] - 1
+    def getChunkSize(self) -> int:
+        return self._chunk_size
 
-                if i < 0 or i >= num_vertices:
-                    i = 0
-                if j < 0 or j >= num_vertices:
-                    j = 0
-                if k < 0 or k >= num_vertices:
-                    k = 0
-                if ni != -1 and nj != -1 and nk != -1:
-                    mesh_builder.addFaceWithNormals(vertex_list[i][0], vertex_list[i][1], vertex_list[i][2], normal_list[ni][0], normal_list[ni][1], normal_list[ni][2], vertex_list[j][0], vertex_list[j][1], vertex_list[j][2], normal_list[nj][0], normal_list[nj][1], normal_list[nj][2], vertex_list[k][0], vertex_list[k][1], vertex_list[k][2],normal_list[nk][0], normal_list[nk][1], normal_list[nk][2])
-                else:
-                    mesh_builder.addFaceByPoints(vertex_list[i][0], vertex_list[i][1], vertex_list[i][2], vertex_list[j][0], vertex_list[j][1], vertex_list[j][2], vertex_list[k][0], vertex_list[k][1], vertex_list[k][2])
+    def canReadInSubprocess(self) -> bool:
+        return True
 
-                if ui != -1 and len(uv_list) > ui:
-                    mesh_builder.setVertexUVCoordinates(mesh_builder.getVertexCount() - 3, uv_list[ui][0], uv_list[ui][1])
-
-                if uj != -1 and len(uv_list) > uj:
-                    mesh_builder.setVertexUVCoordinates(mesh_builder.getVertexCount() - 2, uv_list[uj][0], uv_list[uj][1])
-
-                if uk != -1 and len(uv_list) > uk:
-                    mesh_builder.setVertexUVCoordinates(mesh_builder.getVertexCount() - 1, uv_list[uk][0], uv_list[uk][1])
+    def _read(self, file_name):
+        scene_node = None
 
-                Job.yieldThread()
-            if not mesh_builder.hasNormals():
-                mesh_builder.calculateNormals(fast = True)
+        extension = os.path.splitext(file_name)[1]
+        if extension.lower() in self._supported_extensions:
+            mesh = self._loadMesh(file_name)
 
             # make sure that the mesh data is not empty
-            if mesh_builder.getVertexCount() == 0:
+            if mesh is None or mesh.getVertexCount() == 0:
                 Logger.log("d", "File did not contain valid data, unable to read.")
                 return None  # We didn't load anything.
 
-            scene_node.setMeshData(mesh_builder.build())
+            scene_node = SceneNode()
+            scene_node.setMeshData(mesh)
 
         return scene_node
+
+    def _loadMesh(self, file_name: str) -> Optional[MeshData]:
+        """Parse an OBJ file and turn its faces into triangles.
+
+        The file is parsed in chunks of whole lines. The numbers in each chunk are parsed by NumPy all at once, and the
+        faces are triangulated as fans around their first corner.
+        :param file_name: The file to read.
+        :return: A mesh with three separate vertices per triangle, or None if the file contains no triangles.
+        """
+
+        vertices = []  # type: List[numpy.ndarray]
+        normals = []  # type: List[numpy.ndarray]
+        uvs = []  # type: List[numpy.ndarray]
+        corners = []  # type: List[numpy.ndarray]  # The vertex, UV and normal index of each corner of each face.
+        corner_counts = []  # type: List[numpy.ndarray]  # The number of corners of each face.
+        counts = numpy.zeros(3, dtype = numpy.int64)  # The number of vertices, UVs and normals in the previous chunks.
+
+        job = Job.getCurrentJob()
+        file_size = max(1, os.path.getsize(file_name))
+        characters_read = 0
+        with open(file_name, "rt", encoding = "utf-8", errors = "ignore", newline = None) as f:
+            remainder = ""
+            while True:
+                data = f.read(self._chunk_size)
+                characters_read += len(data)
+                text = remainder + data
+                if data:
+                    # Keep the last line for the next chunk, since it may not be complete. Same for continued lines.
+                    end = text.rfind("\n")
+                    while end > 0 and _continuation_regex.search(text, text.rfind("\n", 0, end) + 1, end + 1):
+                        end = text.rfind("\n", 0, end)
+                    remainder = text[end + 1:]
+                    text = text[:end + 1]
+                if text:
+                    self._parseChunk(text, counts, vertices, normals, uvs, corners, corner_counts)
+                if not data:
+                    break
+                if job is not None:
+                    job.progress.emit(job, min(100, 100 * characters_read // file_size))
+                Job.yieldThread()
+
+        if not corner_counts:
+            return None
+        return self._buildMesh(file_name, numpy.concatenate(vertices), numpy.concatenate(normals), numpy.concatenate(uvs), numpy.concatenate(corners), numpy.concatenate(corner_counts))
+
+    def _parseChunk(self, text: str, counts: numpy.ndarray, vertices: List[numpy.ndarray], normals: List[numpy.ndarray], uvs: List[numpy.ndarray], corners: List[numpy.ndarray], corner_counts: List[numpy.ndarray]) -> None:
+        """Parse the lines in a part of a file and add what's in them to the lists of arrays.
+
+        :param text: Whole lines of the file.
+        :param counts: The number of vertices, UVs and normals that were found before this part, which is updated.
+        """
+
+        if "\\" in text:
+            text = _continuation_regex.sub(r"\1 ", text)
+
+        # Swap Y and Z, since we have a different coordinate system.
+        chunk_vertices = self._parseNumbers(_vertex_regex.findall(text), 3, numpy.float32)[:, [0, 2, 1]]
+        chunk_vertices[:, 2] *= -1
+        chunk_normals = self._parseNumbers(_normal_regex.findall(text), 3, numpy.float32)[:, [0, 2, 1]]
+        chunk_normals[:, 2] *= -1
+        chunk_uvs = self._parseNumbers(_uv_regex.findall(text), 2, numpy.float32)
+        vertices.append(chunk_vertices)
+        normals.append(chunk_normals)
+        uvs.append(chunk_uvs)
+
+        face_lines = _face_regex.findall(text)
+        if face_lines:
+            face_text = "\n".join(face_lines) + "\n"
+
+            # Each corner is a vertex, UV and normal index separated by slashes, of which the last two may be missing.
+            # Which of them a number is, follows from the slashes before it in the same corner.
+            characters = numpy.frombuffer(face_text.encode("utf-8"), dtype = numpy.uint8)
+            is_space = (characters == ord(" ")) | (characters == ord("\t")) | (characters == ord("\n"))
+            is_slash = characters == ord("/")
+            after_space = numpy.concatenate(([True], is_space[:-1]))
+            after_separator = after_space | numpy.concatenate(([False], is_slash[:-1]))
+            corner_starts = numpy.flatnonzero(~is_space & after_space)
+            number_starts = numpy.flatnonzero(~is_space & ~is_slash & after_separator)
+            slashes_before = numpy.cumsum(is_slash) - is_slash
+            corner_of_number = numpy.searchsorted(corner_starts, number_starts, side = "right") - 1
+            index_type = slashes_before[number_starts] - slashes_before[corner_starts[corner_of_number]]
+
+            numbers = numpy.fromstring(face_text.replace("/", " "), dtype = numpy.int64, sep = " ")
+            if len(numbers) != len(number_starts) or (index_type > 2).any():
+                raise ValueError("The faces in the file contain something that is not an index.")
+            face_corners = numpy.zeros((len(corner_starts), 3), dtype = numpy.int64)  # 0 for missing indices.
+            face_corners[corner_of_number, index_type] = numbers
+            line_ends = numpy.flatnonzero(characters == ord("\n"))
+            corners_per_line = numpy.bincount(numpy.searchsorted(line_ends, corner_starts), minlength = len(face_lines))
+
+            # Negative indices count back from the vertices, UVs or normals that came before the face in the file.
+            if (face_corners < 0).any():
+                keywords = numpy.array(_keyword_regex.findall(text))
+                counts_before = numpy.stack([numpy.cumsum(keywords == keyword) for keyword in ("v", "vt", "vn")], axis = 1)
+                counts_before = counts_before[keywords == "f"].repeat(corners_per_line, axis = 0) + counts
+                face_corners = numpy.where(face_corners < 0, counts_before + 1 + face_corners, face_corners)
+
+            corners.append(face_corners)
+            corner_counts.append(corners_per_line)
+
+        counts += (len(chunk_vertices), len(chunk_uvs), len(chunk_normals))
+
+    def _parseNumbers(self, lines: List[tuple], columns: int, dtype: type) -> numpy.ndarray:
+        if not lines:
+            return numpy.zeros((0, columns), dtype = dtype)
+        return numpy.fromstring(" ".join(" ".join(line) for line in lines), dtype = dtype, sep = " ").reshape(-1, columns)
+
+    def _buildMesh(self, file_name: str, vertices: numpy.ndarray, normals: numpy.ndarray, uvs: numpy.ndarray, corners: numpy.ndarray, corner_counts: numpy.ndarray) -> Optional[MeshData]:
+        """Triangulate the faces and create a mesh with three separate vertices for each triangle.
+
+        :param corners: The vertex, UV and normal index of each corner of each face, where the first is 1.
+        :param corner_counts: The number of corners of each face.
+        """
+
+        # Fan triangulation: a face with n corners is split into n - 2 triangles, each starting at the first corner.
+        triangle_counts = numpy.maximum(corner_counts - 2, 0)
+        face_starts = numpy.cumsum(corner_counts) - corner_counts
+        triangle_count = int(triangle_counts.sum())
+        if triangle_count == 0 or len(vertices) == 0:
+            return None
+        first_corner = numpy.repeat(face_starts, triangle_counts)
+        fan_index = numpy.arange(triangle_count) - numpy.repeat(numpy.cumsum(triangle_counts) - triangle_counts, triangle_counts) + 1
+        triangles = numpy.stack((first_corner, first_corner + fan_index, first_corner + fan_index + 1), axis = 1)
+        triangle_corners = corners[triangles.ravel()] - 1  # Now counting from 0, and -1 if missing.
+
+        # Vertices that don't exist are replaced by the first vertex.
+        vertex_indices = triangle_corners[:, 0]
+        vertex_indices[(vertex_indices < 0) | (vertex_indices >= len(vertices))] = 0
+        mesh_vertices = vertices[vertex_indices]
+
+        # Use the normals from the file for triangles that have them for all three corners. Calculate the rest.
+        normal_indices = triangle_corners[:, 2]
+        has_normals = ((normal_indices >= 0) & (normal_indices < len(normals))).reshape(-1, 3).all(axis = 1).repeat(3)
+        if has_normals.all():
+            mesh_normals = normals[normal_indices]
+        else:
+            mesh_normals = calculateNormalsFromVertices(mesh_vertices, len(mesh_vertices)).astype(numpy.float32)
+            mesh_normals[has_normals] = normals[normal_indices[has_normals]]
+
+        mesh_uvs = None  # type: Optional[numpy.ndarray]
+        uv_indices = triangle_corners[:, 1]
+        has_uvs = (uv_indices >= 0) & (uv_indices < len(uvs))
+        if has_uvs.any():
+            mesh_uvs = numpy.zeros((len(mesh_vertices), 2), dtype = numpy.float32)
+            mesh_uvs[has_uvs] = uvs[uv_indices[has_uvs]]
+
+        indices = numpy.arange(len(mesh_vertices), dtype = numpy.int32).reshape(-1, 3)
+        for array in (mesh_vertices, mesh_normals, mesh_uvs, indices):  # Prevent MeshData from copying them.
+            if array is not None:
+                array.flags.writeable = False
+        return MeshData(vertices = mesh_vertices, normals = mesh_normals, indices = indices, uvs = mesh_uvs, file_name = file_name)
@@ -70,4 +70,31 @@ def isTriangleInMesh(triangle, mesh_data):
         for rotation in (0, 1, 2):  # Doesn't matter where the triangle starts. Try all 3 rotations.
             if list(vertices[face[0]]) == triangle[(0 + rotation) % 3] and list(vertices[face[1]]) == triangle[(1 + rotation) % 3] and list(vertices[face[2]]) == triangle[(2 + rotation) % 3]:
                 return True
-    return False  # Not found.
\ No newline at end of file
+    return False  # Not found.
+
+@pytest.mark.parametrize("chunk_size", [1 << 24, 10])
+def test_polygonsAndRelativeIndices(tmp_path, chunk_size):
+    """
+    Tests fan triangulation of polygons with relative indices, line continuations and chunks that end mid-file.
+    """
+    path = str(tmp_path / "quad.obj")
+    with open(path, "w") as f:
+        f.write("# A square and a triangle.\n"
+                "v 0 0 0\nv 10 0 0\nv 10 10 0\nv 0 10 0\n"
+                "vt 0 0\nvt 1 0\nvt 1 1\nvt 0 1\n"
+                "vn 0 0 1\n"
+                "f 1/1/1 2/2/1 \\\n 3/3/1 4/4/1\n"
+                "v 20 0 0\n"
+                "f -1//-1 -4//-1 -3//-1\n")
+    reader = OBJReader.OBJReader()
+    reader.setChunkSize(chunk_size)
+    with patch("UM.Application.Application.getInstance"):
+        mesh = reader.read(path).getMeshData()
+
+    assert mesh.getFaceCount() == 3
+    assert isTriangleInMesh([[0, 0, 0], [10, 0, 0], [10, 0, -10]], mesh)
+    assert isTriangleInMesh([[0, 0, 0], [10, 0, -10], [0, 0, -10]], mesh)
+    assert isTriangleInMesh([[20, 0, 0], [10, 0, 0], [10, 0, -10]], mesh)
+    assert mesh.getUVCoordinates()[:6].tolist() == [[0, 0], [1, 0], [1, 1], [0, 0], [1, 1], [0, 1]]
+    assert mesh.getUVCoordinates()[6:].tolist() == [[0, 0]] * 3  # No UV coordinates for the triangle.
+    assert mesh.getNormals().tolist() == [[0, 1, 0]] * 9
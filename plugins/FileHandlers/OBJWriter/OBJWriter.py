@@ -4,12 +4,17 @@
 
 import time
 
+import numpy
+
 from UM.Logger import Logger
 from UM.Mesh.MeshWriter import MeshWriter
 from UM.i18n import i18nCatalog
 
 catalog = i18nCatalog("uranium")
 
+CHUNK_SIZE = 1 << 16  # The number of lines that are formatted and written at a time.
+
+
 class OBJWriter(MeshWriter):
     def write(self, stream, nodes, mode = MeshWriter.OutputMode.TextMode, **kwargs):
         """Writes the specified nodes to a stream in the OBJ format.
@@ -43,33 +48,34 @@ class OBJWriter(MeshWriter):
             uvs = mesh_data.getUVCoordinates()
 
             stream.write("# {0}\n# Vertices\n".format(node.getName()))
+            # OBJ has a different coordinate system: Y becomes -Z and Z becomes Y.
+            self._writeLines(stream, "v %.9g %.9g %.9g\n", numpy.stack((verts[:, 0], -verts[:, 2], verts[:, 1]), axis = 1))
+            if uvs is not None:
+                self._writeLines(stream, "vt %.9g %.9g\n", uvs)
 
+            stream.write("# Faces\n")
             if mesh_data.hasIndices():
-                for face in mesh_data.getIndices():
-                    v1 = verts[face[0]]
-                    v2 = verts[face[1]]
-                    v3 = verts[face[2]]
-                    stream.write("v {0} {1} {2}\n".format(v1[0], -v1[2], v1[1]))
-                    stream.write("v {0} {1} {2}\n".format(v2[0], -v2[2], v2[1]))
-                    stream.write("v {0} {1} {2}\n".format(v3[0], -v3[2], v3[1]))
-
-                stream.write("# Faces\n")
-                for face in mesh_data.getIndices():
-                    stream.write("f {0} {1} {2}\n".format(face[0] + face_offset, face[1] + face_offset, face[2] + face_offset))
+                faces = mesh_data.getIndices() + face_offset
+            else:
+                faces = numpy.arange(face_offset, face_offset + len(verts) // 3 * 3).reshape(-1, 3)
+            if uvs is not None:
+                self._writeLines(stream, "f %d/%d %d/%d %d/%d\n", faces.repeat(2, axis = 1))
             else:
-                for vertex in verts:
-                    stream.write("v {0} {1} {2}\n".format(vertex[0], -vertex[2], vertex[1]))
-                if uvs is not None:
-                    for uv in uvs:
-                        stream.write("vt {0} {1}\n".format(uv[0], uv[1]))
-
-                stream.write("# Faces\n")
-                for face in range(face_offset, face_offset + len(verts) - 1, 3):
-                    if mesh_data.hasUVCoordinates():
-                        stream.write("f {0}/{0} {1}/{1} {2}/{2}\n".format(face, face + 1, face + 2))
-                    else:
-                        stream.write("f {0} {1} {2}\n".format(face, face + 1, face + 2))
+                self._writeLines(stream, "f %d %d %d\n", faces)
 
             face_offset += mesh_data.getVertexCount()
 
         return True
+
+    def _writeLines(self, stream, line_format, values):
+        """Write a line for each row of an array, formatting many lines at a time.
+
+        :param stream: The stream to write the lines to.
+        :param line_format: The format of a line, with a placeholder for each column. Nine significant digits are enough to
+        get exactly the same 32-bit floats back when reading the file.
+        :param values: The array with the values to fill in, one row per line.
+        """
+
+        for start in range(0, len(values), CHUNK_SIZE):
+            chunk = values[start:start + CHUNK_SIZE]
+            stream.write(line_format * len(chunk) % tuple(chunk.ravel().tolist()))
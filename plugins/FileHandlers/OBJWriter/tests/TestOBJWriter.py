@@ -0,0 +1,40 @@
+import io
+import os.path
+
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy
+
+from UM.Mesh.MeshData import MeshData
+from UM.Scene.SceneNode import SceneNode
+import OBJWriter
+
+
+def createNode(mesh_data):
+    node = SceneNode()
+    node.setSelectable(True)
+    node.setMeshData(mesh_data)
+    return node
+
+
+def test_writeIndexed():
+    vertices = numpy.array([[0, 0, 0], [10, 0, 0], [10, 0, -10], [0, 0, -10]], dtype = numpy.float32)
+    indices = numpy.array([[0, 1, 2], [0, 2, 3]], dtype = numpy.int32)
+    nodes = [createNode(MeshData(vertices = vertices, indices = indices)), createNode(MeshData(vertices = vertices, indices = indices))]
+    stream = io.StringIO()
+    assert OBJWriter.OBJWriter().write(stream, nodes)
+
+    lines = stream.getvalue().splitlines()
+    assert [line for line in lines if line.startswith("v ")] == ["v 0 -0 0", "v 10 -0 0", "v 10 10 0", "v 0 10 0"] * 2
+    assert [line for line in lines if line.startswith("f ")] == ["f 1 2 3", "f 1 3 4", "f 5 6 7", "f 5 7 8"]
+
+
+def test_writeUVs():
+    vertices = numpy.array([[0, 0, 0], [10, 0, 0], [10, 0, -10]], dtype = numpy.float32)
+    uvs = numpy.array([[0, 0], [1, 0], [0.5, 1]], dtype = numpy.float32)
+    stream = io.StringIO()
+    assert OBJWriter.OBJWriter().write(stream, [createNode(MeshData(vertices = vertices, uvs = uvs))])
+
+    lines = stream.getvalue().splitlines()
+    assert [line for line in lines if line.startswith("vt ")] == ["vt 0 0", "vt 1 0", "vt 0.5 1"]
+    assert [line for line in lines if line.startswith("f ")] == ["f 1/1 2/2 3/3"]
@@ -2,10 +2,16 @@
 # Copyright (c) 2013 David Braam
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import mmap
+import os
+from typing import Optional
+
 import numpy
 
+from UM.Job import Job
 from UM.Logger import Logger
 from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshData import MeshData, calculateFaceNormals
 from UM.Mesh.MeshReader import MeshReader
 from UM.MimeTypeDatabase import MimeTypeDatabase, MimeType
 from UM.Scene.SceneNode import SceneNode
@@ -14,10 +20,19 @@ import stl.mesh
 
 stl.stl.MAX_COUNT = 100000000
 
+# The layout of a triangle in a binary STL file: a normal, three vertices and an attribute byte count.
+BINARY_FACET = numpy.dtype([("normal", "<f4", (3, )), ("vertices", "<f4", (3, 3)), ("attribute_byte_count", "<u2")])
+BINARY_HEADER_SIZE = 84  # An 80-byte header and the number of triangles.
+
+
 class STLReader(MeshReader):
     def __init__(self) -> None:
         super().__init__()
 
+        # Binary files are converted this many triangles at a time, to limit the memory needed for temporary arrays
+        # and to report progress for big files.
+        self._chunk_size = 1 << 16
+
         MimeTypeDatabase.addMimeType(
             MimeType(
                 name = "model/stl",
@@ -36,9 +51,38 @@ class STLReader(MeshReader):
         mesh_builder.calculateNormals(fast = True)
         mesh_builder.setFileName(file_name)
 
+    def setChunkSize(self, chunk_size: int) -> None:
+        """Set how many triangles of a binary file are converted at a time.
+
+        :param chunk_size: The number of triangles per chunk. Progress is reported after each chunk.
+        """
+
+        self._chunk_size = max(1, chunk_size)
+
+    def getChunkSize(self) -> int:
+        return self._chunk_size
+
+    def canReadInSubprocess(self) -> bool:
+        return True
+
     def _read(self, file_name):
         """Decide if we need to use ascii or binary in order to read file"""
 
+        try:
+            mesh = self._loadBinary(file_name)
+        except (OSError, ValueError):
+            Logger.logException("e", "Reading binary stl file failed.")
+            mesh = None
+        if mesh is not None:
+            if mesh.getVertexCount() == 0:
+                Logger.log("d", "File did not contain valid data, unable to read.")
+                return None
+            scene_node = SceneNode()
+            scene_node.setMeshData(mesh)
+            Logger.log("d", "Loaded a mesh with %s vertices", mesh.getVertexCount())
+            return scene_node
+
+        # Not a binary file, so it's ASCII, possibly with multiple solids.
         mesh_builder = MeshBuilder()
         scene_node = SceneNode()
 
@@ -83,3 +127,55 @@ class STLReader(MeshReader):
             self._swapColumns(vertices, 1, 2)
 
             mesh_builder.addVertices(vertices)
+
+    def _loadBinary(self, file_name: str) -> Optional[MeshData]:
+        """Read a binary STL file straight into the arrays of a mesh.
+
+        The file is mapped into memory and the triangles are read through a structured view of it, so the file is not
+        copied. The vertices are converted to our coordinate system directly into the array of the mesh.
+        :param file_name: The file to read.
+        :return: The mesh, or None if the file is not a binary STL file.
+        """
+
+        file_size = os.path.getsize(file_name)
+        if file_size < BINARY_HEADER_SIZE:
+            return None
+        with open(file_name, "rb") as f:
+            f.seek(BINARY_HEADER_SIZE - 4)
+            facet_count = int(numpy.frombuffer(f.read(4), dtype = "<u4")[0])
+            # ASCII files can start with anything, so only the size of the file tells for sure.
+            if file_size != BINARY_HEADER_SIZE + facet_count * BINARY_FACET.itemsize:
+                return None
+
+            vertices = numpy.empty((facet_count * 3, 3), dtype = numpy.float32)
+            normals = numpy.empty((facet_count * 3, 3), dtype = numpy.float32)
+            if facet_count > 0:
+                with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mapped:
+                    self._convertBinaryFacets(mapped, facet_count, vertices, normals)
+
+        # MeshData would copy the arrays if they could still be changed.
+        vertices.flags.writeable = False
+        normals.flags.writeable = False
+        return MeshData(vertices = vertices, normals = normals, file_name = file_name)
+
+    def _convertBinaryFacets(self, buffer, facet_count: int, vertices: numpy.ndarray, normals: numpy.ndarray) -> None:
+        job = Job.getCurrentJob()
+        facet_vertices = vertices.reshape((facet_count, 3, 3))
+        facet_normals = normals.reshape((facet_count, 3, 3))
+        for start in range(0, facet_count, self._chunk_size):
+            end = min(start + self._chunk_size, facet_count)
+            source = numpy.frombuffer(buffer, dtype = BINARY_FACET, count = end - start, offset = BINARY_HEADER_SIZE + start * BINARY_FACET.itemsize)["vertices"]
+            destination = facet_vertices[start:end]
+
+            # We have a different coordinate system: Y becomes Z and Z becomes -Y.
+            destination[:, :, 0] = source[:, :, 0]
+            destination[:, :, 1] = source[:, :, 2]
+            numpy.negative(source[:, :, 1], out = destination[:, :, 2])
+            del source  # Release the view on the file, so that it can be closed.
+
+            # Calculate the normals like calculateNormalsFromVertices, ignoring the normals in the file.
+            facet_normals[start:end] = calculateFaceNormals(destination)[:, numpy.newaxis, :]
+
+            if job is not None and facet_count > self._chunk_size:
+                job.progress.emit(job, 100 * end // facet_count)
+                Job.yieldThread()
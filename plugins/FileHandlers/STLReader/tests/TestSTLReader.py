@@ -0,0 +1,124 @@
+import os.path
+
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy
+from unittest.mock import MagicMock, patch
+
+from UM.Mesh.MeshBuilder import MeshBuilder
+import STLReader
+
+# Two triangles of a square, with a bit of Y and Z in it to check the conversion of the coordinate system.
+triangles = numpy.array([
+    [[0, 0, 0], [10, 0, 5], [10, 20, 5]],
+    [[0, 0, 0], [10, 20, 5], [0, 20, 0]]
+], dtype = numpy.float32)
+
+
+def writeBinarySTL(path, facets):
+    data = numpy.zeros(len(facets), dtype = STLReader.BINARY_FACET)
+    data["vertices"] = facets
+    with open(path, "wb") as f:
+        f.write(b"solid but actually binary".ljust(80, b" "))
+        f.write(numpy.array([len(facets)], dtype = "<u4").tobytes())
+        f.write(data.tobytes())
+
+
+def writeASCIISTL(path, facets):
+    with open(path, "w") as f:
+        f.write("solid test\n")
+        for facet in facets:
+            f.write("facet normal 0 0 0\nouter loop\n")
+            for vertex in facet:
+                f.write("vertex {0} {1} {2}\n".format(*vertex))
+            f.write("endloop\nendfacet\n")
+        f.write("endsolid test\n")
+
+
+def readWithNumpySTL(path):
+    reader = STLReader.STLReader()
+    builder = MeshBuilder()
+    reader.load_file(path, builder)
+    return builder.build()
+
+
+def test_readBinary(tmp_path):
+    path = str(tmp_path / "square.stl")
+    writeBinarySTL(path, triangles)
+    with patch("UM.Application.Application.getInstance"):
+        result = STLReader.STLReader().read(path)
+
+    mesh = result.getMeshData()
+    assert mesh.getVertexCount() == 6
+    assert mesh.getVertices().tolist() == [[0, 0, 0], [10, 5, 0], [10, 5, -20], [0, 0, 0], [10, 5, -20], [0, 0, -20]]
+    expected = readWithNumpySTL(path)
+    assert numpy.allclose(mesh.getVertices(), expected.getVertices())
+    assert numpy.allclose(mesh.getNormals(), expected.getNormals())
+    assert mesh.getFileName() == path
+
+
+def test_readBinaryInChunks(tmp_path):
+    facets = numpy.random.default_rng(0).random((100, 3, 3), dtype = numpy.float32)
+    path = str(tmp_path / "random.stl")
+    writeBinarySTL(path, facets)
+    reader = STLReader.STLReader()
+    reader.setChunkSize(30)
+    job = MagicMock()
+
+    with patch("UM.Job.Job.getCurrentJob", return_value = job):
+        mesh = reader._loadBinary(path)
+
+    expected = readWithNumpySTL(path)
+    assert numpy.array_equal(mesh.getVertices(), expected.getVertices())
+    assert numpy.allclose(mesh.getNormals(), expected.getNormals(), atol = 1e-6)
+    assert [call[0][1] for call in job.progress.emit.call_args_list] == [30, 60, 90, 100]
+
+
+def test_readASCII(tmp_path):
+    path = str(tmp_path / "square.stl")
+    writeASCIISTL(path, triangles)
+    reader = STLReader.STLReader()
+    assert reader._loadBinary(path) is None
+
+    with patch("UM.Application.Application.getInstance"):
+        result = reader.read(path)
+    assert result.getMeshData().getVertices().tolist() == [[0, 0, 0], [10, 5, 0], [10, 5, -20], [0, 0, 0], [10, 5, -20], [0, 0, -20]]
+
+
+def test_readInSubprocess(tmp_path):
+    from UM.Math.Vector import Vector
+    from UM.Mesh.MeshReadPool import MeshReadPool
+
+    tetrahedron = numpy.array([
+        [[0, 0, 0], [10, 0, 0], [0, 20, 0]],
+        [[0, 0, 0], [0, 20, 0], [0, 0, 30]],
+        [[0, 0, 0], [0, 0, 30], [10, 0, 0]],
+        [[10, 0, 0], [0, 0, 30], [0, 20, 0]]
+    ], dtype = numpy.float32)
+    path = str(tmp_path / "tetrahedron.stl")
+    writeBinarySTL(path, tetrahedron)
+    reader = STLReader.STLReader()
+    assert reader.canReadInSubprocess()
+
+    pool = MeshReadPool(max_workers = 1)
+    try:
+        mesh = pool.submit(reader, path).result(timeout = 120)
+    finally:
+        pool.shutdown()
+
+    with patch("UM.Application.Application.getInstance"):
+        expected = reader.read(path)
+    expected.setCenterPosition(Vector(5, 15, -10))  # The center of the bounding box, in our coordinate system.
+    expected = expected.getMeshData()
+    assert numpy.allclose(mesh.getVertices(), expected.getVertices())
+    assert numpy.allclose(mesh.getNormals(), expected.getNormals())
+    assert mesh.getCenterPosition() == expected.getCenterPosition()
+    assert mesh.getZeroPosition() == expected.getZeroPosition()
+    assert mesh.getFileName() == path
+    assert mesh._convex_hull is not None  # Already computed by the other process.
+    assert numpy.allclose(mesh.getConvexHullVertices(), expected.getConvexHullVertices())
+
+    with patch("UM.Application.Application.getInstance"):
+        node = reader.createSceneNode(path, mesh)
+    assert node.getMeshData() is mesh
+    assert node.source_mime_type is not None
@@ -5,12 +5,25 @@
 import struct
 import time
 
+import numpy
+
 from UM.Logger import Logger
+from UM.Mesh.MeshData import calculateFaceNormals
 from UM.Mesh.MeshWriter import MeshWriter
 from UM.i18n import i18nCatalog
 
 catalog = i18nCatalog("uranium")
 
+# The layout of a triangle in a binary STL file: a normal, three vertices and an attribute byte count.
+BINARY_FACET = numpy.dtype([("normal", "<f4", (3, )), ("vertices", "<f4", (3, 3)), ("attribute_byte_count", "<u2")])
+
+# The text of a triangle in an ASCII STL file, to be filled in with the normal and the three vertices. Nine significant
+# digits are enough to get exactly the same 32-bit floats back when reading the file.
+ASCII_FACET = "facet normal %.9g %.9g %.9g\n  outer loop\n    vertex %.9g %.9g %.9g\n    vertex %.9g %.9g %.9g\n    vertex %.9g %.9g %.9g\n  endloop\nendfacet\n"
+
+CHUNK_SIZE = 1 << 16  # The number of triangles that are converted and written at a time.
+
+
 class STLWriter(MeshWriter):
     def write(self, stream, nodes, mode = MeshWriter.OutputMode.TextMode, **kwargs):
         """Write the specified sequence of nodes to a stream in the STL format.
@@ -45,39 +58,9 @@ class STLWriter(MeshWriter):
         stream.write("solid {0}\n".format(name))
 
         for node in nodes:
-            mesh_data = node.getMeshData().getTransformed(node.getWorldTransformation())
-            verts = mesh_data.getVertices()
-            if verts is None:
-                continue  # No mesh data, nothing to do.
-
-            if mesh_data.hasIndices():
-                for face in mesh_data.getIndices():
-                    stream.write("facet normal 0.0 0.0 0.0\n")
-                    stream.write("  outer loop\n")
-
-                    v1 = verts[face[0]]
-                    v2 = verts[face[1]]
-                    v3 = verts[face[2]]
-                    stream.write("    vertex {0} {1} {2}\n".format(v1[0], -v1[2], v1[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v2[0], -v2[2], v2[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v3[0], -v3[2], v3[1]))
-
-                    stream.write("  endloop\n")
-                    stream.write("endfacet\n")
-            else:
-                num_verts = mesh_data.getVertexCount()
-                for index in range(0, num_verts - 2, 3):
-                    stream.write("facet normal 0.0 0.0 0.0\n")
-                    stream.write("  outer loop\n")
-                    v1 = verts[index]
-                    v2 = verts[index + 1]
-                    v3 = verts[index + 2]
-                    stream.write("    vertex {0} {1} {2}\n".format(v1[0], -v1[2], v1[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v2[0], -v2[2], v2[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v3[0], -v3[2], v3[1]))
-
-                    stream.write("  endloop\n")
-                    stream.write("endfacet\n")
+            for facets in self._facetChunks(node):
+                values = numpy.concatenate((calculateFaceNormals(facets), facets.reshape(-1, 9)), axis = 1)
+                stream.write(ASCII_FACET * len(facets) % tuple(values.ravel().tolist()))
 
         stream.write("endsolid {0}\n".format(name))
 
@@ -90,33 +73,36 @@ class STLWriter(MeshWriter):
             if node.getMeshData().hasIndices():
                 face_count += node.getMeshData().getFaceCount()
             else:
-                face_count += node.getMeshData().getVertexCount() / 3
+                face_count += node.getMeshData().getVertexCount() // 3
 
         stream.write(struct.pack("<I", int(face_count))) #Write number of faces to STL
 
         for node in nodes:
-            mesh_data = node.getMeshData().getTransformed(node.getWorldTransformation())
-
-            if mesh_data.hasIndices():
-                verts = mesh_data.getVertices()
-                for face in mesh_data.getIndices():
-                    v1 = verts[face[0]]
-                    v2 = verts[face[1]]
-                    v3 = verts[face[2]]
-                    stream.write(struct.pack("<fff", 0.0, 0.0, 0.0))
-                    stream.write(struct.pack("<fff", v1[0], -v1[2], v1[1]))
-                    stream.write(struct.pack("<fff", v2[0], -v2[2], v2[1]))
-                    stream.write(struct.pack("<fff", v3[0], -v3[2], v3[1]))
-                    stream.write(struct.pack("<H", 0))
-            else:
-                num_verts = mesh_data.getVertexCount()
-                verts = mesh_data.getVertices()
-                for index in range(0, num_verts - 1, 3):
-                    v1 = verts[index]
-                    v2 = verts[index + 1]
-                    v3 = verts[index + 2]
-                    stream.write(struct.pack("<fff", 0.0, 0.0, 0.0))
-                    stream.write(struct.pack("<fff", v1[0], -v1[2], v1[1]))
-                    stream.write(struct.pack("<fff", v2[0], -v2[2], v2[1]))
-                    stream.write(struct.pack("<fff", v3[0], -v3[2], v3[1]))
-                    stream.write(struct.pack("<H", 0))
\ No newline at end of file
+            for facets in self._facetChunks(node):
+                records = numpy.zeros(len(facets), dtype = BINARY_FACET)  # The attribute byte count stays 0.
+                records["normal"] = calculateFaceNormals(facets)
+                records["vertices"] = facets
+                stream.write(records.tobytes())
+
+    def _facetChunks(self, node):
+        """Get the triangles of a node in STL's coordinate system, a limited number of triangles at a time.
+
+        :param node: The scene node to get the triangles of.
+        :return: Arrays of shape (triangle_count, 3, 3), with the three corners of each triangle.
+        """
+
+        mesh_data = node.getMeshData().getTransformed(node.getWorldTransformation())
+        verts = mesh_data.getVertices()
+        if verts is None:
+            return  # No mesh data, nothing to do.
+
+        # STL has a different coordinate system: Y becomes -Z and Z becomes Y.
+        verts = numpy.stack((verts[:, 0], -verts[:, 2], verts[:, 1]), axis = 1)
+        if mesh_data.hasIndices():
+            indices = mesh_data.getIndices()
+            for start in range(0, len(indices), CHUNK_SIZE):
+                yield verts[indices[start:start + CHUNK_SIZE]]
+        else:
+            facets = verts[:len(verts) // 3 * 3].reshape(-1, 3, 3)
+            for start in range(0, len(facets), CHUNK_SIZE):
+                yield facets[start:start + CHUNK_SIZE]
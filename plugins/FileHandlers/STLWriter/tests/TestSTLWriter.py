@@ -0,0 +1,51 @@
+import io
+import os.path
+
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy
+
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshWriter import MeshWriter
+from UM.Scene.SceneNode import SceneNode
+import STLWriter
+
+
+def createCubeNode():
+    builder = MeshBuilder()
+    builder.addCube(10, 10, 10, center = Vector(0, 0, 0))
+    node = SceneNode()
+    node.setSelectable(True)
+    node.setMeshData(builder.build())
+    return node
+
+
+def test_writeBinary():
+    node = createCubeNode()
+    stream = io.BytesIO()
+    assert STLWriter.STLWriter().write(stream, [node], MeshWriter.OutputMode.BinaryMode)
+
+    data = stream.getvalue()
+    assert len(data) == 84 + 12 * STLWriter.BINARY_FACET.itemsize
+    assert numpy.frombuffer(data, dtype = "<u4", count = 1, offset = 80)[0] == 12
+    facets = numpy.frombuffer(data, dtype = STLWriter.BINARY_FACET, offset = 84)
+
+    mesh = node.getMeshData()
+    expected = mesh.getVertices()[mesh.getIndices()][:, :, [0, 2, 1]] * [1, -1, 1]
+    assert numpy.array_equal(facets["vertices"], expected)
+    # The normals point outwards, away from the centre of the cube.
+    assert numpy.allclose(numpy.linalg.norm(facets["normal"], axis = 1), 1)
+    assert ((facets["normal"] * facets["vertices"].mean(axis = 1)).sum(axis = 1) > 0).all()
+
+
+def test_writeAscii():
+    node = createCubeNode()
+    stream = io.StringIO()
+    assert STLWriter.STLWriter().write(stream, [node], MeshWriter.OutputMode.TextMode)
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0].startswith("solid ")
+    assert lines[-1].startswith("endsolid ")
+    assert len(lines) == 2 + 12 * 7
+    assert lines[1:8] == ["facet normal 0 -1 0", "  outer loop", "    vertex -5 -5 -5", "    vertex 5 -5 5", "    vertex -5 -5 5", "  endloop", "endfacet"]
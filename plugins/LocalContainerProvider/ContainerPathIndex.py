@@ -0,0 +1,141 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from UM.Logger import Logger
+from UM.SaveFile import SaveFile
+
+
+class ContainerPathIndex:
+    """An index of the files in some directories, which is stored on disk and updated incrementally.
+
+    For each directory, the index stores the files and subdirectories in it, along with the modification time of the
+    directory. Adding, removing or renaming a file changes the modification time of the directory it is in, so a
+    directory whose modification time didn't change doesn't need to be listed again. Finding all files then only takes
+    one stat call per directory.
+
+    Like Resources.getAllResourcesOfType, hidden files and directories (starting with a period) are skipped.
+    """
+
+    Version = 1
+
+    # Directories that were modified this shortly before they were listed are listed again the next time, since
+    # another change in the same tick of the file system's clock would not change their modification time.
+    racy_seconds = 2
+
+    def __init__(self) -> None:
+        # For each directory, its modification time in nanoseconds (or None if it needs to be listed again), and the
+        # names of its subdirectories and files.
+        self._directories = {}  # type: Dict[str, Tuple[Optional[int], List[str], List[str]]]
+        self._changed = False
+
+    def listFiles(self, directories: Iterable[str]) -> Dict[str, List[str]]:
+        """Find the files in some directories and all of their subdirectories.
+
+        Only the directories that were changed since they were last listed are listed. Directories that are no longer
+        found are removed from the index.
+        :param directories: The directories to search through. Directories that don't exist are skipped.
+        :return: For each of the directories, the paths to the files in it.
+        """
+
+        visited = set()  # type: Set[str]
+        result = {}  # type: Dict[str, List[str]]
+        for directory in directories:
+            if directory not in result:
+                result[directory] = []
+                self._listFilesRecursively(directory, result[directory], visited)
+
+        for directory in self._directories.keys() - visited:
+            del self._directories[directory]
+            self._changed = True
+        return result
+
+    def isChanged(self) -> bool:
+        """Whether the index was changed since it was loaded or saved."""
+
+        return self._changed
+
+    def getDirectories(self) -> List[str]:
+        """Get all directories in the index, which were found the last time files were listed."""
+
+        return list(self._directories.keys())
+
+    @classmethod
+    def load(cls, path: str) -> "ContainerPathIndex":
+        """Load an index from a file.
+
+        :param path: The file to load the index from.
+        :return: The index from the file, or an empty index if the file doesn't exist or can't be read.
+        """
+
+        index = cls()
+        try:
+            with open(path, "r", encoding = "utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != cls.Version:
+                return index
+            index._directories = {directory: (record[0], record[1], record[2]) for directory, record in data["directories"].items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            Logger.log("w", "Unable to read the index of container files from {path}: {err}".format(path = path, err = str(e)))
+        return index
+
+    def save(self, path: str) -> None:
+        """Store the index in a file, to load it again the next time.
+
+        :param path: The file to store the index in.
+        """
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+            with SaveFile(path, "wt") as f:
+                json.dump({"version": self.Version, "directories": self._directories}, f)
+        except OSError as e:
+            Logger.log("w", "Unable to store the index of container files in {path}: {err}".format(path = path, err = str(e)))
+            return
+        self._changed = False
+
+    def _listFilesRecursively(self, directory: str, result: List[str], visited: Set[str]) -> None:
+        try:
+            modified_time = os.stat(directory).st_mtime_ns
+        except OSError:  # Doesn't exist (any more).
+            return
+        visited.add(directory)
+
+        record = self._directories.get(directory)
+        if record is None or record[0] != modified_time:
+            record = self._listDirectory(directory, modified_time)
+            self._directories[directory] = record
+            self._changed = True
+
+        result.extend(os.path.join(directory, file_name) for file_name in record[2])
+        for subdirectory in record[1]:
+            self._listFilesRecursively(os.path.join(directory, subdirectory), result, visited)
+
+    def _listDirectory(self, directory: str, modified_time: int) -> Tuple[Optional[int], List[str], List[str]]:
+        subdirectories = []  # type: List[str]
+        files = []  # type: List[str]
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir():  # Follows symbolic links, like os.walk(followlinks = True).
+                            subdirectories.append(entry.name)
+                        elif entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            Logger.log("w", "Unable to list the files in {directory}: {err}".format(directory = directory, err = str(e)))
+            return None, [], []
+
+        if time.time() - modified_time / 1e9 < self.racy_seconds:
+            return None, subdirectories, files
+        return modified_time, subdirectories, files
@@ -5,10 +5,13 @@ import sys # For setrecursionlimit
 import os  # For getting the IDs from a filename.
 import pickle  # For caching definitions.
 import re  # To detect back-up files in the ".../old/#/..." folders.
+import struct  # To catch errors from reading damaged binary definition caches.
 import time
 import urllib.parse  # For interpreting escape characters using unquote_plus.
 import gc
-from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from PyQt6.QtCore import QFileSystemWatcher  # To find out when the container directories are changed.
 
 from UM.Application import Application  # To get the current version for finding the cache directory.
 from UM.ConfigurationErrorMessage import ConfigurationErrorMessage
@@ -16,11 +19,15 @@ from UM.Logger import Logger
 from UM.MimeTypeDatabase import MimeTypeDatabase, MimeType  # To get the type of container we're loading.
 from UM.Platform import Platform
 from UM.Resources import Resources
-from UM.SaveFile import SaveFile
+from UM.SaveQueue import SaveQueue
 from UM.Settings.ContainerProvider import ContainerProvider  # The class we're implementing.
 from UM.Settings.ContainerRegistry import ContainerRegistry  # To get the resource types for containers.
 from UM.Settings.DefinitionContainer import DefinitionContainer  # To check if we need to cache this container.
+from UM.Settings.DefinitionContainerBinaryCache import readBinaryCache, writeBinaryCache
 from UM.Settings.DefinitionContainerUnpickler import DefinitionContainerUnpickler
+from UM.Settings.ParallelMetadataExtractor import ExtractionJob, ParallelMetadataExtractor  # To parse many files at once.
+
+from .ContainerPathIndex import ContainerPathIndex
 
 MYPY = False
 if MYPY:  # Things to import for type checking only.
@@ -43,8 +50,79 @@ class LocalContainerProvider(ContainerProvider):
 
         self._is_read_only_cache = {}  # type: Dict[str, bool]
 
+        # Metadata that was parsed in other processes by loadMetadataBatch, which loadMetadata still needs to complete.
+        self._extracted_metadata = {}  # type: Dict[str, List[Dict[str, Any]]]
+
+        self._binary_definition_cache = False  # Whether definitions are cached in the binary format instead of pickled.
+
+        self._save_queue = SaveQueue()
+        self._write_behind = False  # Whether containers are saved in the background.
+
+        self._path_index = None  # type: Optional[ContainerPathIndex]  # The files in the resource directories, loaded from the cache the first time.
+        self._directory_watcher = None  # type: Optional[QFileSystemWatcher]  # Only if the directories are being watched.
+        self._directories_changed = False  # Whether the watcher found changes since the cache of paths was last updated.
+
         self._storage_path = ""
 
+    def setBinaryDefinitionCache(self, enabled: bool) -> None:
+        """Set whether to cache definitions in the binary format, instead of pickling them.
+
+        Definitions loaded from the binary format only create the settings that are used. The settings are read from the
+        cache file when they are needed. The two formats are stored in different files.
+
+        :param enabled: True to use the binary format, False to pickle the definitions.
+        """
+
+        self._binary_definition_cache = enabled
+
+    def isBinaryDefinitionCache(self) -> bool:
+        return self._binary_definition_cache
+
+    def setWriteBehind(self, enabled: bool) -> None:
+        """Set whether to save containers on a background thread.
+
+        If enabled, saveContainer returns as soon as the container is serialized, and the files are written in the
+        background, several at a time. Use waitForSaving to wait until they are written. If a file can't be written,
+        its container is marked as dirty again, so that it is saved again later. Either way, files whose contents
+        didn't change are not written again.
+
+        :param enabled: True to save containers in the background, False to save them right away.
+        """
+
+        self._write_behind = enabled
+        if not enabled:
+            self._save_queue.flush()
+
+    def isWriteBehind(self) -> bool:
+        return self._write_behind
+
+    def waitForSaving(self) -> None:
+        self._save_queue.flush()
+
+    def setWatchDirectories(self, enabled: bool) -> None:
+        """Set whether to watch the directories of the containers for changes.
+
+        If the directories are watched, containers that other programs add or remove are found the next time the IDs
+        of the containers are requested. If not (the default), the containers are only found when the application
+        starts.
+
+        :param enabled: True to watch the directories, False to stop watching them.
+        """
+
+        if enabled == (self._directory_watcher is not None):
+            return
+        if not enabled:
+            self._directory_watcher.directoryChanged.disconnect(self._onDirectoryChanged)
+            self._directory_watcher = None
+            return
+        self._directory_watcher = QFileSystemWatcher()
+        self._directory_watcher.directoryChanged.connect(self._onDirectoryChanged)
+        if self._path_index is not None:
+            self._watchDirectories()
+
+    def isWatchDirectories(self) -> bool:
+        return self._directory_watcher is not None
+
     def getContainerFilePathById(self, container_id: str) -> Optional[str]:
         return self._id_to_path.get(container_id)
 
@@ -54,7 +132,7 @@ class LocalContainerProvider(ContainerProvider):
         :return: A sequence of all container IDs.
         """
 
-        if not self._id_to_path:
+        if not self._id_to_path or self._directories_changed:
             self._updatePathCache()
         return self._id_to_path.keys()
 
@@ -81,6 +159,7 @@ class LocalContainerProvider(ContainerProvider):
 
         # Not cached, so load by deserialising.
         container = container_class(base_id)
+        self._save_queue.flush(file_path)  # It may still be being saved.
         with open(file_path, "r", encoding = "utf-8") as f:
             container.deserialize(f.read(), file_path)
         container.setPath(file_path)
@@ -114,8 +193,11 @@ class LocalContainerProvider(ContainerProvider):
         if container_type in resource_types:
             path = Resources.getStoragePath(resource_types[container_type], file_name)
             try:
-                with SaveFile(path, "wt") as f:
-                    f.write(data)
+                if self._write_behind:
+                    # The registry marks the container as saved when this returns, so mark it again if saving fails.
+                    self._save_queue.save(path, data, lambda _path, _error: container.setDirty(True))
+                else:
+                    self._save_queue.write(path, data)
             except OSError as e:
                 Logger.log("e", "Unable to store local container to path {path}: {err}".format(path = path, err = str(e)))
                 return
@@ -157,8 +239,12 @@ class LocalContainerProvider(ContainerProvider):
 
         requested_metadata = {}  # type: Dict[str, Any]
         try:
-            with open(filename, "r", encoding = "utf-8") as f:
-                result_metadatas = clazz.deserializeMetadata(f.read(), container_id) #pylint: disable=no-member
+            if container_id in self._extracted_metadata:
+                result_metadatas = [clazz.completeParsedMetadata(metadata) for metadata in self._extracted_metadata.pop(container_id)]
+            else:
+                self._save_queue.flush(filename)  # It may still be being saved.
+                with open(filename, "r", encoding = "utf-8") as f:
+                    result_metadatas = clazz.deserializeMetadata(f.read(), container_id) #pylint: disable=no-member
         except IOError as e:
             Logger.log("e", "Unable to load metadata from file {filename}: {error_msg}".format(filename = filename, error_msg = str(e)))
             ConfigurationErrorMessage.getInstance().addFaultyContainers(container_id)
@@ -182,6 +268,33 @@ class LocalContainerProvider(ContainerProvider):
                 registry.source_provider[metadata["id"]] = self
         return requested_metadata
 
+    def loadMetadataBatch(self, container_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load the metadata of several containers at once.
+
+        If the registry allows it, the files are parsed in several processes at the same time. The results are then
+        completed and registered one by one, in the same way as loadMetadata.
+
+        :param container_ids: The IDs of the containers to load the metadata of.
+        :return: The metadata of each of the containers, indexed by their IDs. The metadata is empty for containers
+        that failed to load.
+        """
+
+        self._save_queue.flush()  # The other processes need to read what's being saved.
+        registry = ContainerRegistry.getInstance()
+        jobs = []  # type: List[ExtractionJob]
+        for container_id in container_ids:
+            if container_id in registry.metadata:
+                continue  # Already side-loaded.
+            clazz = ContainerRegistry.mime_type_map[self._id_to_mime[container_id].name]
+            if ParallelMetadataExtractor.canExtract(clazz):
+                jobs.append((clazz, self._id_to_path[container_id], container_id))
+        self._extracted_metadata = ParallelMetadataExtractor(registry.getMetadataExtractionWorkers()).extract(jobs)
+
+        try:
+            return {container_id: self.loadMetadata(container_id) for container_id in container_ids}
+        finally:
+            self._extracted_metadata = {}
+
     def isReadOnly(self, container_id: str) -> bool:
         """Returns whether a container is read-only or not.
 
@@ -226,6 +339,8 @@ class LocalContainerProvider(ContainerProvider):
         del self._id_to_path[container_id]
         del self._id_to_mime[container_id]
 
+        self._save_queue.cancel(path_to_delete)
+
         # Remove file related to a container
         #
         # Since we cannot assume we can write to any other path, we can only support removing from
@@ -242,7 +357,8 @@ class LocalContainerProvider(ContainerProvider):
         """Load a pre-parsed definition container.
 
         Definition containers can be quite expensive to load, so this loads a
-        pickled version of the definition if one is available.
+        pickled version of the definition if one is available, or a version in
+        the binary format if that is enabled.
 
         :param definition_id: The ID of the definition to load from the cache.
         :return: If a cached version was available, return it. If not, return
@@ -251,7 +367,7 @@ class LocalContainerProvider(ContainerProvider):
 
         definition_path = self._id_to_path[definition_id]
         try:
-            cache_path = Resources.getPath(Resources.Cache, "definitions", Application.getInstance().getVersion(), definition_id)
+            cache_path = Resources.getPath(Resources.Cache, "definitions", Application.getInstance().getVersion(), self._getCacheFileName(definition_id))
             cache_mtime = os.path.getmtime(cache_path)
             definition_mtime = os.path.getmtime(definition_path)
         except FileNotFoundError:  # Cache doesn't exist yet.
@@ -266,10 +382,15 @@ class LocalContainerProvider(ContainerProvider):
 
         try:
             gc.disable()
-            with open(cache_path, "rb") as f:
-                # The DefinitionContainerUnpickler has a list of whitelisted globals
-                definition = DefinitionContainerUnpickler(f).load()
-        except (OSError, PermissionError, IOError, AttributeError, EOFError, ImportError, IndexError, pickle.UnpicklingError) as e:
+            if self._binary_definition_cache:
+                definition = readBinaryCache(cache_path)
+                if definition is None:  # Written by a different version.
+                    return None
+            else:
+                with open(cache_path, "rb") as f:
+                    # The DefinitionContainerUnpickler has a list of whitelisted globals
+                    definition = DefinitionContainerUnpickler(f).load()
+        except (OSError, PermissionError, IOError, AttributeError, EOFError, ImportError, IndexError, ValueError, struct.error, pickle.UnpicklingError) as e:
             Logger.log("w", "Failed to load definition {definition_id} from cached file: {error_msg}".format(definition_id = definition_id, error_msg = str(e)))
             return None
         finally:
@@ -293,7 +414,7 @@ class LocalContainerProvider(ContainerProvider):
         :param definition: The definition container to store.
         """
 
-        cache_path = Resources.getStoragePath(Resources.Cache, "definitions", Application.getInstance().getVersion(), definition.id)
+        cache_path = Resources.getStoragePath(Resources.Cache, "definitions", Application.getInstance().getVersion(), self._getCacheFileName(definition.id))
 
         # Ensure the cache path exists.
         try:
@@ -302,6 +423,16 @@ class LocalContainerProvider(ContainerProvider):
             Logger.log("w", "The definition cache for definition {definition_id} failed to save because you don't have permissions to write in the cache directory.".format(definition_id = definition.getId()))
             return  # No rights to save it. Better give up.
 
+        if self._binary_definition_cache:
+            try:
+                writeBinaryCache(definition, cache_path)
+            except ValueError as e:
+                Logger.log("w", "The definition cache for definition {definition_id} failed to save: {error_msg}".format(definition_id = definition.getId(), error_msg = str(e)))
+                self._removeCacheFile(cache_path)
+            except OSError:
+                Logger.log("w", "Cura didn't get permission to save the definition {definition_id}".format(definition_id = definition.getId()))
+            return
+
         recursionlimit = sys.getrecursionlimit()
         sys.setrecursionlimit(3000)
         try:
@@ -313,61 +444,114 @@ class LocalContainerProvider(ContainerProvider):
             # Instead of saving a partial cache and raising an exception, simply fail to save the cache.
             # See CURA-4024.
             Logger.log("w", "The definition cache for definition {definition_id} failed to pickle.".format(definition_id = definition.getId()))
-            if os.path.exists(cache_path):
-                try:
-                    os.remove(cache_path)  # The pickling might be half-complete, which causes EOFError in Pickle when you load it later.
-                except PermissionError:
-                    # Someone else is touching this file.
-                    Logger.log("w", "Unable to remove picked file as another process has access to it %s", cache_path)
+            self._removeCacheFile(cache_path)  # The pickling might be half-complete, which causes EOFError in Pickle when you load it later.
         except PermissionError:
             Logger.log("w", "Cura didn't get permission to save the definition {definition_id}".format(definition_id = definition.getId()))
         finally:
             sys.setrecursionlimit(recursionlimit)
 
+    def _getCacheFileName(self, definition_id: str) -> str:
+        if self._binary_definition_cache:
+            return definition_id + ".bin"
+        return definition_id
+
+    def _removeCacheFile(self, cache_path: str) -> None:
+        if os.path.exists(cache_path):
+            try:
+                os.remove(cache_path)
+            except PermissionError:
+                # Someone else is touching this file.
+                Logger.log("w", "Unable to remove cache file as another process has access to it %s", cache_path)
+
     def _updatePathCache(self) -> None:
         """Updates the cache of paths to containers.
 
-        This way we can more easily load the container files we want lazily.
+        This way we can more easily load the container files we want lazily. Only the directories that changed since
+        the last time are listed again, see ContainerPathIndex.
         """
 
-        self._id_to_path = {}  # Clear cache first.
-        self._id_to_mime = {}
+        self._directories_changed = False
+        if self._path_index is None:
+            self._path_index = ContainerPathIndex.load(self._getPathIndexFileName())
 
-        old_file_expression = re.compile(r"\{sep}old\{sep}\d+\{sep}".format(sep = os.sep))  # To detect files that are back-ups. Matches on .../old/#/...
+        search_directories = {resource_type: Resources.getAllPathsForType(resource_type) for resource_type in ContainerRegistry.getInstance().getResourceTypes().values()}
+        directory_files = self._path_index.listFiles(directory for directories in search_directories.values() for directory in directories)
+        if self._path_index.isChanged():
+            self._path_index.save(self._getPathIndexFileName())
+        if self._directory_watcher is not None:
+            Application.getInstance().callLater(self._watchDirectories)  # The watcher may only be used from the main thread, but this may be called from others.
 
         all_resources = set()  # type: Set[str]
-        for resource_type in ContainerRegistry.getInstance().getResourceTypes().values():
-            all_resources |= set(Resources.getAllResourcesOfType(resource_type))  # Remove duplicates, since the Resources only finds resources by their directories.
+        for directories in search_directories.values():
+            # Like Resources.getAllResourcesOfType, only the first file with each name is used for each resource type.
+            file_names = set()  # type: Set[str]
+            for directory in directories:
+                for filename in directory_files[directory]:
+                    file_name = os.path.basename(filename)
+                    if file_name not in file_names:
+                        file_names.add(file_name)
+                        all_resources.add(filename)
+
+        id_to_path = {}  # type: Dict[str, str]
+        id_to_mime = {}  # type: Dict[str, MimeType]
+
+        old_file_expression = re.compile(r"\{sep}old\{sep}\d+\{sep}".format(sep = os.sep))  # To detect files that are back-ups. Matches on .../old/#/...
+
+        backup_directories = {}  # type: Dict[str, bool]  # Whether each directory contains back-ups, so that the expression is only matched once per directory.
+        mime_types = {}  # type: Dict[str, Optional[MimeType]]  # The MIME type of each file extension, since files are recognised by their extension.
+        # The file names of containers have dots before their extension too (e.g. "..._0.4mm.inst.cfg"), so their
+        # extension is found from the suffixes of the container MIME types, longest first.
+        container_suffixes = set()  # type: Set[str]
+        for mime_type_name in ContainerRegistry.mime_type_map:
+            try:
+                container_suffixes.update("." + suffix.lower() for suffix in MimeTypeDatabase.getMimeType(mime_type_name).suffixes)
+            except MimeTypeDatabase.MimeTypeNotFoundError:
+                continue
+        sorted_suffixes = sorted(container_suffixes, key = len, reverse = True)
         for filename in all_resources:
-            if re.search(old_file_expression, filename):
+            directory, file_name = os.path.split(filename)
+            if directory not in backup_directories:
+                backup_directories[directory] = re.search(old_file_expression, directory + os.sep) is not None
+            if backup_directories[directory]:
                 continue  # This is a back-up file from an old version.
 
-            container_id, mime = self._pathToIdAndMime(filename)
-            if not container_id:
-                continue
+            lower_file_name = file_name.lower()
+            extension = next((suffix for suffix in sorted_suffixes if lower_file_name.endswith(suffix)), None)
+            if extension is None:  # Probably not a container. Still only look at the last two extensions.
+                extension = "." + ".".join(lower_file_name.rsplit(".", 2)[1:])
+            if extension not in mime_types:
+                mime_types[extension] = self._pathToMime(filename)
+            mime = mime_types[extension]
             if not mime:
                 continue
-            self._id_to_path[container_id] = filename
-            self._id_to_mime[container_id] = mime
+            container_id = urllib.parse.unquote_plus(mime.stripExtension(file_name))
+            if not container_id:
+                continue
+            id_to_path[container_id] = filename
+            id_to_mime[container_id] = mime
 
-    @staticmethod
-    def _pathToIdAndMime(path: str) -> Tuple[Optional[str], Optional[MimeType]]:
-        """ Faster combination of _pathToMime and _pathToID
+        # Keep the containers that were found in the files in the meantime, besides the one that each file is named after.
+        found_files = set(id_to_path.values())
+        for container_id, filename in self._id_to_path.items():
+            if container_id not in id_to_path and filename in found_files and container_id in self._id_to_mime:
+                id_to_path[container_id] = filename
+                id_to_mime[container_id] = self._id_to_mime[container_id]
 
-            When we want to know the mime and the ID, it's better to use this function, as this prevents an extra
-            mime detection from having to be made.
-        """
-        try:
-            mime = MimeTypeDatabase.getMimeTypeForFile(path)
-        except MimeTypeDatabase.MimeTypeNotFoundError:
-            Logger.log("w", "MIME type could not be found for file: {path}, ignoring it.".format(path = path))
-            return None, None
-        if mime.name not in ContainerRegistry.mime_type_map:  # The MIME type is known, but it's not a container.
-            return None, None
-        recovered_id = None
-        if mime:
-            recovered_id = urllib.parse.unquote_plus(mime.stripExtension(os.path.basename(path)))
-        return recovered_id, mime
+        self._id_to_path = id_to_path
+        self._id_to_mime = id_to_mime
+
+    def _getPathIndexFileName(self) -> str:
+        return os.path.join(Resources.getCacheStoragePath(), "container_paths.json")
+
+    def _watchDirectories(self) -> None:
+        if self._directory_watcher is None or self._path_index is None:
+            return
+        directories = set(self._path_index.getDirectories()) - set(self._directory_watcher.directories())
+        if directories:
+            self._directory_watcher.addPaths(list(directories))
+
+    def _onDirectoryChanged(self, path: str) -> None:
+        self._directories_changed = True
 
     @staticmethod
     def _pathToMime(path: str) -> Optional[MimeType]:
@@ -0,0 +1,92 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+import time
+from unittest.mock import patch
+
+from ..ContainerPathIndex import ContainerPathIndex
+
+
+def _createFile(path, modified_time):
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, "w") as f:
+        f.write("")
+    for directory in (os.path.dirname(path), os.path.dirname(os.path.dirname(path))):
+        os.utime(directory, (modified_time, modified_time))  # Changed long enough ago to trust the modification time.
+
+
+def test_listFiles(tmp_path):
+    old_time = time.time() - 100
+    _createFile(str(tmp_path / "root" / "a.inst.cfg"), old_time)
+    _createFile(str(tmp_path / "root" / ".hidden.inst.cfg"), old_time)
+    _createFile(str(tmp_path / "root" / "sub" / "b.def.json"), old_time)
+    _createFile(str(tmp_path / "root" / ".hidden" / "c.def.json"), old_time)
+
+    result = ContainerPathIndex().listFiles([str(tmp_path / "root"), str(tmp_path / "does_not_exist")])
+    assert set(result[str(tmp_path / "root")]) == {str(tmp_path / "root" / "a.inst.cfg"), str(tmp_path / "root" / "sub" / "b.def.json")}
+    assert result[str(tmp_path / "does_not_exist")] == []
+
+
+def test_listOnlyChangedDirectories(tmp_path):
+    old_time = time.time() - 100
+    _createFile(str(tmp_path / "root" / "a.inst.cfg"), old_time)
+    _createFile(str(tmp_path / "root" / "sub" / "b.inst.cfg"), old_time)
+    index = ContainerPathIndex()
+    index.listFiles([str(tmp_path / "root")])
+
+    with patch("os.scandir", wraps = os.scandir) as scandir:
+        assert set(index.listFiles([str(tmp_path / "root")])[str(tmp_path / "root")]) == {str(tmp_path / "root" / "a.inst.cfg"), str(tmp_path / "root" / "sub" / "b.inst.cfg")}
+        scandir.assert_not_called()
+
+        _createFile(str(tmp_path / "root" / "sub" / "c.inst.cfg"), old_time + 10)
+        assert str(tmp_path / "root" / "sub" / "c.inst.cfg") in index.listFiles([str(tmp_path / "root")])[str(tmp_path / "root")]
+        assert scandir.call_count == 2  # The file changed the modification time of both directories.
+
+
+def test_listRecentlyChangedDirectoriesAgain(tmp_path):
+    _createFile(str(tmp_path / "root" / "a.inst.cfg"), time.time())
+    index = ContainerPathIndex()
+    index.listFiles([str(tmp_path / "root")])
+
+    # Changes in the same tick of the clock wouldn't be noticed, so recent changes can't be trusted.
+    with patch("os.scandir", wraps = os.scandir) as scandir:
+        index.listFiles([str(tmp_path / "root")])
+        scandir.assert_called_once_with(str(tmp_path / "root"))
+
+
+def test_removeDirectories(tmp_path):
+    old_time = time.time() - 100
+    _createFile(str(tmp_path / "root" / "sub" / "a.inst.cfg"), old_time)
+    index = ContainerPathIndex()
+    index.listFiles([str(tmp_path / "root")])
+    assert set(index.getDirectories()) == {str(tmp_path / "root"), str(tmp_path / "root" / "sub")}
+
+    index.listFiles([str(tmp_path / "root" / "sub")])
+    assert index.getDirectories() == [str(tmp_path / "root" / "sub")]
+
+
+def test_saveAndLoad(tmp_path):
+    old_time = time.time() - 100
+    _createFile(str(tmp_path / "root" / "sub" / "a.inst.cfg"), old_time)
+    index = ContainerPathIndex()
+    index.listFiles([str(tmp_path / "root")])
+    assert index.isChanged()
+    index.save(str(tmp_path / "cache" / "index.json"))
+    assert not index.isChanged()
+
+    loaded_index = ContainerPathIndex.load(str(tmp_path / "cache" / "index.json"))
+    with patch("os.scandir", wraps = os.scandir) as scandir:
+        assert loaded_index.listFiles([str(tmp_path / "root")]) == {str(tmp_path / "root"): [str(tmp_path / "root" / "sub" / "a.inst.cfg")]}
+        scandir.assert_not_called()
+    assert not loaded_index.isChanged()
+
+
+def test_loadInvalid(tmp_path):
+    assert ContainerPathIndex.load(str(tmp_path / "does_not_exist.json")).getDirectories() == []
+    with open(str(tmp_path / "index.json"), "w") as f:
+        f.write("{\"version\": 1, \"directories\": {")
+    assert ContainerPathIndex.load(str(tmp_path / "index.json")).getDirectories() == []
+    with open(str(tmp_path / "index.json"), "w") as f:
+        f.write("{\"version\": 0, \"directories\": {\"/some/directory\": [0, [], []]}}")
+    assert ContainerPathIndex.load(str(tmp_path / "index.json")).getDirectories() == []
@@ -105,4 +105,31 @@ def test_getPositionAndType():
     mesh_data = MeshData(zero_position=Vector(0, 12, 13), center_position=Vector(10, 20, 30), type = MeshType.pointcloud)
     assert mesh_data.getZeroPosition() == Vector(0, 12, 13)
     assert mesh_data.getCenterPosition() == Vector(10, 20, 30)
-    assert mesh_data.getType() == MeshType.pointcloud
\ No newline at end of file
+    assert mesh_data.getType() == MeshType.pointcloud
+
+def test_facesConnections():
+    # Two triangles sharing the edge between vertex 1 and 2, plus one triangle that's not connected to anything.
+    vertices = numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0], [5, 5, 5], [6, 5, 5], [5, 6, 5]], dtype = numpy.float32)
+    indices = numpy.array([[0, 1, 2], [2, 1, 3], [4, 5, 6]], dtype = numpy.int32)
+    mesh_data = MeshData(vertices = vertices, indices = indices)
+
+    connections = mesh_data.getFacesConnections()
+    assert connections.tolist() == [[-1, 1, -1], [0, -1, -1], [-1, -1, -1]]
+    assert mesh_data.getFaceNeighbourIDs(1).tolist() == [0, -1, -1]
+    assert mesh_data.getFacesConnections() is connections  # Only built once.
+
+    # The same triangles without indices, where each triangle has its own copies of the vertices.
+    soup = MeshData(vertices = vertices[indices.ravel()])
+    assert soup.getFacesConnections().tolist() == connections.tolist()
+
+
+def test_facesConnectionsCube():
+    builder = MeshBuilder()
+    builder.addCube(20, 20, 20)
+    connections = builder.build().getFacesConnections()
+
+    assert connections.shape == (12, 3)
+    assert (connections >= 0).all()  # A closed mesh.
+    for face_id, neighbours in enumerate(connections):
+        for neighbour in neighbours:
+            assert face_id in connections[neighbour]
@@ -0,0 +1,100 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+from unittest.mock import MagicMock, patch
+
+from UM.SaveFile import SaveFile
+from UM.SaveQueue import SaveQueue
+
+
+def _read(path):
+    with open(path, encoding = "utf-8") as f:
+        return f.read()
+
+
+def test_write(tmp_path):
+    path = str(tmp_path / "file.cfg")
+    queue = SaveQueue()
+    queue.write(path, "contents")
+    assert _read(path) == "contents"
+
+    with patch("UM.SaveQueue.SaveFile", wraps = SaveFile) as save_file:
+        queue.write(path, "contents")  # Unchanged, so it's not written again.
+        save_file.assert_not_called()
+
+        queue.write(path, "changed")
+        save_file.assert_called_once()
+    assert _read(path) == "changed"
+
+
+def test_writeUnchangedFromOtherSource(tmp_path):
+    path = str(tmp_path / "file.cfg")
+    with open(path, "w", encoding = "utf-8") as f:
+        f.write("contents")
+
+    with patch("UM.SaveQueue.SaveFile", wraps = SaveFile) as save_file:
+        SaveQueue().write(path, "contents")
+        save_file.assert_not_called()
+
+
+def test_writeChangedByOtherSource(tmp_path):
+    path = str(tmp_path / "file.cfg")
+    queue = SaveQueue()
+    queue.write(path, "contents")
+    with open(path, "w", encoding = "utf-8") as f:
+        f.write("other contents")
+
+    queue.write(path, "contents")
+    assert _read(path) == "contents"
+
+
+def test_save(tmp_path):
+    queue = SaveQueue()
+    for index in range(10):
+        queue.save(str(tmp_path / "file_{index}.cfg".format(index = index)), "first {index}".format(index = index))
+        queue.save(str(tmp_path / "file_{index}.cfg".format(index = index)), "second {index}".format(index = index))
+    queue.flush()
+
+    for index in range(10):
+        assert _read(str(tmp_path / "file_{index}.cfg".format(index = index))) == "second {index}".format(index = index)
+
+
+def test_saveUnchanged(tmp_path):
+    path = str(tmp_path / "file.cfg")
+    queue = SaveQueue()
+    queue.write(path, "contents")
+
+    with patch.object(SaveFile, "writeAll", wraps = SaveFile.writeAll) as write_all:
+        queue.save(path, "contents")
+        queue.flush()
+        write_all.assert_called_once_with({})
+
+
+def test_cancel(tmp_path):
+    path = str(tmp_path / "file.cfg")
+    queue = SaveQueue()
+    with queue._condition:  # Keep the thread from starting to write.
+        queue.save(path, "contents")
+        queue.cancel(path)
+    queue.flush()
+    assert not os.path.exists(path)
+
+
+def test_writeAll(tmp_path):
+    errors = SaveFile.writeAll({str(tmp_path / "file.cfg"): "contents", str(tmp_path / "does_not_exist" / "file.cfg"): "contents"})
+    assert list(errors.keys()) == [str(tmp_path / "does_not_exist" / "file.cfg")]
+    assert _read(str(tmp_path / "file.cfg")) == "contents"
+    assert os.listdir(str(tmp_path)) == ["file.cfg"]  # No temporary files left behind.
+
+
+def test_saveFailed(tmp_path):
+    path = str(tmp_path / "does_not_exist" / "file.cfg")
+    on_failed = MagicMock()
+    queue = SaveQueue()
+    queue.save(path, "contents", on_failed)
+    queue.flush()
+
+    on_failed.assert_called_once()
+    assert on_failed.call_args.args[0] == path
+    assert isinstance(on_failed.call_args.args[1], OSError)
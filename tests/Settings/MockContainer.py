@@ -70,7 +70,7 @@ class MockContainer(ContainerInterface, UM.PluginObject.PluginObject):
         pass
 
     def getAllKeys(self):
-        pass
+        return set(getattr(self, "items", {}).keys())
 
     def setProperty(self, key, property_name, property_value, container = None, set_from_cache = False):
         pass
@@ -50,3 +50,24 @@ def test_AdditionalSettingContainer(upgrade_manager: VersionUpgradeManager):
 
     # other settings (from new categories) are added 'dry' to the container:
     assert "_clowns__realityperforator__7_8_9__zharbler" in definition_container.getAllKeys()
+
+
+def test_AdditionalSettingLazyContainer(upgrade_manager: VersionUpgradeManager):
+    plugin = PluginTestClass()
+    settings = plugin.getAdditionalSettingDefinitions()
+
+    DefinitionContainer.setLazyDeserialization(True)
+    try:
+        definition_container = DefinitionContainer("TheSunIsADeadlyLazer")
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", "children.def.json"), encoding = "utf-8") as data:
+            definition_container.deserialize(data.read())
+    finally:
+        DefinitionContainer.setLazyDeserialization(False)
+    definition_container.appendAdditionalSettingDefinitions(settings)
+
+    # The additional settings are found in every way that the settings from the file are.
+    for key in ("_clowns__realityperforator__7_8_9__glombump", "_clowns__realityperforator__7_8_9__zharbler", "test_child_0"):
+        assert key in definition_container.getAllKeys()
+        assert len(definition_container.findDefinitions(key = key)) == 1
+    assert "category_too" in [definition.key for definition in definition_container.definitions]
+    assert "_clowns__realityperforator__7_8_9__glombump" in [child.key for child in definition_container.findDefinitions(key = "test_setting")[0].children]
@@ -46,3 +46,62 @@ def test_matchMultipleTokens():
             assert result is not None
         else:
             assert result is None
+
+
+class MockRegistry:
+    def __init__(self, metadata):
+        self.metadata = metadata
+
+
+def _createMetadata(metadata_class):
+    metadata = metadata_class()
+    metadata["generic_pla"] = {"id": "generic_pla", "type": "material", "base_file": "generic_pla", "definition": "fdmprinter"}
+    metadata["um3_pla"] = {"id": "um3_pla", "type": "material", "base_file": "generic_pla", "definition": "ultimaker3", "brand": "Ultimaker"}
+    metadata["um3_quality"] = {"id": "um3_quality", "type": "quality", "definition": "ultimaker3", "material": "um3_pla", "setting_version": 4}
+    metadata["um3"] = {"id": "um3", "type": "machine", "name": "Ultimaker 3"}
+    return metadata
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"type": "material"},
+    {"type": "material", "definition": "ultimaker3"},
+    {"definition": "ultimaker3", "type": "material", "brand": "Ultimaker"},
+    {"type": "material", "brand": "Other"},
+    {"type": "quality", "setting_version": "4"},  # Indexed by their string representation.
+    {"type": "quality", "setting_version": 4},
+    {"type": "material", "definition": "ultimaker*"},  # Wildcards can't be looked up in the index.
+    {"type": "[quality|machine]"},
+    {"type": "nonexistent"},
+    {"definition": "ultimaker3", "container_type": dict},
+])
+def test_executeIndexed(kwargs):
+    from UM.Settings.MetadataIndex import MetadataIndex
+    ContainerQuery.cache.clear()
+    expected_query = ContainerQuery(MockRegistry(_createMetadata(dict)), **kwargs)
+    expected_query.execute()
+    ContainerQuery.cache.clear()
+
+    query = ContainerQuery(MockRegistry(_createMetadata(MetadataIndex)), **kwargs)
+    query.execute()
+    assert query.getResult() == expected_query.getResult()
+
+    cached_query = ContainerQuery(query._registry, **kwargs)
+    cached_query.execute()
+    assert cached_query.getResult() == expected_query.getResult()
+    ContainerQuery.cache.clear()
+
+
+def test_matchesAndResultContains():
+    query = ContainerQuery(MockRegistry(_createMetadata(dict)), type = "material", definition = "ultimaker*")
+    assert not query.resultContains("um3_pla")  # Not executed yet.
+    query.execute()
+    assert query.resultContains("um3_pla")
+    assert not query.resultContains("generic_pla")
+
+    assert query.matches({"id": "new", "type": "material", "definition": "ultimaker_s5"})
+    assert not query.matches({"id": "new", "type": "quality", "definition": "ultimaker_s5"})
+    assert not query.matches({"id": "new", "type": "material"})
+
+    case_insensitive_query = ContainerQuery(None, ignore_case = True, type = "Material")
+    assert case_insensitive_query.matches({"id": "new", "type": "material"})
+    ContainerQuery.cache.clear()
@@ -2,14 +2,20 @@
 # Uranium is released under the terms of the LGPLv3 or higher.
 
 import os
+import sqlite3
+import threading
+import unittest.mock
 from unittest.mock import MagicMock
 
 import pytest
+from PyQt6.QtCore import QThread
 
 from UM.Resources import Resources
 from UM.Settings.DefinitionContainer import DefinitionContainer
 from UM.Settings.InstanceContainer import InstanceContainer
+from UM.Settings.ContainerQuery import ContainerQuery
 from UM.Settings.ContainerStack import ContainerStack
+from UM.Settings.DatabaseContainerMetadataController import DatabaseMetadataContainerController
 from UM.Settings.SQLQueryFactory import SQLQueryFactory
 
 from .MockContainer import MockContainer
@@ -420,10 +426,31 @@ def test_sqlSelectQuery(sql_queries):
     assert sql_queries.select == "SELECT * FROM test_table WHERE id = ?"
 
 
+def test_sqlSelectAllQuery(sql_queries):
+    assert sql_queries.select_all == "SELECT * FROM test_table"
+
+
 def test_sqlDeleteQuery(sql_queries):
     assert sql_queries.delete == "DELETE FROM test_table WHERE id = ?"
 
 
+def test_databaseControllerBulkOperations(sql_queries):
+    cursor = sqlite3.connect(":memory:").cursor()
+    controller = DatabaseMetadataContainerController(sql_queries)
+    controller.setupTable(cursor)
+    controller.cursor = cursor
+
+    controller.insertMany([{"id": "a", "field_1": "1"}, {"id": "b", "field_2": "2"}, {"id": "c"}])
+    controller.updateMany([{"id": "b", "field_2": "changed"}])
+    controller.deleteMany(["c"])
+
+    all_metadata = controller.getAllMetadata()
+    assert set(all_metadata.keys()) == {"a", "b"}
+    assert all_metadata["a"]["field_1"] == "1"
+    assert all_metadata["b"]["field_2"] == "changed"
+    assert all_metadata["a"] == controller.getMetadata("a")
+
+
 def test_insertInDatabaseCalledOnce(container_registry):
     profile_handler = MagicMock()
     container_registry._database_handlers["profile"] = profile_handler
@@ -486,6 +513,52 @@ def test_isDataUpdatedWhenFileOnDiskIsNewer(container_registry):
     profile_handler.update.assert_called_once()
 
 
+def test_bulkMetadataReconciliation(container_registry):
+    profile_handler = MagicMock()
+    profile_handler.getAllMetadata.return_value = {}
+    container_registry._database_handlers["profile"] = profile_handler
+    container_registry.setBulkMetadataReconciliation(True)
+
+    # The fixture makes sure that the database is cleared before we start, so everything gets inserted in one go.
+    container_registry.loadAllMetadata()
+    profile_handler.insertMany.assert_called_once()
+    assert [metadata["id"] for metadata in profile_handler.insertMany.call_args[0][0]] == ["setting_values"]
+    profile_handler.updateMany.assert_called_once_with([])
+    profile_handler.getAllMetadata.assert_called_once()
+
+    # Make the database older than the file on disk, so that only that one is read and updated.
+    container_registry._db_connection.execute("UPDATE containers SET last_modified = 0 WHERE id = 'setting_values'")
+    container_registry._db_connection.execute("commit")
+    container_registry.loadAllMetadata()
+    assert profile_handler.insertMany.call_args[0][0] == []
+    assert [metadata["id"] for metadata in profile_handler.updateMany.call_args[0][0]] == ["setting_values"]
+
+
+def test_clearQueryCacheByContainer(container_registry):
+    container_registry.findContainersMetadata(type = "material")
+    container_registry.findContainersMetadata(type = "quality")
+    container_registry.findContainersMetadata(name = "Test*")
+    assert (False, "type", "material") in ContainerQuery.cache
+    assert (False, "type", "quality") in ContainerQuery.cache
+    assert (False, "name", "Test*") in ContainerQuery.cache
+
+    # Only the queries that the new container matches are affected.
+    container = InstanceContainer("new_material")
+    container.setMetaDataEntry("type", "material")
+    container.setName("Test material")
+    container_registry.addContainer(container)
+    assert (False, "type", "material") not in ContainerQuery.cache
+    assert (False, "type", "quality") in ContainerQuery.cache
+    assert (False, "name", "Test*") not in ContainerQuery.cache
+    assert container_registry.findContainersMetadata(type = "material") == [container.getMetaData()]
+
+    # If the container no longer matches, the queries that found it before are affected too.
+    container.setMetaDataEntry("type", "quality")
+    assert (False, "type", "material") not in ContainerQuery.cache
+    assert (False, "type", "quality") not in ContainerQuery.cache
+    assert container_registry.findContainersMetadata(type = "material") == []
+
+
 def test_findLazyLoadedContainers(container_registry):
     container_registry.loadAllMetadata()
     container_registry.containerLoadComplete.emit = MagicMock()
@@ -496,6 +569,79 @@ def test_findLazyLoadedContainers(container_registry):
     assert container_registry.containerLoadComplete.emit.call_count == 1
 
 
+def test_loadAsync(container_registry):
+    ContainerQuery.cache.clear()
+    container_registry.loadAsync(["setting_values"])
+    container = container_registry.getLoadingFuture("setting_values").result(timeout = 10)
+    assert container.getId() == "setting_values"
+    assert container_registry.getLoadingFuture("single_setting") is None  # Only its metadata is loaded.
+
+    # Asking for the container only waits for that container, and adds it to the registry.
+    container_registry.containerLoadComplete.emit = MagicMock()
+    assert container_registry.findInstanceContainers(id = "setting_values") == [container]
+    assert container_registry.isLoaded("setting_values")
+    container_registry.containerLoadComplete.emit.assert_called_once_with("setting_values")
+
+    container_registry.waitForLoading()
+    assert not container_registry.isLoading()
+    assert container_registry.findInstanceContainers(id = "setting_values") == [container]
+    assert [metadata["id"] for metadata in container_registry.findInstanceContainersMetadata(author = "Ultimaker")] == ["metadata_instance"]
+    assert not container_registry.isLoaded("metadata_instance")
+
+
+def test_loadAsyncStack(container_registry, test_containers_provider):
+    stack = ContainerStack("test_stack")
+    stack.addContainer(test_containers_provider.loadContainer("setting_values"))
+    serialized = stack.serialize()
+    test_containers_provider._containers["test_stack"] = stack
+    test_containers_provider.addMetadata(stack.getMetaData())
+
+    # Like a provider that reads files, the stack is deserialized on the thread that loads it.
+    def loadContainer(container_id):
+        if container_id != "test_stack":
+            return test_containers_provider._containers[container_id]
+        loaded_stack = ContainerStack(container_id)
+        loaded_stack.deserialize(serialized)
+        return loaded_stack
+
+    with unittest.mock.patch.object(test_containers_provider, "loadContainer", loadContainer):
+        container_registry.loadAsync(["test_stack"])
+        loaded_stack = container_registry.findContainerStacks(id = "test_stack")[0]
+        assert loaded_stack is not stack
+        assert loaded_stack.thread() is QThread.currentThread()  # Not owned by the thread that created it, which has ended.
+        assert container_registry.isLoaded("setting_values")  # The containers of the stack were added with it.
+        assert loaded_stack.getContainers() == container_registry.findInstanceContainers(id = "setting_values")
+        container_registry.waitForLoading()
+
+
+def test_loadAsyncDatabaseAccess(container_registry):
+    profile_handler = MagicMock()
+    container_registry._database_handlers["profile"] = profile_handler
+    reconciling = threading.Event()
+    finish_reconciling = threading.Event()
+    inserted = []
+
+    def insert(metadata):
+        inserted.append(metadata["id"])
+        if threading.current_thread() is container_registry._loading_thread:
+            reconciling.set()
+            finish_reconciling.wait(timeout = 10)
+    profile_handler.insert.side_effect = insert
+
+    container_registry.loadAsync()
+    assert reconciling.wait(timeout = 10)
+    writer = threading.Thread(target = lambda: container_registry._addMetadataToDatabase({"id": "new_profile", "type": "profile"}))
+    writer.start()
+    writer.join(timeout = 0.2)
+    assert writer.is_alive()  # Waits until the thread of loadAsync is done with the database.
+    assert inserted[-1] != "new_profile"
+
+    finish_reconciling.set()
+    writer.join(timeout = 10)
+    assert inserted[-1] == "new_profile"
+    container_registry.waitForLoading()
+
+
 ##  Tests the making of a unique name for containers in the registry.
 #
 #   \param container_registry A new container registry from a fixture.
@@ -4,7 +4,7 @@
 from typing import Optional
 import os
 import uuid # For creating unique ID's for each container stack.
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -15,8 +15,11 @@ from UM.Settings.ContainerStack import IncorrectVersionError
 from UM.Settings.ContainerStack import InvalidContainerStackError
 from UM.Settings.DefinitionContainer import DefinitionContainer
 from UM.Settings.InstanceContainer import InstanceContainer
+from UM.Settings.PropertyEvaluationContext import PropertyEvaluationContext
+from UM.Settings.SettingFunction import SettingFunction
 from UM.Settings.Validator import ValidatorState
 from UM.Resources import Resources
+from UM.Signal import Signal
 
 from .MockContainer import MockContainer
 
@@ -824,3 +827,220 @@ def test_getHasErrors(container_stack):
     assert container_stack.hasErrors() # Now the container stack has errors!
 
     assert container_stack.getErrorKeys() == ["test_key"]
+
+
+def test_selectiveCacheInvalidation(container_stack, upgrade_manager):
+    definition_container = DefinitionContainer(str(uuid.uuid4()))
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", "functions.def.json"), encoding = "utf-8") as data:
+        definition_container.deserialize(data.read())
+    user_container = MockContainer({"id": "user"})
+    user_container.items = {"test_setting_0": 20, "unrelated_setting": 1}
+    container_stack.addContainer(definition_container)
+    container_stack.addContainer(user_container)
+    container_stack.setSelectiveCacheInvalidation(True)
+    assert container_stack.isSelectiveCacheInvalidation()
+
+    assert container_stack.getProperty("test_setting_1", "value") == 200
+    assert container_stack.getProperty("unrelated_setting", "value") == 1
+
+    # Change both values, but only report a change of test_setting_0.
+    user_container.items = {"test_setting_0": 30, "unrelated_setting": 2}
+    container_stack._collectPropertyChanges("test_setting_0", "value")
+
+    assert container_stack.getProperty("test_setting_0", "value") == 30
+    assert container_stack.getProperty("test_setting_1", "value") == 300  # Depends on test_setting_0, so it was re-evaluated.
+    assert container_stack.getProperty("unrelated_setting", "value") == 1  # Still cached.
+
+    # A setting without definition can't be traced, so everything is invalidated.
+    container_stack._collectPropertyChanges("unknown_setting", "value")
+    assert container_stack.getProperty("unrelated_setting", "value") == 2
+
+
+def test_selectiveCacheInvalidationOfInstanceFunctions(container_stack, upgrade_manager):
+    definition_container = DefinitionContainer(str(uuid.uuid4()))
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", "functions.def.json"), encoding = "utf-8") as data:
+        definition_container.deserialize(data.read())
+    profile_container = MockContainer({"id": "profile"})
+    profile_container.items = {"profile_setting": SettingFunction("test_setting_0 * 2")}  # Not a relation of the definitions.
+    user_container = MockContainer({"id": "user"})
+    user_container.items = {"test_setting_0": 1, "unrelated_setting": 1}
+    container_stack.addContainer(definition_container)
+    container_stack.addContainer(profile_container)
+    container_stack.addContainer(user_container)
+    container_stack.setSelectiveCacheInvalidation(True)
+
+    assert container_stack.getProperty("profile_setting", "value") == 2
+    assert container_stack.getProperty("unrelated_setting", "value") == 1
+
+    user_container.items = {"test_setting_0": 10, "unrelated_setting": 2}
+    container_stack._collectPropertyChanges("test_setting_0", "value")
+    assert container_stack.getProperty("profile_setting", "value") == 20  # The function in the profile uses test_setting_0.
+    assert container_stack.getProperty("unrelated_setting", "value") == 1  # Still cached.
+
+    # If a function in the containers can't be followed, everything is invalidated.
+    profile_container.items = {"profile_setting": SettingFunction("test_setting_0 *")}
+    container_stack._collectPropertyChanges("test_setting_0", "value")
+    assert container_stack.getProperty("unrelated_setting", "value") == 2
+
+
+def test_selectiveCacheInvalidationFindsDependentsOnce(container_stack, upgrade_manager):
+    definition_container = DefinitionContainer(str(uuid.uuid4()))
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", "functions.def.json"), encoding = "utf-8") as data:
+        definition_container.deserialize(data.read())
+    profile_container = MockContainer({"id": "profile"})
+    profile_container.items = {"profile_setting": SettingFunction("test_setting_0 * 2")}
+    profile_container.getGeneration = MagicMock(return_value = 1)
+    user_container = MockContainer({"id": "user"})
+    user_container.items = {"test_setting_0": 1}
+    user_container.getGeneration = MagicMock(return_value = 1)
+    container_stack.addContainer(definition_container)
+    container_stack.addContainer(profile_container)
+    container_stack.addContainer(user_container)
+    container_stack.setSelectiveCacheInvalidation(True)
+
+    with patch.object(ContainerStack, "_findDependents", wraps = ContainerStack._findDependents) as find_dependents:
+        container_stack._collectPropertyChanges("test_setting_0", "value")
+        container_stack._collectPropertyChanges("test_setting_0", "value")
+        assert find_dependents.call_count == 2  # Once for each container, since they didn't change in the meanwhile.
+
+        profile_container.items = {"profile_setting": SettingFunction("test_setting_0 * 3")}
+        profile_container.getGeneration.return_value = 2
+        container_stack._collectPropertyChanges("test_setting_0", "value")
+        assert find_dependents.call_count == 3
+        find_dependents.assert_called_with(profile_container)
+    assert container_stack.getProperty("profile_setting", "value") == 3
+
+
+def test_collectPropertiesChanges(container_stack, upgrade_manager):
+    definition_container = DefinitionContainer(str(uuid.uuid4()))
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", "functions.def.json"), encoding = "utf-8") as data:
+        definition_container.deserialize(data.read())
+    instance_container = InstanceContainer("user")
+    instance_container.propertiesChangedBatch = Signal(Signal.Direct)
+    container_stack._collectPropertiesChanges = MagicMock()
+    container_stack.addContainer(definition_container)
+    container_stack.addContainer(instance_container)
+
+    # The batches of the instance containers in the stack are collected by the stack.
+    instance_container.propertiesChangedBatch.emit({"test_setting_1": {"value", "validationState"}})
+    container_stack._collectPropertiesChanges.assert_called_once_with({"test_setting_1": {"value", "validationState"}})
+
+    container_stack.removeContainer(0)  # The instance container was added last, so it's on top.
+    instance_container.propertiesChangedBatch.emit({"test_setting_1": {"value"}})
+    assert container_stack._collectPropertiesChanges.call_count == 1
+    del container_stack._collectPropertiesChanges
+
+    container_stack._emit_property_changed_queued = True  # Don't let callLater emit them right away. They're emitted below.
+    container_stack._collectPropertyChanges("test_setting_0", "value")
+    container_stack._collectPropertiesChanges({"test_setting_1": {"value", "validationState"}, "test_setting_0": {"state"}})
+    assert container_stack._property_changes == {"test_setting_0": {"value", "state"}, "test_setting_1": {"value", "validationState"}}
+
+    container_stack.propertiesChanged = MagicMock()
+    container_stack.propertiesChangedBatch = MagicMock()
+    container_stack._emitCollectedPropertyChanges()
+    assert container_stack.propertiesChanged.emit.call_count == 2
+    container_stack.propertiesChangedBatch.emit.assert_called_once_with({"test_setting_0": {"value", "state"}, "test_setting_1": {"value", "validationState"}})
+    assert container_stack._property_changes == {}
+
+
+def test_getPropertyWithChangingContext(container_stack):
+    container_a = MockContainer({"id": "a"})
+    container_a.items = {"k": 1}
+    container_b = MockContainer({"id": "b"})
+    container_b.items = {"k": 2}
+    container_stack.addContainer(container_b)
+    container_stack.addContainer(container_a)  # On top.
+    context = PropertyEvaluationContext(container_stack)
+
+    assert container_stack.getProperty("k", "value", context = context) == 1
+    assert container_stack.getProperty("k", "value", context) == 1
+    # The context changes between the calls, so the results with that context can't come from a cache.
+    context.context["evaluate_from_container_index"] = 1
+    assert container_stack.getProperty("k", "value", context = context) == 2
+    assert container_stack.getProperty("k", "value", context) == 2
+    assert container_stack.getProperty("k", "value") == 1
+
+
+def test_getProperties(container_stack, upgrade_manager):
+    definition_container = DefinitionContainer(str(uuid.uuid4()))
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", "functions.def.json"), encoding = "utf-8") as data:
+        definition_container.deserialize(data.read())
+    user_container = MockContainer({"id": "user"})
+    user_container.items = {"test_setting_0": 20}
+    container_stack.addContainer(definition_container)
+    container_stack.addContainer(user_container)
+
+    keys = ["test_setting_0", "test_setting_1", "unknown_setting"]
+    property_names = ["value", "type", "label"]
+    result = container_stack.getProperties(keys, property_names)
+    assert result == {key: {property_name: container_stack.getProperty(key, property_name) for property_name in property_names} for key in keys}
+    assert result["test_setting_1"]["value"] == 200
+
+    # Properties that are not in this stack are taken from the next stack.
+    next_stack = ContainerStack(str(uuid.uuid4()))
+    next_stack.addContainer(definition_container)
+    container_stack.removeContainer(1)
+    container_stack.setNextStack(next_stack)
+    assert container_stack.getProperties(["test_setting_1"], ["value", "type"]) == {"test_setting_1": {"value": 200, "type": "int"}}
+
+
+def test_getValueSnapshot(container_stack, upgrade_manager):
+    definition_container = DefinitionContainer(str(uuid.uuid4()))
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", "functions.def.json"), encoding = "utf-8") as data:
+        definition_container.deserialize(data.read())
+    container_stack.addContainer(definition_container)
+    generation = container_stack.getGeneration()
+
+    snapshot = container_stack.getValueSnapshot()
+    assert dict(snapshot) == {"test_setting_0": 10, "test_setting_1": 100}
+    assert snapshot.getGeneration() == generation
+    assert snapshot.getStackId() == container_stack.getId()
+    assert container_stack.getValueSnapshot() is snapshot  # Nothing changed, so no need to evaluate again.
+
+    # Changing the containers of the stack or of the next stack gives a new generation.
+    user_container = MockContainer({"id": "user"})
+    user_container.items = {"test_setting_0": 20}
+    container_stack.addContainer(user_container)
+    assert container_stack.getGeneration() > generation
+    new_snapshot = container_stack.getValueSnapshot()
+    assert dict(new_snapshot) == {"test_setting_0": 20, "test_setting_1": 200}
+    assert dict(snapshot) == {"test_setting_0": 10, "test_setting_1": 100}  # Old snapshot doesn't change.
+
+    generation = container_stack.getGeneration()
+    next_stack = ContainerStack(str(uuid.uuid4()))
+    container_stack.setNextStack(next_stack)
+    assert container_stack.getGeneration() > generation
+    generation = container_stack.getGeneration()
+    next_stack.addContainer(MockContainer({"id": "next"}))
+    assert container_stack.getGeneration() > generation
+
+
+def test_getPropertiesOfSiblings(upgrade_manager):
+    definition_container = DefinitionContainer(str(uuid.uuid4()))
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", "functions.def.json"), encoding = "utf-8") as data:
+        definition_container.deserialize(data.read())
+    global_user_container = MockContainer({"id": "global_user"})
+    global_user_container.items = {}
+    global_user_container.getProperty = MagicMock(return_value = None)
+    global_stack = ContainerStack(str(uuid.uuid4()))
+    global_stack.addContainer(definition_container)
+    global_stack.addContainer(global_user_container)
+
+    siblings = []
+    for position in range(4):
+        user_container = MockContainer({"id": "user_{}".format(position)})
+        user_container.items = {"test_setting_0": 20} if position == 0 else {}  # Only the first sibling overrides something.
+        sibling = ContainerStack(str(uuid.uuid4()))
+        sibling.addContainer(user_container)
+        sibling.setNextStack(global_stack)
+        siblings.append(sibling)
+
+    keys = ["test_setting_0", "test_setting_1"]
+    results = ContainerStack.getPropertiesOfSiblings(siblings, keys, ["value", "type"])
+    assert results == [sibling.getProperties(keys, ["value", "type"]) for sibling in siblings]
+    assert results[0]["test_setting_1"]["value"] == 200
+    assert results[1]["test_setting_1"]["value"] == 100
+
+    global_user_container.getProperty.reset_mock()
+    ContainerStack.getPropertiesOfSiblings(siblings, keys, ["value"])
+    assert global_user_container.getProperty.call_count == len(keys)  # The global stack is only walked once for all siblings.
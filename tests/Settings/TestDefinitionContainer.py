@@ -1,14 +1,18 @@
 # Copyright (c) 2017 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import json
+import pickle
 import pytest
 import os.path
 import uuid
+from unittest.mock import MagicMock, patch
 
 import UM.Settings.SettingFunction
 import UM.Settings.DefinitionContainer
 from UM.Settings.DefinitionContainer import IncorrectDefinitionVersionError, InvalidDefinitionError
 from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings.SettingInstance import SettingInstance
 from UM.Resources import Resources
 from UM.VersionUpgradeManager import VersionUpgradeManager
 
@@ -92,6 +96,28 @@ def test_deserializeMetadata(file, expected, definition_container, upgrade_manag
         assert metadata[0][key] == value
 
 
+def test_parseMetadataWithParent():
+    serialized = json.dumps({"version": 2, "name": "Child", "inherits": "parent", "metadata": {"author": "Child author"}})
+    parsed = UM.Settings.DefinitionContainer.DefinitionContainer.parseMetadata(serialized, "child")
+    assert parsed == [{"inherits": "parent", "container_type": UM.Settings.DefinitionContainer.DefinitionContainer, "id": "child", "name": "Child", "version": 2, "author": "Child author"}]
+
+    registry = MagicMock()
+    registry.findDefinitionContainersMetadata.return_value = [{"id": "parent", "name": "Parent", "author": "Parent author", "category": "Parent category"}]
+    with patch("UM.Settings.ContainerRegistry.ContainerRegistry.getInstance", MagicMock(return_value = registry)):
+        completed = UM.Settings.DefinitionContainer.DefinitionContainer.completeParsedMetadata(parsed[0])
+    assert completed["id"] == "child"
+    assert completed["name"] == "Child"
+    assert completed["author"] == "Child author"
+    assert completed["category"] == "Parent category"  # Inherited.
+    assert completed["inherits"] == "parent"
+
+    registry.findDefinitionContainersMetadata.return_value = []  # Parent is missing, so it is ignored.
+    with patch("UM.Settings.ContainerRegistry.ContainerRegistry.getInstance", MagicMock(return_value = registry)):
+        completed = UM.Settings.DefinitionContainer.DefinitionContainer.completeParsedMetadata(parsed[0])
+    assert "inherits" not in completed
+    assert completed["author"] == "Child author"
+
+
 ##  Tests deserialising bad definition container JSONs.
 #
 #   \param definition_container A definition container from a fixture.
@@ -369,6 +395,95 @@ def test_setting_function():
     assert result == (setting_0.default_value * 10)
 
 
+@pytest.fixture(params = [False, True], ids = ["eager", "lazy"])
+def lazy_deserialization(request):
+    UM.Settings.DefinitionContainer.DefinitionContainer.setLazyDeserialization(request.param)
+    yield request.param
+    UM.Settings.DefinitionContainer.DefinitionContainer.setLazyDeserialization(False)
+
+
+def test_getAffectedProperties(lazy_deserialization, upgrade_manager: VersionUpgradeManager):
+    container = UM.Settings.DefinitionContainer.DefinitionContainer("test")
+    container.deserialize(json.dumps({
+        "name": "Test", "version": UM.Settings.DefinitionContainer.DefinitionContainer.Version, "metadata": {},
+        "settings": {
+            "layer_height": {"label": "Layer Height", "type": "float", "default_value": 0.1, "description": "Test"},
+            "wall_thickness": {"label": "Wall Thickness", "type": "float", "default_value": 1, "description": "Test", "minimum_value": "layer_height * 2"},
+            "top_layers": {"label": "Top Layers", "type": "int", "default_value": 1, "description": "Test", "value": "wall_thickness / layer_height"},
+            "top_thickness": {"label": "Top Thickness", "type": "float", "default_value": 1, "description": "Test", "value": "top_layers * layer_height", "maximum_value": "top_layers * 10"},
+            "independent": {"label": "Independent", "type": "int", "default_value": 1, "description": "Test"}
+        }
+    }))
+
+    # The property that the relation is for is the property of the setting that depends on it.
+    assert set(container.getAffectedProperties("layer_height", "value")) == {("top_layers", "value"), ("top_thickness", "value"), ("top_thickness", "maximum_value")}
+    assert set(container.getAffectedProperties("layer_height", "minimum_value")) == {("wall_thickness", "minimum_value"), ("top_layers", "value"), ("top_thickness", "value"), ("top_thickness", "maximum_value")}
+    assert set(container.getAffectedProperties("wall_thickness", "value")) == {("top_layers", "value"), ("top_thickness", "value"), ("top_thickness", "maximum_value")}
+    assert container.getAffectedProperties("wall_thickness", "minimum_value") == ()
+    assert container.getAffectedProperties("independent", "value") == ()
+    assert container.getAffectedProperties("non_existent", "value") == ()
+
+    # Must give the same result as following the relations one by one.
+    for key in container.getAllKeys():
+        definition = container.findDefinitions(key = key)[0]
+        for property_name in ["value", "minimum_value", "maximum_value"]:
+            expected = SettingInstance._listRelations(key, frozenset(), definition.relationsAsFrozenSet(), frozenset([property_name]))
+            assert set(container.getAffectedProperties(key, property_name)) == {(relation.target.key, relation.role) for relation in expected}
+
+    # The index is stored along with the definitions.
+    unpickled = pickle.loads(pickle.dumps(container))
+    assert unpickled._relation_closure == container._relation_closure
+
+
+def test_resolveInheritanceOnce(upgrade_manager: VersionUpgradeManager):
+    definitions_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions")
+    with open(os.path.join(definitions_path, "inherits.def.json"), encoding = "utf-8") as f:
+        serialized = f.read()
+    UM.Settings.DefinitionContainer.DefinitionContainer.clearResolvedFiles()
+
+    with patch.object(json, "load", wraps = json.load) as load:
+        first = UM.Settings.DefinitionContainer.DefinitionContainer("first")
+        first.deserialize(serialized)
+        second = UM.Settings.DefinitionContainer.DefinitionContainer("second")
+        second.deserialize(serialized)
+    assert load.call_count == 1  # The parent was only parsed for the first definition.
+
+    for container in (first, second):
+        assert container.getInheritedFiles() == [os.path.join(definitions_path, "single_setting.def.json")]
+        assert container.getProperty("test_setting", "default_value") == 11  # Overridden.
+        assert container.getProperty("test_setting_1", "default_value") == 10
+
+    # The overrides didn't change the parent that is shared between them.
+    parent, _, _ = first._loadResolvedFile(os.path.join(definitions_path, "single_setting.def.json"))
+    assert parent["settings"]["test_setting"]["default_value"] == 10
+    UM.Settings.DefinitionContainer.DefinitionContainer.clearResolvedFiles()
+
+
+@pytest.mark.parametrize("file_name", ["children.def.json", "functions.def.json", "inherits.def.json", "multiple_settings.def.json"])
+def test_lazyDeserialize(file_name, upgrade_manager: VersionUpgradeManager):
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", file_name), encoding = "utf-8") as f:
+        serialized = f.read()
+    eager = UM.Settings.DefinitionContainer.DefinitionContainer("eager")
+    eager.deserialize(serialized)
+    UM.Settings.DefinitionContainer.DefinitionContainer.setLazyDeserialization(True)
+    try:
+        lazy = UM.Settings.DefinitionContainer.DefinitionContainer("lazy")
+        lazy.deserialize(serialized)
+    finally:
+        UM.Settings.DefinitionContainer.DefinitionContainer.setLazyDeserialization(False)
+
+    assert lazy.getName() == eager.getName()
+    assert lazy.getAllKeys() == eager.getAllKeys()
+    assert lazy._definition_cache == {}  # Nothing was created yet.
+    for key in sorted(eager.getAllKeys()):
+        lazy_definition = lazy.findDefinitions(key = key)[0]
+        eager_definition = eager.findDefinitions(key = key)[0]
+        assert lazy_definition.getPropertyValues() == eager_definition.getPropertyValues()
+        assert [child.key for child in lazy_definition.children] == [child.key for child in eager_definition.children]
+        assert {(relation.type, relation.role, relation.target.key) for relation in lazy_definition.relations} == {(relation.type, relation.role, relation.target.key) for relation in eager_definition.relations}
+    assert lazy.definitions == eager.definitions
+
+
 ##  Creates a setting definition from a dictionary of properties.
 #
 #   The key must be present in the properties. It will be the key of the setting
@@ -0,0 +1,126 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os.path
+import pickle
+import struct
+
+import pytest
+
+from UM.Resources import Resources
+from UM.Settings import DefinitionContainerBinaryCache
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.DefinitionContainerBinaryCache import readBinaryCache, writeBinaryCache
+from UM.Settings.SettingFunction import SettingFunction
+from UM.VersionUpgradeManager import VersionUpgradeManager
+
+Resources.addSearchPath(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loadDefinition(file_name: str) -> DefinitionContainer:
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "definitions", file_name + ".def.json")
+    container = DefinitionContainer(file_name)
+    with open(path, encoding = "utf-8") as f:
+        container.deserialize(f.read(), path)
+    container.setPath(path)
+    return container
+
+
+def _assertEqualDefinitions(expected: DefinitionContainer, actual: DefinitionContainer) -> None:
+    assert actual.getId() == expected.getId()
+    assert actual.getMetaData() == expected.getMetaData()
+    assert actual.getInheritedFiles() == expected.getInheritedFiles()
+    assert actual.getPath() == expected.getPath()
+    assert actual.getAllKeys() == expected.getAllKeys()
+    for key in expected.getAllKeys():
+        expected_definition = expected.findDefinitions(key = key)[0]
+        actual_definition = actual.findDefinitions(key = key)[0]
+        assert actual_definition.getPropertyValues() == expected_definition.getPropertyValues()
+        assert [child.key for child in actual_definition.children] == [child.key for child in expected_definition.children]
+        assert {(relation.type, relation.role, relation.target.key) for relation in actual_definition.relations} == {(relation.type, relation.role, relation.target.key) for relation in expected_definition.relations}
+        for property_name in expected_definition.getPropertyValues():
+            assert set(actual.getAffectedProperties(key, property_name)) == set(expected.getAffectedProperties(key, property_name))
+    assert [definition.key for definition in actual.definitions] == [definition.key for definition in expected.definitions]
+
+
+@pytest.mark.parametrize("file_name", ["children", "functions", "inherits", "multiple_settings"])
+def test_roundtrip(file_name, tmp_path, upgrade_manager: VersionUpgradeManager):
+    expected = _loadDefinition(file_name)
+    writeBinaryCache(expected, str(tmp_path / "cache.bin"))
+
+    _assertEqualDefinitions(expected, readBinaryCache(str(tmp_path / "cache.bin")))
+
+
+def test_createsSettingsWhenNeeded(tmp_path, upgrade_manager: VersionUpgradeManager):
+    writeBinaryCache(_loadDefinition("functions"), str(tmp_path / "cache.bin"))
+    container = readBinaryCache(str(tmp_path / "cache.bin"))
+
+    assert "test_setting_1" in container.getAllKeys()
+    assert container._definition_cache == {}  # Nothing needed to be created for that.
+
+    function = container.getProperty("test_setting_1", "value")
+    assert isinstance(function, SettingFunction)
+    assert function.getUsedSettingKeys() == {"test_setting_0"}
+    assert container._definition_source is not None  # Not all settings were created.
+
+    container.definitions
+    assert container._definition_source is None
+
+
+def test_pickle(tmp_path, upgrade_manager: VersionUpgradeManager):
+    expected = _loadDefinition("functions")
+    writeBinaryCache(expected, str(tmp_path / "cache.bin"))
+
+    _assertEqualDefinitions(expected, pickle.loads(pickle.dumps(readBinaryCache(str(tmp_path / "cache.bin")))))
+
+
+def test_differentVersion(tmp_path, upgrade_manager: VersionUpgradeManager):
+    writeBinaryCache(_loadDefinition("children"), str(tmp_path / "cache.bin"))
+    with open(str(tmp_path / "cache.bin"), "r+b") as f:
+        f.seek(4)
+        f.write(struct.pack("<H", DefinitionContainerBinaryCache.FORMAT_VERSION + 1))
+
+    assert readBinaryCache(str(tmp_path / "cache.bin")) is None
+
+
+def test_damaged(tmp_path, upgrade_manager: VersionUpgradeManager):
+    writeBinaryCache(_loadDefinition("children"), str(tmp_path / "cache.bin"))
+    with open(str(tmp_path / "cache.bin"), "r+b") as f:
+        f.truncate(os.path.getsize(str(tmp_path / "cache.bin")) - 10)
+
+    with pytest.raises(ValueError):
+        readBinaryCache(str(tmp_path / "cache.bin"))
+
+
+def test_damagedSetting(tmp_path, upgrade_manager: VersionUpgradeManager):
+    writeBinaryCache(_loadDefinition("functions"), str(tmp_path / "cache.bin"))
+    with open(str(tmp_path / "cache.bin"), "r+b") as f:
+        header = DefinitionContainerBinaryCache._HEADER.unpack(f.read(DefinitionContainerBinaryCache._HEADER.size))
+        f.seek(header[14] + DefinitionContainerBinaryCache._BYTECODE_LENGTH.size)  # In the bytecode of the first function.
+        first_byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([first_byte[0] ^ 0xFF]))
+
+    # The settings are only checked when they are read.
+    container = readBinaryCache(str(tmp_path / "cache.bin"))
+    assert "test_setting_1" in container.getAllKeys()
+    with pytest.raises(ValueError):
+        container.getProperty("test_setting_1", "value")
+
+
+def test_appendAdditionalSettings(tmp_path, upgrade_manager: VersionUpgradeManager):
+    writeBinaryCache(_loadDefinition("children"), str(tmp_path / "cache.bin"))
+    container = readBinaryCache(str(tmp_path / "cache.bin"))
+    container.appendAdditionalSettingDefinitions({
+        "test_setting": {"children": {"plugin_child": {"label": "Plugin Child", "description": "Test", "type": "int", "default_value": 1}}},
+        "plugin_category": {"label": "Plugin Category", "description": "Test", "type": "category", "children": {
+            "plugin_setting": {"label": "Plugin Setting", "description": "Test", "type": "int", "default_value": 2}
+        }}
+    })
+
+    for key in ("plugin_child", "plugin_setting", "test_child_0"):
+        assert key in container.getAllKeys()
+        assert len(container.findDefinitions(key = key)) == 1
+    assert container.getProperty("plugin_setting", "default_value") == 2
+    assert "plugin_category" in [definition.key for definition in container.definitions]
+    assert "plugin_child" in [child.key for child in container.findDefinitions(key = "test_setting")[0].children]
@@ -0,0 +1,44 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+from UM.Settings.MetadataIndex import MetadataIndex
+
+
+def test_findIds():
+    index = MetadataIndex()
+    index["a"] = {"id": "a", "type": "material", "definition": "fdmprinter"}
+    index["b"] = {"id": "b", "type": "quality", "definition": "fdmprinter"}
+    index["c"] = {"id": "c", "type": "material", "definition": "ultimaker3"}
+
+    assert index.findIds({"type": "material"}) == ["a", "c"]
+    assert index.findIds({"type": "material", "definition": "fdmprinter"}) == ["a"]
+    assert index.findIds({"type": "variant"}) == []
+    assert index.isIndexed("type")
+    assert not index.isIndexed("name")
+
+
+def test_keepsIndexUpToDate():
+    index = MetadataIndex(indexed_keys = ["type"])
+    index["a"] = {"id": "a", "type": "material"}
+    index["b"] = {"id": "b", "type": "material"}
+
+    # Changing the metadata in-place and storing it again updates the index.
+    metadata = index["a"]
+    metadata["type"] = "quality"
+    index["a"] = metadata
+    assert index.findIds({"type": "material"}) == ["b"]
+    assert index.findIds({"type": "quality"}) == ["a"]
+
+    del index["b"]
+    assert index.findIds({"type": "material"}) == []
+    index.update({"b": {"id": "b", "type": "quality"}, "c": {"id": "c", "type": "quality"}})
+    assert index.findIds({"type": "quality"}) == ["a", "b", "c"]  # In the order in which they were added, like the dictionary.
+    assert list(index.keys()) == ["a", "b", "c"]
+
+    assert index.pop("c")["id"] == "c"
+    assert index.pop("c", None) is None
+    assert index.findIds({"type": "quality"}) == ["a", "b"]
+
+    index.clear()
+    assert index.findIds({"type": "quality"}) == []
+    assert len(index) == 0
@@ -0,0 +1,51 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from UM.Settings.ContainerStack import ContainerStack
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.InstanceContainer import InstanceContainer
+from UM.Settings import ParallelMetadataExtractor as ParallelMetadataExtractorModule
+from UM.Settings.ParallelMetadataExtractor import ParallelMetadataExtractor
+
+instances_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instances")
+
+
+class OverridingInstanceContainer(InstanceContainer):
+    """Gets its metadata in a different way, without overriding parseMetadata."""
+
+    @classmethod
+    def deserializeMetadata(cls, serialized: str, container_id: str) -> List[Dict[str, Any]]:
+        return []
+
+
+def test_canExtract():
+    assert ParallelMetadataExtractor.canExtract(InstanceContainer)
+    assert ParallelMetadataExtractor.canExtract(DefinitionContainer)
+    assert not ParallelMetadataExtractor.canExtract(ContainerStack)  # Needs the upgrade plug-ins to get its version.
+    assert not ParallelMetadataExtractor.canExtract(OverridingInstanceContainer)
+
+
+def test_extractTooFew():
+    job = (InstanceContainer, os.path.join(instances_path, "setting_values.inst.cfg"), "setting_values")
+    assert ParallelMetadataExtractor(workers = 4).extract([job]) == {}  # Not worth starting processes for.
+    assert ParallelMetadataExtractor(workers = 0).extract([job] * ParallelMetadataExtractor.minimum_jobs) == {}
+
+
+@pytest.mark.parametrize("current_versions, expected", [
+    ({("profile", 4000000)}, [{"id": "setting_values", "container_type": InstanceContainer, "name": "Setting Values", "version": "4", "definition": "multiple_settings", "type": "profile"}]),
+    ({("profile", 5000000)}, None)  # Needs to be upgraded, so it has to be loaded normally.
+])
+def test_extractMetadata(current_versions, expected):
+    ParallelMetadataExtractorModule._initializeWorker(frozenset(current_versions))
+    job = (InstanceContainer, os.path.join(instances_path, "setting_values.inst.cfg"), "setting_values")
+    assert ParallelMetadataExtractorModule._extractMetadata(job) == expected
+
+
+def test_extractMetadataMissingFile():
+    job = (InstanceContainer, os.path.join(instances_path, "does_not_exist.inst.cfg"), "does_not_exist")
+    assert ParallelMetadataExtractorModule._extractMetadata(job) is None
@@ -0,0 +1,88 @@
+# Copyright (c) 2026 UltiMaker
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import json
+
+import pytest
+
+from UM.Decorators import cache_per_instance
+from UM.Settings import SettingEvaluationProfiler
+from UM.Settings.SettingFunction import SettingFunction
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.setenv("URANIUM_SETTING_PROFILER", "1")
+    SettingEvaluationProfiler.clear()
+    SettingEvaluationProfiler.startRecording()
+    yield SettingEvaluationProfiler
+    SettingEvaluationProfiler.stopRecording()
+    SettingEvaluationProfiler.clear()
+
+
+def _createStack():
+    # The decorators are only applied if profiling was enabled when they were used, so apply them in the test.
+    call_function = SettingFunction.__call__
+    if not hasattr(call_function, "__wrapped__"):  # Profiling was not enabled when SettingFunction was imported.
+        call_function = SettingEvaluationProfiler.profileFunction(call_function)
+
+    class ProfiledStack:
+        def __init__(self):
+            self.functions = {
+                "layer_height": 0.1,
+                "wall_thickness": SettingFunction("layer_height * 4"),
+                "top_layers": SettingFunction("wall_thickness / 0.1"),
+                "quoted": SettingFunction("\"quoted\" if top_layers > 1 else 'single'")
+            }
+
+        @SettingEvaluationProfiler.profileGetProperty
+        @cache_per_instance
+        @SettingEvaluationProfiler.profileEvaluation
+        def getProperty(self, key, property_name, context = None):
+            value = self.functions.get(key)
+            if isinstance(value, SettingFunction):
+                value = call_function(value, self)
+            return value
+
+    return ProfiledStack()
+
+
+def test_statistics(profiler):
+    stack = _createStack()
+    stack.getProperty("top_layers", "value")
+    stack.getProperty("top_layers", "value")  # Cached.
+
+    statistics = profiler.getStatistics()
+    assert statistics[("top_layers", "value")].calls == 2
+    assert statistics[("top_layers", "value")].evaluations == 1
+    assert statistics[("top_layers", "value")].cache_hit_ratio == 0.5
+    assert statistics[("top_layers", "value")].function_calls == 1
+    assert statistics[("layer_height", "value")].calls == 1
+    assert statistics[("layer_height", "value")].evaluations == 1
+    assert statistics[("layer_height", "value")].function_calls == 0
+    assert statistics[("top_layers", "value")].total_time >= statistics[("wall_thickness", "value")].total_time
+    assert len(profiler.getMostExpensive(2)) == 2
+
+    assert profiler.getDeepestChains()[0] == (("top_layers", "value"), ("wall_thickness", "value"), ("layer_height", "value"))
+
+
+def test_notRecording(profiler):
+    stack = _createStack()
+    profiler.stopRecording()
+    stack.getProperty("top_layers", "value")
+
+    assert profiler.getStatistics() == {}
+    assert profiler.getProfileData() is None
+    assert profiler.toJSON() == ""
+
+
+def test_toJSON(profiler):
+    stack = _createStack()
+    stack.getProperty("quoted", "value")
+
+    parsed = json.loads(profiler.toJSON())
+    root_children = parsed["c"]["callStats"]["children"]
+    assert root_children[0]["stack"][0] == "quoted.value"
+    function_node = root_children[0]["children"][0]
+    assert function_node["stack"][0] == str(stack.functions["quoted"])  # The quotes in the function are escaped properly.
+    assert function_node["children"][0]["stack"][0] == "top_layers.value"
@@ -146,6 +146,12 @@ test_getUsedSettings_data = [
     { "code": "sqrt(x)", "variables": ["x"] },
     { "code": "x * x",   "variables": ["x"] },  # Use the same variable twice.
     { "code": "sqrt('x')" , "variables": ["x"] }, # Calling functions with string parameters will mark the string parameter as a "used setting".
+    { "code": "x if True else y", "variables": ["x"] },  # Branches that can never be evaluated don't use their settings.
+    { "code": "x if 1 > 2 else y", "variables": ["y"] },
+    { "code": "False and x",  "variables": [] },
+    { "code": "True and x",   "variables": ["x"] },
+    { "code": "x and False",  "variables": ["x"] },  # x is still evaluated first.
+    { "code": "1 == 1 or x",  "variables": [] },
 ]
 
 
@@ -161,6 +167,30 @@ def test_getUsedSettings(data):
         assert variable in answer
 
 
+##  Test cases for simplifying expressions before they are evaluated. Each must give the same result as Python would.
+test_constantFolding_data = [
+    { "code": "1 + 2 * 3",               "result": 7 },
+    { "code": "-foo",                    "result": -5 },
+    { "code": "foo if 2 > 1 else boo",   "result": 5 },
+    { "code": "boo if not True else 4",  "result": 4 },
+    { "code": "0 or foo",                "result": 5 },
+    { "code": "0 and boo",               "result": 0 },
+    { "code": "foo and 0 or zoo",        "result": 7 },
+    { "code": "'a' + 'b'",               "result": "ab" },
+    { "code": "1 / 0",                   "result": 0 },  # Still fails when evaluated, so the default result is given.
+    { "code": "foo * (2 ** 3)",          "result": 40 },
+]
+
+
+@pytest.mark.parametrize("data", test_constantFolding_data)
+def test_constantFolding(data):
+    value_provider = MockValueProvider()
+    function = SettingFunction(data["code"])
+    assert function.isValid()
+    assert function(value_provider) == data["result"]
+    assert "boo" not in function.getUsedValues()
+
+
 ##  Tests the conversion of a setting function to string.
 def test_str():
     # Due to the simplicity of the function, it's not really necessary to make a full-blown parametrised test for this. Just two simple tests:
@@ -168,3 +198,29 @@ def test_str():
     assert str(function) == "=3.14156"
     function = SettingFunction("")  # Also the edge case.
     assert str(function) == "="
+
+
+##  Tests that the compiled evaluation engine gives the same results as the default one.
+@pytest.mark.parametrize("data", test_call_data)
+def test_callCompiled(data):
+    value_provider = MockValueProvider()
+    function = SettingFunction(data["code"])
+    SettingFunction.setCompiledEvaluation(True)
+    try:
+        assert SettingFunction.isCompiledEvaluation()
+        assert function(value_provider) == data["result"]
+        assert function(value_provider) == data["result"]  # Again, now with the evaluator already created.
+    finally:
+        SettingFunction.setCompiledEvaluation(False)
+
+
+##  Tests that operators registered after a function was evaluated are still found by the compiled evaluation engine.
+def test_callCompiledRegisterOperator():
+    value_provider = MockValueProvider()
+    SettingFunction.setCompiledEvaluation(True)
+    try:
+        assert SettingFunction("foo")(value_provider) == 5
+        SettingFunction.registerOperator("triple", lambda value: value * 3)
+        assert SettingFunction("triple(foo)")(value_provider) == 15
+    finally:
+        SettingFunction.setCompiledEvaluation(False)
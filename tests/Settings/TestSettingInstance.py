@@ -1,9 +1,12 @@
 # Copyright (c) 2016 Ultimaker B.V.
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import json
 import pytest
+from unittest.mock import MagicMock
 
 # import UM.Settings
+import UM.Settings.DefinitionContainer
 import UM.Settings.SettingFunction
 import UM.Settings.SettingDefinition
 import UM.Settings.SettingInstance
@@ -135,4 +138,27 @@ def test_compare(setting_definition, instance_container):
     instance.setProperty("maximum_value", 9001)
     # In this case, we are testing instance 2 having the max_value property, but instance doesn't have it.
     assert instance2 != instance
-    assert instance != instance2
\ No newline at end of file
+    assert instance != instance2
+
+
+def test_updateRelationsBatched(upgrade_manager):
+    definition_container = UM.Settings.DefinitionContainer.DefinitionContainer("test")
+    definition_container.deserialize(json.dumps({
+        "name": "Test", "version": UM.Settings.DefinitionContainer.DefinitionContainer.Version, "metadata": {},
+        "settings": {
+            "test_setting_0": {"label": "Test 0", "type": "float", "default_value": 10, "description": "Test"},
+            "test_setting_1": {"label": "Test 1", "type": "float", "default_value": 10, "description": "Test", "value": "test_setting_0 * 10"},
+            "test_setting_2": {"label": "Test 2", "type": "float", "default_value": 10, "description": "Test", "maximum_value": "test_setting_0 * 2", "enabled": "test_setting_1 > 0"}
+        }
+    }))
+    container = MagicMock()
+    instance = UM.Settings.SettingInstance.SettingInstance(definition_container.findDefinitions(key = "test_setting_0")[0], container)
+
+    instance.setProperty("value", 20.0)
+
+    # All affected properties of other settings are sent at once.
+    container.propertiesChangedBatch.emit.assert_called_once_with({
+        "test_setting_1": {"value", "validationState"},
+        "test_setting_2": {"maximum_value", "validationState", "enabled"}
+    })
+    assert all(call.args[0] == "test_setting_0" for call in container.propertyChanged.emit.call_args_list)
@@ -144,3 +144,25 @@ def test_getSetRemoveUnusedValue():
 
     setting_property_provider.setRemoveUnusedValue(False)
     assert setting_property_provider.removeUnusedValueChanged.emit.call_count == 1
+
+
+def test_onPropertiesChangedBatch():
+    setting_property_provider = SettingPropertyProvider()
+    setting_property_provider._key = "test_setting"
+    setting_property_provider._relations = {"related_setting"}
+    setting_property_provider._watched_properties = ["value"]
+    setting_property_provider._getPropertyValue = MagicMock(return_value = "20")
+    setting_property_provider._updateStackLevels = MagicMock()
+    setting_property_provider.isValueUsedChanged = MagicMock()
+    setting_property_provider.propertiesChanged = MagicMock()
+
+    # Changes of unrelated settings don't affect the provider.
+    setting_property_provider._onPropertiesChangedBatch({"unrelated_setting": {"value"}, "other_setting": {"value"}})
+    assert setting_property_provider.isValueUsedChanged.emit.call_count == 0
+    assert setting_property_provider.propertiesChanged.emit.call_count == 0
+
+    # A single batch with changes of both the setting and the settings that depend on it causes one update of each.
+    setting_property_provider._onPropertiesChangedBatch({"test_setting": {"value", "state"}, "related_setting": {"value", "validationState"}, "unrelated_setting": {"value"}})
+    assert setting_property_provider.isValueUsedChanged.emit.call_count == 1
+    assert setting_property_provider.propertiesChanged.emit.call_count == 1
+    assert setting_property_provider.properties.value("value") == "20"
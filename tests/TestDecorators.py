@@ -155,3 +155,57 @@ def test_cachePerInstance():
     assert lizt == [234, 456, 789]
     lizt.append(111)
     assert other.getList() == [234, 456, 789]
+
+
+def test_cachePerInstanceKeywordArguments():
+    bigDeal = MagicMock()
+
+    class SomeClass:
+        @cache_per_instance
+        def getThing(self, a, *, b = None):
+            bigDeal()
+            return a, b
+
+    instance = SomeClass()
+    assert instance.getThing("a", b = "b") == ("a", "b")
+    assert instance.getThing("a", b = "b") == ("a", "b")
+    assert bigDeal.call_count == 1
+    assert instance.getThing("a", b = "c") == ("a", "c")
+    assert bigDeal.call_count == 2
+
+    # Unhashable arguments can't be cached, but still give the right result.
+    assert instance.getThing("a", b = ["list"]) == ("a", ["list"])
+    assert instance.getThing("a", b = ["list"]) == ("a", ["list"])
+    assert bigDeal.call_count == 4
+
+
+def test_cachePerInstanceGarbageCollected():
+    CachedMemberFunctions._CachedMemberFunctions__cache = {}
+
+    class SomeClass:
+        @cache_per_instance
+        def getThing(self, a):
+            return a
+
+    instance = SomeClass()
+    instance.getThing("marco")
+    assert len(CachedMemberFunctions._CachedMemberFunctions__cache) == 1
+    del instance  # Without any call to deleteInstanceCache, the cache must still be cleaned up.
+    assert len(CachedMemberFunctions._CachedMemberFunctions__cache) == 0
+
+
+def test_cachePerInstanceStatistics():
+    class SomeClass:
+        @cache_per_instance
+        def getThing(self, a):
+            return a
+
+    CachedMemberFunctions.resetStatistics()
+    instance = SomeClass()
+    instance.getThing("marco")
+    instance.getThing("marco")
+    instance.getThing("polo")
+    assert CachedMemberFunctions.getStatistics() == {SomeClass.getThing._cached_function.__qualname__: (1, 2)}
+
+    CachedMemberFunctions.resetStatistics()
+    assert CachedMemberFunctions.getStatistics() == {}